@@ -12,15 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import random
 
 from google.adk.agents.llm_agent import Agent
 from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
 from google.adk.tools.example_tool import ExampleTool
-from google.adk.models.lite_llm import LiteLlm
 from google.genai import types
 
+from adk_common.a2a_resilience import ResilientRemoteA2aAgent
+from adk_common.fan_out import fan_out_tools
+from adk_common.llm_registry import get_llm
+
+from .remote_a2a.check_prime_agent.agent import check_prime
+
+# "fan_out" lets root_agent call roll_agent and prime_agent as tools, several
+# in one response and concurrently; "delegate" (default) transfers to one
+# sub-agent at a time.
+ORCHESTRATION = os.getenv("DICE_PRIME_ORCHESTRATION", "delegate")
+MAX_CONCURRENCY = int(os.getenv("DICE_PRIME_MAX_CONCURRENCY", "4"))
+
 
 # --- Roll Die Sub-Agent ---
 def roll_die(sides: int) -> int:
@@ -28,7 +39,12 @@ def roll_die(sides: int) -> int:
   return random.randint(1, sides)
 
 
+model = get_llm('ollama_chat/qwen2.5:7b')
+
+
 roll_agent = Agent(
+    # Set explicitly: as a fan-out tool the agent has no parent to inherit from.
+    model=model,
     name="roll_agent",
     description="Handles rolling dice of different sizes.",
     instruction="""
@@ -85,19 +101,35 @@ example_tool = ExampleTool([
     },
 ])
 
-prime_agent = RemoteA2aAgent(
+# Servers of check_prime_agent, tried fastest first; a slow one is hedged
+# with the next after its p95 latency.
+PRIME_AGENT_URLS = os.getenv("PRIME_AGENT_URLS", "http://localhost:8001").split(",")
+
+# Answers with the in-process check_prime tool when no server can.
+local_prime_agent = Agent(
+    model=model,
     name="prime_agent",
     description="Agent that handles checking if numbers are prime.",
-    agent_card=(
-        f"http://localhost:8001/a2a/check_prime_agent{AGENT_CARD_WELL_KNOWN_PATH}"
-    ),
+    instruction="""
+      You check whether numbers are prime.
+      When checking prime numbers, call the check_prime tool with a list of integers.
+    """,
+    tools=[check_prime],
 )
 
+# Each replica shares the process-wide connection pool and cached agent card.
+prime_agent = ResilientRemoteA2aAgent.of(
+    name="prime_agent",
+    description="Agent that handles checking if numbers are prime.",
+    agent_cards=[
+        f"{url.rstrip('/')}/a2a/check_prime_agent{AGENT_CARD_WELL_KNOWN_PATH}"
+        for url in PRIME_AGENT_URLS
+    ],
+    fallback=local_prime_agent,
+)
 
-root_agent = Agent(
-    model=LiteLlm(model='ollama_chat/qwen2.5:7b'),
-    name="root_agent",
-    instruction="""
+
+DELEGATE_INSTRUCTION = """
       You are a helpful assistant that can roll dice and check if numbers are prime.
       You delegate rolling dice tasks to the roll_agent and prime checking tasks to the prime_agent.
       Follow these steps:
@@ -105,12 +137,34 @@ root_agent = Agent(
       2. If the user asks to check primes, delegate to the prime_agent.
       3. If the user asks to roll a die and then check if the result is prime, call roll_agent first, then pass the result to prime_agent.
       Always clarify the results before proceeding.
-    """,
+    """
+
+FAN_OUT_INSTRUCTION = """
+      You are a helpful assistant that can roll dice and check if numbers are prime.
+      Use the roll_agent tool to roll dice and the prime_agent tool to check primes.
+      Follow these steps:
+      1. When the user asks for several independent things (e.g. roll a die and check if 7 is prime),
+         call all the needed tools in the same response, they run at the same time.
+      2. If the user asks to roll a die and then check if the result is prime, call roll_agent first,
+         then call prime_agent with the rolled number.
+      Always clarify the results before proceeding.
+    """
+
+fan_out = ORCHESTRATION == "fan_out"
+
+root_agent = Agent(
+    model=model,
+    name="root_agent",
+    instruction=FAN_OUT_INSTRUCTION if fan_out else DELEGATE_INSTRUCTION,
     global_instruction=(
         "You are DicePrimeBot, ready to roll dice and check prime numbers."
     ),
-    sub_agents=[roll_agent, prime_agent],
-    tools=[example_tool],
+    sub_agents=[] if fan_out else [roll_agent, prime_agent],
+    tools=(
+        [example_tool, *fan_out_tools(roll_agent, prime_agent, max_concurrency=MAX_CONCURRENCY)]
+        if fan_out
+        else [example_tool]
+    ),
     generate_content_config=types.GenerateContentConfig(
         safety_settings=[
             types.SafetySetting(  # avoid false alarm about rolling dice.
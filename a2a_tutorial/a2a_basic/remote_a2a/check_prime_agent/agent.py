@@ -12,13 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import random
+from typing import Optional
 
 from google.adk import Agent
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools.tool_context import ToolContext
-from google.adk.models.lite_llm import LiteLlm
 from google.genai import types
 
+from adk_common.llm_registry import get_llm
+from adk_common.primality import find_primes
+from adk_common.single_flight import cached_tool
+
 
 async def check_prime(nums: list[int]) -> str:
   """Check if a given list of numbers are prime.
@@ -29,18 +35,7 @@ async def check_prime(nums: list[int]) -> str:
   Returns:
     A str indicating which number is prime.
   """
-  primes = set()
-  for number in nums:
-    number = int(number)
-    if number <= 1:
-      continue
-    is_prime = True
-    for i in range(2, int(number**0.5) + 1):
-      if number % i == 0:
-        is_prime = False
-        break
-    if is_prime:
-      primes.add(number)
+  primes = find_primes(nums)
   return (
       'No prime numbers found.'
       if not primes
@@ -48,8 +43,44 @@ async def check_prime(nums: list[int]) -> str:
   )
 
 
+def structured_nums(content: Optional[types.Content]) -> Optional[list[int]]:
+  """The numbers of a structured request, or None for free text.
+
+  A2A data parts reach the agent as their JSON text. A request is structured
+  when its only part is a JSON list of integers or an object with a `nums`
+  list of integers.
+  """
+  if not content or not content.parts or len(content.parts) != 1:
+    return None
+  text = (content.parts[0].text or '').strip()
+  if not text.startswith(('[', '{')):
+    return None
+  try:
+    data = json.loads(text)
+  except ValueError:
+    return None
+  nums = data.get('nums') if isinstance(data, dict) else data
+  if not isinstance(nums, list) or not all(
+      isinstance(n, int) and not isinstance(n, bool) for n in nums
+  ):
+    return None
+  return nums
+
+
+async def structured_check_prime(
+    callback_context: CallbackContext,
+) -> Optional[types.Content]:
+  """Answers structured requests with check_prime, skipping the model."""
+  nums = structured_nums(callback_context.user_content)
+  if nums is None:
+    return None  # Free text: the model extracts the numbers.
+  return types.Content(
+      role='model', parts=[types.Part(text=await check_prime(nums))]
+  )
+
+
 root_agent = Agent(
-    model=LiteLlm(model='ollama_chat/qwen2.5:7b'),
+    model=get_llm('ollama_chat/qwen2.5:7b'),
     name='check_prime_agent',
     description='check prime agent that can check whether numbers are prime.',
     instruction="""
@@ -58,8 +89,11 @@ root_agent = Agent(
       You should not rely on the previous history on prime results.
     """,
     tools=[
-        check_prime,
+        # Primality is pure, so identical checks from any session run once.
+        cached_tool(check_prime, ttl=3600),
     ],
+    # {"nums": [...]} data parts are answered without a model call.
+    before_agent_callback=structured_check_prime,
     # planner=BuiltInPlanner(
     #     thinking_config=types.ThinkingConfig(
     #         include_thoughts=True,
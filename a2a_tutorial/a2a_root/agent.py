@@ -13,9 +13,10 @@
 # limitations under the License.
 
 from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
 
-root_agent = RemoteA2aAgent(
+from adk_common.a2a_client import PooledRemoteA2aAgent
+
+root_agent = PooledRemoteA2aAgent(
     name="hello_world_agent",
     description=(
         "Helpful assistant that can roll dice and check if numbers are prime."
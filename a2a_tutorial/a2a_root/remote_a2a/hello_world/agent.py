@@ -15,11 +15,15 @@
 import random
 
 from google.adk import Agent
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 from google.adk.tools.tool_context import ToolContext
-from google.adk.models.lite_llm import LiteLlm
 from google.genai import types
 
+from adk_common.a2a_serving import build_a2a_app
+from adk_common.llm_registry import get_llm
+from adk_common.primality import find_primes
+from adk_common.single_flight import cached_tool
+from adk_common.state import AppendOnlyList
+
 
 def roll_die(sides: int, tool_context: ToolContext) -> int:
   """Roll a die and return the rolled result.
@@ -31,10 +35,8 @@ def roll_die(sides: int, tool_context: ToolContext) -> int:
     An integer of the result of rolling the die.
   """
   result = random.randint(1, sides)
-  if not 'rolls' in tool_context.state:
-    tool_context.state['rolls'] = []
-
-  tool_context.state['rolls'] = tool_context.state['rolls'] + [result]
+  # Only the last chunk of rolls is rewritten and sent in the state delta.
+  AppendOnlyList(tool_context.state, 'rolls').append(result)
   return result
 
 
@@ -47,18 +49,7 @@ async def check_prime(nums: list[int]) -> str:
   Returns:
     A str indicating which number is prime.
   """
-  primes = set()
-  for number in nums:
-    number = int(number)
-    if number <= 1:
-      continue
-    is_prime = True
-    for i in range(2, int(number**0.5) + 1):
-      if number % i == 0:
-        is_prime = False
-        break
-    if is_prime:
-      primes.add(number)
+  primes = find_primes(nums)
   return (
       'No prime numbers found.'
       if not primes
@@ -67,7 +58,7 @@ async def check_prime(nums: list[int]) -> str:
 
 
 root_agent = Agent(
-    model=LiteLlm(model='ollama_chat/qwen2.5:7b'),
+    model=get_llm('ollama_chat/qwen2.5:7b'),
     name='hello_world_agent',
     description=(
         'hello world agent that can roll a dice of 8 sides and check prime'
@@ -92,7 +83,8 @@ root_agent = Agent(
     """,
     tools=[
         roll_die,
-        check_prime,
+        # Primality is pure, so identical checks from any session run once.
+        cached_tool(check_prime, ttl=3600),
     ],
     # planner=BuiltInPlanner(
     #     thinking_config=types.ThinkingConfig(
@@ -109,4 +101,5 @@ root_agent = Agent(
     ),
 )
 
-a2a_app = to_a2a(root_agent, port=8001)
+# Like to_a2a(), but streams task updates over SSE (message/stream).
+a2a_app = build_a2a_app(root_agent, port=8001)
@@ -0,0 +1,77 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Multi-worker serving mode for the hello world A2A agent.
+
+Unlike `agent.a2a_app`, sessions (including `state['rolls']`) and A2A tasks
+live in a shared database, so any worker can continue any task.
+
+  python -m a2a_root.remote_a2a.hello_world.serve --workers 4 --port 8001
+"""
+
+import argparse
+import asyncio
+import os
+
+import uvicorn
+
+from adk_common.a2a_serving import build_a2a_app
+from adk_common.a2a_serving import prepare_stores
+
+DEFAULT_DB_URL = "sqlite+aiosqlite:///./hello_world_a2a.db"
+
+
+def create_app():
+  """App factory run in every worker; settings come from the environment."""
+  from .agent import root_agent
+
+  return build_a2a_app(
+      root_agent,
+      db_url=os.getenv("A2A_DB_URL", DEFAULT_DB_URL),
+      host=os.getenv("A2A_HOST", "localhost"),
+      port=int(os.getenv("A2A_PORT", "8001")),
+      max_in_flight=int(os.getenv("A2A_MAX_IN_FLIGHT", "32")),
+      drain_timeout=float(os.getenv("A2A_DRAIN_TIMEOUT", "30")),
+  )
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Serve hello_world_agent over A2A with multiple workers")
+  parser.add_argument("--host", default="localhost")
+  parser.add_argument("--port", type=int, default=8001)
+  parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+  parser.add_argument("--db-url", default=os.getenv("A2A_DB_URL", DEFAULT_DB_URL))
+  parser.add_argument("--max-in-flight", type=int, default=32, help="Per worker; excess calls get HTTP 429")
+  parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to finish in-flight tasks on shutdown")
+  args = parser.parse_args()
+
+  # Workers are separate processes that rebuild the app from these variables.
+  os.environ.update({
+      "A2A_DB_URL": args.db_url,
+      "A2A_HOST": args.host,
+      "A2A_PORT": str(args.port),
+      "A2A_MAX_IN_FLIGHT": str(args.max_in_flight),
+      "A2A_DRAIN_TIMEOUT": str(args.drain_timeout),
+  })
+  from .agent import root_agent
+
+  asyncio.run(prepare_stores(args.db_url, app_name=root_agent.name))
+  uvicorn.run(
+      "a2a_root.remote_a2a.hello_world.serve:create_app",
+      factory=True,
+      host=args.host,
+      port=args.port,
+      workers=args.workers,
+      timeout_graceful_shutdown=int(args.drain_timeout),
+  )
@@ -0,0 +1 @@
+"""Shared helpers used by the tutorial agents in this repository."""
@@ -0,0 +1,224 @@
+import asyncio
+import dataclasses
+import logging
+import re
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from a2a.client.client import ClientConfig as A2AClientConfig
+from a2a.client.client_factory import ClientFactory as A2AClientFactory
+from a2a.types import AgentCard
+from a2a.types import TaskState
+from a2a.types import TaskStatusUpdateEvent
+from a2a.types import TransportProtocol as A2ATransport
+from google.adk.agents.remote_a2a_agent import AgentCardResolutionError
+from google.adk.agents.remote_a2a_agent import DEFAULT_TIMEOUT
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+from google.adk.events.event import Event
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CARD_TTL = 300.0
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# httpx connections are bound to the event loop that opened them, so keep one
+# pool per running loop (adk web has one; scripts calling asyncio.run() twice get two).
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_httpx_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide keep-alive HTTP client for the running event loop.
+
+    HTTP/2 is negotiated when the `h2` package is installed and the server offers
+    it over TLS; plain-HTTP endpoints use pooled HTTP/1.1 connections.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60.0,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+@dataclass
+class _CardEntry:
+    card: AgentCard
+    etag: Optional[str]
+    expires_at: float
+
+
+class AgentCardCache:
+    """
+    Caches agent cards by URL.
+
+    A card is reused until its TTL expires (`Cache-Control: max-age` when the
+    server sends one, `default_ttl` otherwise). Expired cards are revalidated
+    with `If-None-Match` so an unchanged card costs a 304 and no parsing. If the
+    server cannot be reached the stale card is kept.
+    """
+
+    def __init__(self, default_ttl: float = DEFAULT_CARD_TTL, clock=time.monotonic):
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: dict[str, _CardEntry] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def get(self, url: str, client: httpx.AsyncClient) -> AgentCard:
+        entry = self._entries.get(url)
+        if entry is not None and entry.expires_at > self._clock():
+            return entry.card
+
+        future = self._inflight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(url, client, entry))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(future)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+    async def _fetch(
+        self, url: str, client: httpx.AsyncClient, entry: Optional[_CardEntry]
+    ) -> AgentCard:
+        headers = {'If-None-Match': entry.etag} if entry and entry.etag else {}
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                entry.expires_at = self._clock() + self._ttl(response)
+                return entry.card
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except Exception as e:
+            if entry is not None:
+                logger.warning("Using stale agent card for %s: %s", url, e)
+                return entry.card
+            raise AgentCardResolutionError(
+                f"Failed to resolve AgentCard from URL {url}: {e}"
+            ) from e
+
+        self._entries[url] = _CardEntry(
+            card=card,
+            etag=response.headers.get('ETag'),
+            expires_at=self._clock() + self._ttl(response),
+        )
+        return card
+
+    def _ttl(self, response: httpx.Response) -> float:
+        cache_control = response.headers.get('Cache-Control', '')
+        if 'no-cache' in cache_control or 'no-store' in cache_control:
+            return 0.0
+        match = _MAX_AGE.search(cache_control)
+        return float(match.group(1)) if match else self.default_ttl
+
+
+agent_card_cache = AgentCardCache()
+
+
+class PooledRemoteA2aAgent(RemoteA2aAgent):
+    """
+    A RemoteA2aAgent that shares one pooled HTTP client with every other remote
+    agent in the process and resolves its card through `agent_card_cache`.
+
+    The card is re-checked on each delegation once its TTL expires, so a
+    redeployed remote agent is picked up without restarting the consumer.
+
+    With `streaming=True` (the default) the agent uses `message/stream` when the
+    card advertises it, and forwards the remote's in-progress status updates as
+    partial events: callers see output as soon as the remote produces it, while
+    only the final result is stored in the session.
+
+    A caller-provided `a2a_client_factory` is kept as is (and `streaming` is
+    then up to its config); if it has no HTTP client of its own it is given the
+    pooled one. A factory or `httpx_client` that brings its own HTTP client
+    opts the agent out of the pool.
+    """
+
+    def __init__(self, *args, streaming: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._streaming = streaming
+        self._use_pool = self._httpx_client is None
+        self._custom_factory = self._a2a_client_factory
+
+    async def _ensure_httpx_client(self) -> httpx.AsyncClient:
+        if not self._use_pool:
+            return await super()._ensure_httpx_client()
+        client = get_shared_httpx_client()
+        if client is not self._httpx_client or self._a2a_client_factory is None:
+            self._httpx_client = client
+            # The pool outlives this agent; never close it from cleanup().
+            self._httpx_client_needs_cleanup = False
+            self._a2a_client_factory = self._factory_for(client)
+            self._a2a_client = None
+        return client
+
+    def _factory_for(self, client: httpx.AsyncClient) -> A2AClientFactory:
+        custom = self._custom_factory
+        if custom is None:
+            return A2AClientFactory(
+                config=A2AClientConfig(
+                    httpx_client=client,
+                    streaming=self._streaming,
+                    polling=False,
+                    supported_transports=[A2ATransport.jsonrpc],
+                )
+            )
+        # Same config, consumers and transports as the caller's factory, on the pooled client.
+        factory = A2AClientFactory(
+            config=dataclasses.replace(custom._config, httpx_client=client),
+            consumers=custom._consumers,
+        )
+        for label, generator in custom._registry.items():
+            factory.register(label, generator)
+        return factory
+
+    async def _ensure_resolved(self) -> None:
+        client = await self._ensure_httpx_client()
+        source = self._agent_card_source
+        if source and source.startswith(('http://', 'https://')):
+            card = await agent_card_cache.get(source, client)
+            if card is not self._agent_card:
+                await self._validate_agent_card(card)
+                if not self.description and card.description:
+                    self.description = card.description
+                self._agent_card = card
+                self._a2a_client = None
+        await super()._ensure_resolved()
+
+    async def _handle_a2a_response(self, a2a_response, ctx) -> Optional[Event]:
+        event = await super()._handle_a2a_response(a2a_response, ctx)
+        if event is not None and isinstance(a2a_response, tuple):
+            task, update = a2a_response
+            in_progress = (TaskState.submitted, TaskState.working)
+            if (
+                isinstance(update, TaskStatusUpdateEvent) and update.status.state in in_progress
+            ) or (update is None and task.status.state in in_progress):
+                event.partial = True
+        return event
@@ -0,0 +1,337 @@
+"""
+Tail-latency control for remote A2A agents.
+
+`ResilientRemoteA2aAgent` stands in for one remote agent served by several
+replicas (one `PooledRemoteA2aAgent` per endpoint):
+
+- The latency of every endpoint (time to its first answer: a complete event
+  that is not a thought, or the end of its run) is tracked over a sliding
+  window. Streamed partial events, such as the "submitted" status an A2A
+  server sends right away, do not count as an answer.
+- A delegation goes to the fastest healthy endpoint; endpoints without
+  latencies yet keep their configured order after the measured ones, and
+  endpoints that just failed come last. If no answer has come back after
+  that endpoint's p95 (`hedge_percentile`), the same request is sent to the
+  next one (a hedge); the first endpoint to answer wins, its buffered partial
+  events are replayed, and the others are cancelled. An endpoint that fails
+  is replaced by the next one right away.
+- Each endpoint has a circuit breaker: after `failure_threshold` consecutive
+  failures it is skipped for `reset_timeout` seconds, then tried again with a
+  single request.
+- When every endpoint is open or failed, the delegation goes to `fallback`
+  (e.g. a local agent with an in-process tool) or fails fast with an error event.
+
+    prime_agent = ResilientRemoteA2aAgent.of(
+        name="prime_agent",
+        agent_cards=["http://localhost:8001/...", "http://localhost:8002/..."],
+        fallback=local_prime_agent,
+    )
+
+Replicas and the fallback carry the wrapper's name, so the events they produce
+read as the wrapper's and later turns are routed back to it. A cancelled hedge
+stops waiting for its endpoint; the remote side may still finish its task.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event
+from pydantic import PrivateAttr
+
+from .a2a_client import PooledRemoteA2aAgent
+
+_END = object()  # an attempt produced all its events
+
+
+def _is_answer(event: Event) -> bool:
+    """Whether an event shows the endpoint is answering, rather than only acknowledging or thinking."""
+    if event.partial:
+        return False
+    parts = event.content.parts if event.content else None
+    return not parts or not all(part.thought for part in parts)
+
+
+class EndpointLatency:
+    """Latencies of the last `window` successful calls to one endpoint."""
+
+    def __init__(self, window: int = 100):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile, `q` in [0, 100]; None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(max(math.ceil(q / 100 * len(ordered)), 1), len(ordered)) - 1]
+
+
+class CircuitBreaker:
+    """
+    Closed: calls pass. Open after `failure_threshold` consecutive failures:
+    calls are refused for `reset_timeout` seconds. Half-open after that: one
+    trial call passes; its success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures since the last success."""
+        return self._failures
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if self._clock() - self._opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; claims the trial call when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures, self._opened_at, self._trial_running = 0, None, False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_running = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Gives back a trial call that was cancelled before it succeeded or failed."""
+        self._trial_running = False
+
+
+@dataclass
+class ResilienceStats:
+    calls: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failovers: int = 0
+    fallbacks: int = 0
+    fail_fast: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"Remote A2A: {self.calls} delegations, {self.hedges} hedged ({self.hedge_wins} won by the hedge), "
+            f"{self.failovers} failovers, {self.fallbacks} fallbacks, {self.fail_fast} failed fast"
+        )
+
+
+class ResilientRemoteA2aAgent(BaseAgent):
+    """
+    One remote agent behind several replicas, with hedging, circuit breaking
+    and a local fallback (see module docstring).
+
+    Args:
+        replicas (list[BaseAgent]): One remote agent per endpoint, in order of preference.
+        fallback (BaseAgent, optional): Runs when no endpoint can answer.
+        hedge_after (float, optional): Fixed hedge delay in seconds; by default
+            the `hedge_percentile` latency of the endpoint being waited on.
+        hedge_percentile (float): Latency percentile after which to hedge; keep it
+            above the share of slow calls, or most calls wait for the slow ones.
+        initial_hedge_delay (float): Hedge delay until an endpoint has `min_samples` latencies.
+        min_samples (int): Latencies needed before an endpoint's p95 is trusted.
+        max_attempts (int, optional): Endpoints tried per delegation (hedges and
+            failovers included); all replicas by default.
+        failure_threshold (int): Consecutive failures that open an endpoint's breaker.
+        reset_timeout (float): Seconds an open breaker refuses calls.
+    """
+
+    replicas: list[BaseAgent]
+    fallback: Optional[BaseAgent] = None
+    hedge_after: Optional[float] = None
+    hedge_percentile: float = 95.0
+    initial_hedge_delay: float = 1.0
+    min_samples: int = 20
+    max_attempts: Optional[int] = None
+    failure_threshold: int = 3
+    reset_timeout: float = 30.0
+
+    _latency: list[EndpointLatency] = PrivateAttr(default_factory=list)
+    _breakers: list[CircuitBreaker] = PrivateAttr(default_factory=list)
+    _stats: ResilienceStats = PrivateAttr(default_factory=ResilienceStats)
+
+    def model_post_init(self, context) -> None:
+        super().model_post_init(context)
+        self._latency = [EndpointLatency() for _ in self.replicas]
+        self._breakers = [CircuitBreaker(self.failure_threshold, self.reset_timeout) for _ in self.replicas]
+
+    @classmethod
+    def of(cls, name: str, agent_cards: list[str], description: str = "",
+           fallback: Optional[BaseAgent] = None, **kwargs) -> "ResilientRemoteA2aAgent":
+        """Builds a `PooledRemoteA2aAgent` replica per agent card URL."""
+        replicas = [
+            PooledRemoteA2aAgent(name=name, description=description, agent_card=card) for card in agent_cards
+        ]
+        return cls(name=name, description=description, replicas=replicas, fallback=fallback, **kwargs)
+
+    @property
+    def stats(self) -> ResilienceStats:
+        return self._stats
+
+    @property
+    def breakers(self) -> list[CircuitBreaker]:
+        return self._breakers
+
+    def endpoint_latency(self, index: int) -> EndpointLatency:
+        return self._latency[index]
+
+    def _hedge_delay(self, index: int) -> float:
+        if self.hedge_after is not None:
+            return self.hedge_after
+        latency = self._latency[index]
+        return latency.percentile(self.hedge_percentile) if len(latency) >= self.min_samples else self.initial_hedge_delay
+
+    def _candidates(self) -> list[int]:
+        # Endpoints failing right now last, then fastest first (by median);
+        # endpoints without samples follow the measured ones in configured order.
+        def key(index: int) -> tuple[int, float, int]:
+            median = self._latency[index].percentile(50)
+            return self._breakers[index].failures, math.inf if median is None else median, index
+
+        return sorted(range(len(self.replicas)), key=key)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        self._stats.calls += 1
+        answered = False
+        async for event in self._run_replicas(ctx):
+            answered = True
+            yield event
+        if answered:
+            return
+        if self.fallback is not None:
+            self._stats.fallbacks += 1
+            async for event in self.fallback.run_async(ctx):
+                yield event
+            return
+        self._stats.fail_fast += 1
+        yield Event(
+            author=self.name,
+            error_message=f"No endpoint of {self.name!r} is available",
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+        )
+
+    async def _run_replicas(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        """
+        Yields the events of the first endpoint to answer, or nothing when no
+        endpoint could (all open, failed or out of attempts).
+        """
+        candidates = iter(self._candidates())
+        budget = self.max_attempts or len(self.replicas)
+        results: asyncio.Queue = asyncio.Queue()
+        running: dict[int, tuple[asyncio.Task, float]] = {}  # endpoint -> (task, start)
+        tried: list[int] = []
+        hedges: set[int] = set()
+        partials: dict[int, list[Event]] = {}  # events received before an endpoint answered
+
+        async def pump(index: int):
+            try:
+                async for event in self.replicas[index].run_async(ctx):
+                    await results.put((index, event))
+            finally:
+                results.put_nowait((index, _END))
+
+        def launch() -> Optional[int]:
+            if len(tried) >= budget:
+                return None
+            for index in candidates:
+                if self._breakers[index].allow():
+                    running[index] = (asyncio.create_task(pump(index)), time.perf_counter())
+                    tried.append(index)
+                    return index
+            return None
+
+        def stop(index: int) -> None:
+            running.pop(index)[0].cancel()
+            partials.pop(index, None)
+            self._breakers[index].release()
+
+        current = launch()
+        if current is None:
+            return
+        winner = None
+        deadline = time.perf_counter() + self._hedge_delay(current)
+        try:
+            while winner is None:
+                timeout = max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+                try:
+                    index, item = await asyncio.wait_for(results.get(), timeout)
+                except asyncio.TimeoutError:
+                    # No answer within the endpoint's p95: send the request to the next one too.
+                    current, deadline = launch(), None
+                    if current is not None:
+                        self._stats.hedges += 1
+                        hedges.add(current)
+                        deadline = time.perf_counter() + self._hedge_delay(current)
+                    continue
+                if index not in running:
+                    continue  # leftovers of an attempt that already failed
+                if item is not _END and not item.error_message and not _is_answer(item):
+                    partials.setdefault(index, []).append(item)
+                    continue
+                # An error, or a run that ended without a single event, is a failure;
+                # a run that ended after partial events only is an answer.
+                failed = not partials.get(index) if item is _END else bool(item.error_message)
+                if failed:
+                    running.pop(index)[0].cancel()
+                    partials.pop(index, None)
+                    self._breakers[index].record_failure()
+                    if not running:
+                        current = launch()
+                        if current is None:
+                            return
+                        self._stats.failovers += 1
+                        deadline = time.perf_counter() + self._hedge_delay(current)
+                    continue
+                winner = index
+
+            _, start = running[winner]
+            self._latency[winner].observe(time.perf_counter() - start)
+            if winner in hedges:
+                self._stats.hedge_wins += 1
+            for index in [index for index in running if index != winner]:
+                stop(index)
+
+            for event in partials.pop(winner, []):
+                yield event
+            ok = True
+            while item is not _END:
+                ok = ok and not item.error_message
+                yield item
+                index, item = await results.get()
+                while index != winner:
+                    index, item = await results.get()
+            if ok:
+                self._breakers[winner].record_success()
+            else:
+                self._breakers[winner].record_failure()
+            running.pop(winner)
+        finally:
+            for index in list(running):
+                stop(index)
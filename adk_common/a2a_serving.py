@@ -0,0 +1,385 @@
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import signal
+import time
+from typing import Optional
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import DatabaseTaskStore
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCapabilities
+from a2a.types import AgentCard
+from google.adk.a2a.converters.request_converter import convert_a2a_request_to_agent_run_request
+from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor
+from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutorConfig
+from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.run_config import StreamingMode
+from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.runners import Runner
+from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import InMemorySessionService
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse
+
+from .metrics import MetricsMiddleware
+from .metrics import metrics_plugin
+
+
+logger = logging.getLogger(__name__)
+
+
+# JSON-RPC methods that start agent tasks; only these are subject to backpressure.
+TASK_METHODS = ("message/send", "message/stream")
+
+# The slot BackpressureMiddleware reserved for the current call, which the
+# executor's task (created within the call, so it inherits this) takes over.
+_admission: contextvars.ContextVar["_Admission"] = contextvars.ContextVar("a2a_admission")
+
+
+class _Admission:
+    """A slot counted in `InFlightLimiter.in_flight` from admission until released."""
+
+    def __init__(self, limiter: "InFlightLimiter"):
+        self.limiter = limiter
+        self.held = True  # counted, owned by the middleware until claimed
+        self.claimed = False
+
+    def claim(self) -> bool:
+        """Hands the slot to the executor. Returns False if it was already released."""
+        if not self.held or self.claimed:
+            return False
+        self.claimed = True
+        return True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.limiter.in_flight -= 1
+
+
+class InFlightLimiter:
+    """
+    Counts running agent tasks (see `CountingAgentExecutor`) and tracks
+    whether the server is draining.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rejected = 0
+        self.draining = False
+
+    def try_admit(self) -> Optional[_Admission]:
+        """Reserves a slot, or returns None when the server is full or draining."""
+        if self.draining or self.in_flight >= self.max_in_flight:
+            return None
+        self.in_flight += 1
+        return _Admission(self)
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stops admitting new calls and waits for the running ones to finish.
+
+        Returns:
+            bool: True if every in-flight call finished within `timeout`.
+        """
+        self.draining = True
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self.in_flight:
+            logger.warning("Drain timed out with %d calls still in flight", self.in_flight)
+        return self.in_flight == 0
+
+    def drain_on_signals(self, timeout: float, signals=(signal.SIGINT, signal.SIGTERM)):
+        """
+        Puts the server in drain mode as soon as a shutdown signal arrives,
+        while uvicorn is still accepting connections: new calls get 503, and
+        the signal is passed on to uvicorn's own handler (which closes the
+        listener) only once the running tasks finished or `timeout` passed.
+        A second signal skips the wait.
+
+        Must run after uvicorn installed its handlers, e.g. in lifespan startup.
+
+        Returns:
+            Callable[[], None]: Restores the previous handlers.
+        """
+        import threading
+
+        if threading.current_thread() is not threading.main_thread():
+            return lambda: None
+        loop = asyncio.get_running_loop()
+        previous = {}
+
+        async def drain_then_exit(signum):
+            await self.drain(timeout)
+            previous[signum](signum, None)
+
+        def handler(signum, frame):
+            if self.draining:
+                previous[signum](signum, frame)
+                return
+            logger.info("Draining: refusing new calls, waiting for %d running tasks", self.in_flight)
+            self.draining = True
+            loop.call_soon_threadsafe(lambda: loop.create_task(drain_then_exit(signum)))
+
+        for signum in signals:
+            current = signal.getsignal(signum)
+            if callable(current):
+                previous[signum] = current
+                signal.signal(signum, handler)
+
+        def restore():
+            for signum, current in previous.items():
+                if signal.getsignal(signum) is handler:
+                    signal.signal(signum, current)
+
+        return restore
+
+
+class CountingAgentExecutor(A2aAgentExecutor):
+    """
+    A2aAgentExecutor that counts its running tasks in `limiter.in_flight`,
+    including those a non-blocking `message/send` left running in the
+    background after the HTTP call returned. A task takes over the slot
+    `BackpressureMiddleware` reserved for its call.
+    """
+
+    def __init__(self, *, limiter: InFlightLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self._limiter = limiter
+
+    async def execute(self, context, event_queue):
+        admission = _admission.get(None)
+        if admission is None or not admission.claim():
+            # Not admitted by the middleware, or its call already returned.
+            admission = _Admission(self._limiter)
+            self._limiter.in_flight += 1
+        try:
+            await super().execute(context, event_queue)
+        finally:
+            admission.release()
+
+
+class BackpressureMiddleware:
+    """
+    ASGI middleware that rejects `message/send` and `message/stream` calls
+    with 429 once `max_in_flight` agent tasks are running, and with 503 while
+    the server drains. A slot is reserved when a call is admitted, so a burst
+    cannot get past the check before its tasks start. Other JSON-RPC methods
+    (`tasks/get`, `tasks/cancel`, ...) and agent-card GETs are always served.
+    """
+
+    def __init__(self, app, limiter: InFlightLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        body, receive = await _buffer_body(receive)
+        if _jsonrpc_method(body) not in TASK_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiter
+        admission = limiter.try_admit()
+        if admission is None:
+            limiter.rejected += 1
+            status, message = (503, "Server is shutting down") if limiter.draining else (429, "Too many in-flight tasks")
+            response = JSONResponse(
+                {"jsonrpc": "2.0", "id": None, "error": {"code": -32000, "message": message}},
+                status_code=status,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        token = _admission.set(admission)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _admission.reset(token)
+            if not admission.claimed:
+                admission.release()
+
+
+async def _buffer_body(receive):
+    """Reads the whole request body; returns it and a `receive` that replays it."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Disconnected before the body was complete: let the app see it.
+            async def replay_disconnect():
+                return message
+            return b"", replay_disconnect
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay():
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return body, replay
+
+
+def _jsonrpc_method(body: bytes) -> Optional[str]:
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return None
+    return request.get("method") if isinstance(request, dict) else None
+
+
+def _engine_kwargs(db_url: str) -> dict:
+    # SQLite serializes writers across processes; wait for the lock instead of
+    # failing with "database is locked".
+    if db_url.startswith("sqlite"):
+        return {"connect_args": {"timeout": 30}}
+    return {}
+
+
+async def prepare_stores(db_url: str, app_name: Optional[str] = None) -> None:
+    """
+    Creates the session and task tables once, before workers start, so
+    concurrently booting workers do not race on schema creation. SQLite
+    databases are switched to WAL so readers do not block the writer.
+
+    Args:
+        db_url (str): The shared database URL.
+        app_name (str, optional): Also creates this app's state row, which ADK
+            otherwise inserts on the first session and concurrent first
+            requests would collide on.
+    """
+    session_service = DatabaseSessionService(db_url, **_engine_kwargs(db_url))
+    if db_url.startswith("sqlite"):
+        async with session_service.db_engine.begin() as conn:
+            await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    await session_service._ensure_tables_created()
+    if app_name:
+        session = await session_service.create_session(app_name=app_name, user_id="__prepare__")
+        await session_service.delete_session(app_name=app_name, user_id="__prepare__", session_id=session.id)
+    await session_service.db_engine.dispose()
+
+    task_store = DatabaseTaskStore(create_async_engine(db_url, **_engine_kwargs(db_url)))
+    await task_store.initialize()
+    await task_store.engine.dispose()
+
+
+def streaming_request_converter(request, part_converter):
+    """
+    Request converter that runs `message/stream` calls with SSE streaming, so
+    partial model output is published as task status updates while the turn
+    is still running. `message/send` callers only get the final task, so they
+    keep the non-streaming model call.
+    """
+    run_request = convert_a2a_request_to_agent_run_request(request, part_converter)
+    call_context = request.call_context
+    if call_context is not None and call_context.state.get("method") == "message/stream":
+        run_request.run_config.streaming_mode = StreamingMode.SSE
+    return run_request
+
+
+def build_a2a_app(
+    agent: BaseAgent,
+    *,
+    db_url: Optional[str] = None,
+    host: str = "localhost",
+    port: int = 8000,
+    protocol: str = "http",
+    agent_card: Optional[AgentCard] = None,
+    streaming: bool = True,
+    max_in_flight: int = 32,
+    drain_timeout: float = 30.0,
+    metrics: bool = True,
+) -> Starlette:
+    """
+    Like `to_a2a`, plus SSE streaming, backpressure, graceful drain and an
+    optional shared database for sessions and A2A tasks so any worker process
+    can continue any task.
+
+    Args:
+        agent (BaseAgent): The agent to serve.
+        db_url (str, optional): SQLAlchemy async URL shared by all workers
+            (e.g. `sqlite+aiosqlite:///./a2a.db`, `postgresql+asyncpg://...`).
+            In-memory stores are used when omitted, as in `to_a2a`.
+        host, port, protocol: Used to build the RPC URL in the agent card.
+        agent_card (AgentCard, optional): Pre-built card; built from the agent if omitted.
+        streaming (bool): Advertise `message/stream` and stream partial model output.
+        max_in_flight (int): Running agent tasks per worker before answering 429.
+        drain_timeout (float): Seconds to wait for running tasks on shutdown.
+            On SIGINT / SIGTERM the server answers 503 to new calls while it
+            waits, before uvicorn closes its listener.
+        metrics (bool): Serve Prometheus metrics at `/metrics` (requests,
+            in-flight tasks, agent / tool / model latency, tokens, cache hits,
+            event-loop lag); see `adk_common.metrics`.
+
+    Returns:
+        Starlette: The ASGI app, e.g. for `uvicorn --factory`.
+    """
+    if db_url:
+        session_service = DatabaseSessionService(db_url, **_engine_kwargs(db_url))
+        task_store = DatabaseTaskStore(create_async_engine(db_url, **_engine_kwargs(db_url)))
+    else:
+        session_service = InMemorySessionService()
+        task_store = InMemoryTaskStore()
+    runner = Runner(
+        app_name=agent.name or "adk_agent",
+        agent=agent,
+        artifact_service=InMemoryArtifactService(),
+        session_service=session_service,
+        memory_service=InMemoryMemoryService(),
+        credential_service=InMemoryCredentialService(),
+        plugins=[metrics_plugin] if metrics else None,
+    )
+    executor_config = (
+        A2aAgentExecutorConfig(request_converter=streaming_request_converter)
+        if streaming
+        else A2aAgentExecutorConfig()
+    )
+    limiter = InFlightLimiter(max_in_flight)
+    request_handler = DefaultRequestHandler(
+        agent_executor=CountingAgentExecutor(limiter=limiter, runner=runner, config=executor_config),
+        task_store=task_store,
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        card = agent_card or await AgentCardBuilder(
+            agent=agent,
+            rpc_url=f"{protocol}://{host}:{port}/",
+            capabilities=AgentCapabilities(streaming=streaming),
+        ).build()
+        A2AStarletteApplication(agent_card=card, http_handler=request_handler).add_routes_to_app(app)
+        restore_signals = limiter.drain_on_signals(drain_timeout)
+        yield
+        restore_signals()
+        # Shutdowns not caused by a signal still wait for background tasks.
+        await limiter.drain(drain_timeout)
+        if db_url:
+            await task_store.engine.dispose()
+            await session_service.db_engine.dispose()
+
+    # Metrics first, so requests rejected by backpressure are counted too.
+    middleware = [Middleware(MetricsMiddleware)] if metrics else []
+    middleware.append(Middleware(BackpressureMiddleware, limiter=limiter))
+    app = Starlette(lifespan=lifespan, middleware=middleware)
+    app.state.limiter = limiter
+    return app
@@ -0,0 +1,158 @@
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Union
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.apps.app import App
+from google.adk.cli.utils import envs
+from google.adk.cli.utils.agent_loader import AgentLoader
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "agent_manifest.json"
+
+
+@dataclass
+class AgentManifest:
+    """
+    What `adk web` needs to list an agent package, read from its
+    `agent_manifest.json` instead of importing it.
+
+    Args:
+        name (str): App name, i.e. the package directory.
+        root_agent_name (str): `root_agent.name`.
+        description (str): `root_agent.description`.
+        entry_point (str): `module:attribute` of the root agent (or App),
+            importable from the agents directory.
+    """
+
+    name: str
+    root_agent_name: str
+    description: str
+    entry_point: str
+
+    @classmethod
+    def from_file(cls, path: str) -> "AgentManifest":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            name=os.path.basename(os.path.dirname(os.path.abspath(path))),
+            root_agent_name=data["root_agent_name"],
+            description=data.get("description", ""),
+            entry_point=data["entry_point"],
+        )
+
+    def load(self) -> Union[BaseAgent, App]:
+        module_name, _, attr = self.entry_point.partition(":")
+        return getattr(importlib.import_module(module_name), attr or "root_agent")
+
+
+def discover_manifests(agents_dir: str) -> dict[str, AgentManifest]:
+    """Manifests of the agent packages directly under `agents_dir`, by app name."""
+    manifests = {}
+    for entry in sorted(os.listdir(agents_dir)):
+        path = os.path.join(agents_dir, entry, MANIFEST_FILE)
+        if os.path.isfile(path):
+            try:
+                manifests[entry] = AgentManifest.from_file(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error("Invalid %s: %s", path, e)
+    return manifests
+
+
+class ManifestAgentLoader(AgentLoader):
+    """
+    `AgentLoader` that lists the packages with an `agent_manifest.json` from
+    their manifests (plain and detailed listings alike), so discovery imports
+    nothing, and imports an agent's entry point only when the agent is first
+    selected. Directories without a manifest (`adk_common`, `benchmarks`) are
+    not listed.
+
+    `load_seconds` records how long each agent took to load.
+    """
+
+    def __init__(self, agents_dir: str):
+        super().__init__(agents_dir)
+        self.manifests = discover_manifests(os.path.abspath(agents_dir))
+        self.load_seconds: dict[str, float] = {}
+
+    def list_agents(self) -> list[str]:
+        return list(self.manifests)
+
+    def list_agents_detailed(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": manifest.name,
+                "root_agent_name": manifest.root_agent_name,
+                "description": manifest.description,
+                "language": "python",
+            }
+            for manifest in self.manifests.values()
+        ]
+
+    def _perform_load(self, agent_name: str) -> Union[BaseAgent, App]:
+        manifest = self.manifests.get(agent_name)
+        if manifest is None:
+            return super()._perform_load(agent_name)
+
+        agents_dir = os.path.abspath(self.agents_dir)
+        if agents_dir not in sys.path:
+            sys.path.insert(0, agents_dir)
+        envs.load_dotenv_for_agent(agent_name, agents_dir)
+        start = time.perf_counter()
+        loaded = manifest.load()
+        self.load_seconds[agent_name] = time.perf_counter() - start
+        logger.info("Loaded agent %s from %s in %.2fs", agent_name, manifest.entry_point,
+                    self.load_seconds[agent_name])
+        self._record_origin_metadata(
+            loaded=loaded,
+            expected_app_name=agent_name,
+            module_name=manifest.entry_point.partition(":")[0],
+            agents_dir=agents_dir,
+        )
+        return loaded
+
+
+def check_manifests(agents_dir: str) -> list[str]:
+    """
+    Loads every agent and compares it with its manifest.
+
+    Returns:
+        list: One message per mismatch or failed load.
+    """
+    problems = []
+    loader = ManifestAgentLoader(agents_dir)
+    for name, manifest in loader.manifests.items():
+        try:
+            loaded = loader.load_agent(name)
+        except Exception as e:
+            problems.append(f"{name}: {manifest.entry_point} failed to load: {e}")
+            continue
+        agent = loaded.root_agent if isinstance(loaded, App) else loaded
+        if agent.name != manifest.root_agent_name:
+            problems.append(f"{name}: root_agent_name is {agent.name!r}, manifest says {manifest.root_agent_name!r}")
+        if (agent.description or "") != manifest.description:
+            problems.append(f"{name}: description is {agent.description!r}, manifest says {manifest.description!r}")
+    return problems
+
+
+if __name__ == "__main__":
+    import argparse
+
+    argparser = argparse.ArgumentParser(description="List agent manifests, or check them against the agents")
+    argparser.add_argument('agents_dir', nargs='?', default='.')
+    argparser.add_argument('--check', action='store_true', help='Import every agent and compare it with its manifest')
+    args = argparser.parse_args()
+
+    for manifest in discover_manifests(args.agents_dir).values():
+        print(f"{manifest.name:<16} {manifest.root_agent_name:<20} {manifest.entry_point:<32} {manifest.description}")
+    if args.check:
+        problems = check_manifests(args.agents_dir)
+        print("\n".join(problems) or "All manifests match their agents.")
+        sys.exit(1 if problems else 0)
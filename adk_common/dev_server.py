@@ -0,0 +1,74 @@
+"""
+`adk web` with manifest-driven agent discovery (see agent_registry).
+
+The agent list, plain or detailed, comes from the `agent_manifest.json`
+files, so the server starts and lists its agents without importing any of
+them; an agent (and yfinance, qdrant-client, sentence-transformers,
+LiteLLM...) is imported when it is first selected.
+
+    PYTHONPATH=. uv run python -m adk_common.dev_server . --port 8000
+    PYTHONPATH=. uv run python -m adk_common.dev_server a2a_tutorial --port 8000
+"""
+import argparse
+import contextlib
+import os
+import threading
+
+from .agent_registry import ManifestAgentLoader
+
+_patch_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _agent_loader_class(loader_class):
+    """
+    `get_fast_api_app` builds its `AgentLoader` itself and takes no loader
+    argument, so swap the class it uses for the duration of the call only.
+    """
+    from google.adk.cli import fast_api
+
+    with _patch_lock:
+        original = fast_api.AgentLoader
+        fast_api.AgentLoader = loader_class
+        try:
+            yield
+        finally:
+            fast_api.AgentLoader = original
+
+
+def create_dev_app(agents_dir: str, host: str = "127.0.0.1", port: int = 8000, web: bool = True, a2a: bool = False,
+                   metrics: bool = True):
+    """
+    Builds the `adk web` FastAPI app for `agents_dir` with a
+    `ManifestAgentLoader` in place of ADK's `AgentLoader`, and with
+    Prometheus metrics at `/metrics` unless `metrics` is False.
+    """
+    from google.adk.cli import fast_api
+
+    with _agent_loader_class(ManifestAgentLoader):
+        app = fast_api.get_fast_api_app(
+            agents_dir=os.path.abspath(agents_dir), web=web, a2a=a2a, host=host, port=port,
+            extra_plugins=["adk_common.metrics.metrics_plugin"] if metrics else None,
+        )
+    if metrics:
+        from .metrics import MetricsMiddleware
+
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    argparser = argparse.ArgumentParser(description="adk web with manifest-driven agent discovery")
+    argparser.add_argument('agents_dir', nargs='?', default='.', help='Directory holding the agent packages')
+    argparser.add_argument('--host', default='127.0.0.1')
+    argparser.add_argument('--port', type=int, default=8000)
+    argparser.add_argument('--no-web', action='store_true', help='API server only, without the web UI')
+    argparser.add_argument('--a2a', action='store_true', help='Also serve the agents over A2A')
+    argparser.add_argument('--no-metrics', action='store_true', help='Do not serve /metrics')
+    args = argparser.parse_args()
+
+    uvicorn.run(create_dev_app(args.agents_dir, args.host, args.port, web=not args.no_web, a2a=args.a2a,
+                               metrics=not args.no_metrics),
+                host=args.host, port=args.port)
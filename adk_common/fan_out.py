@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import inspect
+import weakref
+from typing import Any, Callable, Optional, Union
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+
+class ConcurrencyLimit:
+    """
+    An `asyncio.Semaphore` of `max_concurrency` slots, created lazily for each
+    running event loop so one limit can be shared by module-level tools.
+    """
+
+    def __init__(self, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+class LimitedTool(BaseTool):
+    """Runs `tool` while holding a slot of a shared `ConcurrencyLimit`."""
+
+    def __init__(self, tool: BaseTool, limit: ConcurrencyLimit):
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            is_long_running=tool.is_long_running,
+            custom_metadata=tool.custom_metadata,
+        )
+        self.tool = tool
+        self.limit = limit
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        return self.tool._get_declaration()
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        async with self.limit.semaphore():
+            return await self.tool.run_async(args=args, tool_context=tool_context)
+
+
+def _off_loop(func: Callable) -> Callable:
+    # FunctionTool calls sync functions on the event loop, which serializes the
+    # calls ADK gathers. Functions that take tool_context stay there: session
+    # state is not safe to mutate from several threads.
+    if inspect.iscoroutinefunction(func) or 'tool_context' in inspect.signature(func).parameters:
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+def fan_out_tools(
+    *targets: Union[BaseAgent, BaseTool, Callable],
+    max_concurrency: int = 4,
+) -> list[BaseTool]:
+    """
+    Turns sub-agents, remote agents, tools and plain functions into tools that
+    the model can call several of in one response.
+
+    ADK already starts every function call of a model response as its own task
+    and gathers them, merging the responses in the order the model issued the
+    calls, so results (and the state deltas agents forward) are deterministic.
+    What keeps a turn sequential is `transfer_to_agent` delegation, which hands
+    the conversation to one agent at a time, and sync functions, which block
+    the loop. Here agents are wrapped in `AgentTool`, sync functions without
+    `tool_context` run in a worker thread, and all returned tools share one
+    limit of `max_concurrency` calls in flight.
+
+    Args:
+        *targets: Agents (including `RemoteA2aAgent`), `BaseTool`s or functions.
+        max_concurrency (int): Calls allowed to run at once across the tools;
+            1 restores sequential execution.
+
+    Returns:
+        list[BaseTool]: Tools to pass to an agent's `tools`.
+
+    Example:
+        root_agent = Agent(..., tools=fan_out_tools(roll_agent, prime_agent))
+    """
+    limit = ConcurrencyLimit(max_concurrency)
+    tools = []
+    for target in targets:
+        if isinstance(target, BaseAgent):
+            tool = AgentTool(target)
+        elif isinstance(target, BaseTool):
+            tool = target
+        else:
+            tool = FunctionTool(_off_loop(target))
+        tools.append(LimitedTool(tool, limit))
+    return tools
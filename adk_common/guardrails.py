@@ -0,0 +1,169 @@
+"""
+Speculative guardrails: expensive checks run concurrently with the model call.
+
+A guardrail is a `before_model_callback`-style function
+`(callback_context, llm_request) -> Optional[LlmResponse]`, sync or async.
+Inline, its latency is added to every model call. A `SpeculativeGuardrail`
+starts its checks and the model call together and holds the model's output
+back until every check has passed; when a check blocks, the in-flight model
+call is cancelled, its output discarded and the check's response returned.
+
+Cheap checks (keyword filters, routers, caches) stay inline, before it:
+
+    guard = SpeculativeGuardrail([classifier_guardrail])
+    agent = Agent(
+        ...,
+        model=guard.wrap(get_llm(model_name)),
+        before_model_callback=[block_keyword_guardrail, router.before_model_callback,
+                               cache.before_model_callback, guard.before_model_callback],
+    )
+
+`guard.before_model_callback` must be the last callback: a callback after it
+could answer in place of the model, leaving the checks unawaited.
+"""
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterable, Optional, Union
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+Guardrail = Callable[
+    [CallbackContext, LlmRequest],
+    Union[Optional[LlmResponse], Awaitable[Optional[LlmResponse]]],
+]
+
+_END = object()  # end of the model's responses
+
+
+@dataclass
+class GuardrailStats:
+    calls: int = 0
+    blocked: int = 0
+    cancelled_model_calls: int = 0
+    check_seconds: float = 0.0
+    waited_seconds: float = 0.0  # time the model's output was held back for the checks
+
+    def summary(self) -> str:
+        hidden = self.check_seconds - self.waited_seconds
+        return (
+            f"Speculative guardrails: {self.calls} calls, {self.blocked} blocked "
+            f"({self.cancelled_model_calls} model calls cancelled), checks took {self.check_seconds:.2f}s, "
+            f"{max(hidden, 0.0):.2f}s of it hidden behind the model"
+        )
+
+
+class SpeculativeGuardrail:
+    """
+    Runs `checks` concurrently with the model call of an agent whose model
+    is `wrap`ped and whose last `before_model_callback` is this object's.
+    All checks run at once; the first to block (in completion order) decides
+    and the others are cancelled.
+
+    Sync checks run on the event loop, like any `before_model_callback`:
+    guardrails may write session state (e.g. a "blocked" flag), which is not
+    safe to mutate from a worker thread while the model call runs on the loop.
+
+    Args:
+        checks (list): Guardrail functions, as for `before_model_callback`.
+        threaded (list, optional): Sync checks among `checks` that do not touch
+            `callback_context.state`, run in a worker thread so that a slow
+            one does not block the loop.
+    """
+
+    def __init__(self, checks: list[Guardrail], threaded: Iterable[Guardrail] = ()):
+        self.checks = list(checks)
+        self.threaded = set(threaded)
+        self.stats = GuardrailStats()
+        self._pending: dict[int, asyncio.Task] = {}
+
+    def wrap(self, model: BaseLlm) -> "GuardedLlm":
+        return GuardedLlm(model=model.model, inner=model, guardrail=self)
+
+    async def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        # The same request object is passed to the model right after this callback.
+        self._pending[id(llm_request)] = asyncio.create_task(self._check(callback_context, llm_request))
+        return None
+
+    async def _run_check(self, check: Guardrail, callback_context: CallbackContext,
+                         llm_request: LlmRequest) -> Optional[LlmResponse]:
+        if check in self.threaded:
+            result = await asyncio.to_thread(check, callback_context, llm_request)
+        else:
+            result = check(callback_context, llm_request)
+        return await result if inspect.isawaitable(result) else result
+
+    async def _check(self, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(self._run_check(check, callback_context, llm_request)) for check in self.checks]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if (response := await next_done) is not None:
+                    return response
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.stats.check_seconds += time.perf_counter() - start
+
+    def _take(self, llm_request: LlmRequest) -> Optional[asyncio.Task]:
+        return self._pending.pop(id(llm_request), None)
+
+
+class GuardedLlm(BaseLlm):
+    """`inner` whose responses are released only once the guardrail's checks pass."""
+
+    inner: BaseLlm
+    guardrail: Any  # SpeculativeGuardrail
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        verdict = self.guardrail._take(llm_request)
+        request = llm_request.model_copy(update={"model": self.inner.model})
+        if verdict is None:
+            # The guardrail callback did not run for this request: nothing to wait for.
+            async for response in self.inner.generate_content_async(request, stream=stream):
+                yield response
+            return
+
+        stats = self.guardrail.stats
+        stats.calls += 1
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce():
+            try:
+                async for response in self.inner.generate_content_async(request, stream=stream):
+                    await queue.put(response)
+            finally:
+                queue.put_nowait(_END)
+
+        producer = asyncio.create_task(produce())
+        try:
+            await asyncio.wait({verdict, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if not verdict.done():
+                # The model finished first: the rest of the checks is pure waiting.
+                held = time.perf_counter()
+                await asyncio.wait({verdict})
+                stats.waited_seconds += time.perf_counter() - held
+            blocked = verdict.result()
+            if blocked is not None:
+                stats.blocked += 1
+                if not producer.done():
+                    stats.cancelled_model_calls += 1
+                yield blocked
+                return
+            while (response := await queue.get()) is not _END:
+                yield response
+            producer.result()  # re-raise a failed model call
+        finally:
+            producer.cancel()
+            verdict.cancel()
+            if producer.done() and not producer.cancelled():
+                producer.exception()  # a model error after a block is not worth a warning
@@ -0,0 +1,199 @@
+import asyncio
+import contextvars
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from .ollama import OllamaLlm
+
+
+# One local Ollama server serves every agent; more parallel requests than it
+# runs (OLLAMA_NUM_PARALLEL) only queue up inside it, out of our sight.
+DEFAULT_MAX_CONCURRENCY = {"ollama": 2}
+FALLBACK_MAX_CONCURRENCY = 16
+
+# Requests sharing a key are queued behind each other; keys take turns. Unset,
+# each task (an `adk web` request, an A2A task) gets its own key on its first
+# model call, which its sub-agents and parallel tool calls then inherit.
+llm_fairness_key: contextvars.ContextVar[str] = contextvars.ContextVar("llm_fairness_key")
+
+
+@dataclass
+class BackendStats:
+    calls: int = 0
+    queued: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    in_flight: int = 0
+    waiting: int = 0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.wait_seconds / self.calls if self.calls else 0.0
+
+
+class FairLimiter:
+    """
+    Admits at most `max_concurrency` holders at once. Waiters are queued per
+    key and served round-robin across keys, so one session issuing many calls
+    cannot starve the others.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.stats = BackendStats()
+        self._queues: dict[str, deque] = {}
+        self._order: deque = deque()
+
+    async def acquire(self, key: str) -> float:
+        """Waits for a slot. Returns the seconds spent queued."""
+        self.stats.calls += 1
+        if self.stats.in_flight < self.max_concurrency and not self._queues:
+            self.stats.in_flight += 1
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        if key not in self._queues:
+            self._queues[key] = deque()
+            self._order.append(key)
+        self._queues[key].append(future)
+        self.stats.queued += 1
+        self.stats.waiting += 1
+        start = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot was handed over just before the cancel
+            else:
+                self._discard(key, future)
+            raise
+        finally:
+            self.stats.waiting -= 1
+        waited = time.perf_counter() - start
+        self.stats.wait_seconds += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+        return waited
+
+    def release(self) -> None:
+        """Hands the slot to the next key's oldest waiter, or frees it."""
+        while self._order:
+            key = self._order.popleft()
+            queue = self._queues[key]
+            future = queue.popleft()
+            if queue:
+                self._order.append(key)
+            else:
+                del self._queues[key]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.stats.in_flight -= 1
+
+    def _discard(self, key: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._queues[key]
+                self._order.remove(key)
+
+
+_limiters: dict[str, FairLimiter] = {}
+
+
+def backend_of(model: str, api_base: str = None) -> str:
+    """`ollama_chat/qwen2.5:7b` -> `ollama`; an explicit api_base is a backend of its own."""
+    provider = model.split("/", 1)[0] if "/" in model else "openai"
+    if provider == "ollama_chat":
+        provider = "ollama"
+    return f"{provider}@{api_base}" if api_base else provider
+
+
+def get_limiter(backend: str) -> FairLimiter:
+    limiter = _limiters.get(backend)
+    if limiter is None:
+        provider = backend.split("@", 1)[0]
+        env = os.getenv(f"{provider.upper()}_MAX_CONCURRENCY") or os.getenv("LLM_MAX_CONCURRENCY")
+        limit = int(env) if env else DEFAULT_MAX_CONCURRENCY.get(provider, FALLBACK_MAX_CONCURRENCY)
+        limiter = _limiters[backend] = FairLimiter(limit)
+    return limiter
+
+
+class _LimitedMixin:
+    """
+    Holds a `FairLimiter` slot for the model call only. ADK runs tool calls
+    and transferred sub-agents while this generator is suspended at a
+    `yield`, so the responses are read under the slot and yielded after it
+    is released: a parent holding a slot while its sub-agent waits for one
+    would deadlock once every slot is taken that way. Streamed partial
+    responses therefore arrive together at the end of the call.
+    """
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = llm_fairness_key.get(None)
+        if key is None:
+            key = uuid.uuid4().hex
+            llm_fairness_key.set(key)
+        limiter = get_limiter(backend_of(self.model, (self._additional_args or {}).get("api_base")))
+        await limiter.acquire(key)
+        try:
+            responses = [response async for response in super().generate_content_async(llm_request, stream=stream)]
+        finally:
+            limiter.release()
+        for response in responses:
+            yield response
+
+
+class SharedLiteLlm(_LimitedMixin, LiteLlm):
+    """`LiteLlm` whose calls go through the backend's `FairLimiter`."""
+
+
+class SharedOllamaLlm(_LimitedMixin, OllamaLlm):
+    """`OllamaLlm` whose calls go through the Ollama server's `FairLimiter`."""
+
+
+_models: dict[str, LiteLlm] = {}
+
+
+def get_llm(model: str, **kwargs) -> LiteLlm:
+    """
+    Returns the process-wide model client for `model` (and `kwargs`).
+
+    Agents sharing a model share one client: LiteLLM keeps one pooled HTTP
+    client per provider, and every call waits for a slot of the backend's
+    `FairLimiter` (2 concurrent calls for Ollama, 16 otherwise; override with
+    `<PROVIDER>_MAX_CONCURRENCY` or `LLM_MAX_CONCURRENCY`). Ollama models get
+    the `OllamaLlm` prefix-cache settings.
+
+    Example:
+        model=get_llm('ollama_chat/qwen2.5:7b')
+    """
+    key = repr((model, sorted(kwargs.items())))
+    llm = _models.get(key)
+    if llm is None:
+        cls = SharedOllamaLlm if model.startswith(("ollama/", "ollama_chat/")) else SharedLiteLlm
+        llm = _models[key] = cls(model=model, **kwargs)
+    return llm
+
+
+def llm_backend_stats() -> dict[str, BackendStats]:
+    """Queue-wait and concurrency counters per backend."""
+    return {backend: limiter.stats for backend, limiter in _limiters.items()}
+
+
+def llm_backend_summary() -> str:
+    return "\n".join(
+        f"{backend}: {s.calls} calls, {s.queued} queued, mean wait {s.mean_wait_seconds * 1000:.0f} ms, "
+        f"max wait {s.max_wait_seconds * 1000:.0f} ms, {s.in_flight} in flight, {s.waiting} waiting"
+        for backend, s in llm_backend_stats().items()
+    )
@@ -0,0 +1,476 @@
+"""
+Prometheus metrics for ADK servers, without a client library.
+
+- `MetricsPlugin` (an ADK plugin; `metrics_plugin` is the process-wide
+  instance) times every agent run, tool call and model call, counts tokens,
+  errors and in-flight invocations.
+- `MetricsMiddleware` (ASGI) counts HTTP requests and their latency, tracks
+  requests in flight, measures event-loop lag and answers `GET /metrics` in
+  the Prometheus text format, before the request reaches the app.
+- The cached tools of `single_flight` and the response caches report their
+  hits and lookups at scrape time.
+
+    app = build_a2a_app(root_agent)                      # both built in
+    app = create_dev_app(".", web=False)                 # both built in
+    adk api_server --a2a --extra_plugins adk_common.metrics.metrics_plugin
+                                                         # ADK_METRICS_PORT=9464 serves /metrics
+
+Every update happens on the event-loop thread (plugin callbacks and ASGI
+calls are coroutines), so the counters are plain ints and floats updated
+without locks; a sample costs a dict lookup and an addition, and a histogram
+observation a bisect over its buckets. The separate metrics port is served
+from a thread, which renders on that event loop too. Metrics are per
+process: with several workers each one reports its own, to be summed by the
+scraper.
+"""
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable, Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+logger = logging.getLogger(__name__)
+
+# Seconds; model calls and agent runs take up to minutes on a local Ollama.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, one value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+    def set(self, *labelvalues, value: float) -> None:
+        """For a counter, only to mirror a count kept elsewhere."""
+        self.values[labelvalues] = value
+
+    def samples(self) -> Iterable[str]:
+        for labelvalues, value in self.values.items():
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.values[labelvalues] = self.values.get(labelvalues, 0) - amount
+
+
+class Histogram:
+    """Observations counted in fixed buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (+Inf last), sum]
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues) -> None:
+        series = self.values.get(labelvalues)
+        if series is None:
+            series = self.values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> Iterable[str]:
+        for labelvalues, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Metrics of a process, rendered in the Prometheus text format. Collectors
+    are called at scrape time to refresh metrics kept elsewhere (cache stats).
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Any] = {}
+        self.collectors: list[Callable[[], None]] = []
+        # The event loop the metrics are updated on, once known.
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _add(self, metric):
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        for collect in self.collectors:
+            try:
+                collect()
+            except Exception:
+                logger.exception("Metrics collector %r failed", collect)
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def render_threadsafe(self, timeout: float = 10.0) -> str:
+        """`render()` from another thread, run on `loop` while it is running."""
+        loop = self.loop
+        if loop is None or not loop.is_running():
+            return self.render()
+
+        async def render() -> str:
+            return self.render()
+
+        return asyncio.run_coroutine_threadsafe(render(), loop).result(timeout)
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests served.", ("method", "status"))
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests being served.")
+HTTP_LATENCY = REGISTRY.histogram("http_request_duration_seconds", "HTTP request latency, to the end of the response.",
+                                  ("method",))
+INVOCATIONS = REGISTRY.counter("adk_invocations_total", "Runner invocations (user turns, A2A tasks).", ("app",))
+INVOCATIONS_IN_FLIGHT = REGISTRY.gauge("adk_invocations_in_flight", "Invocations running.", ("app",))
+AGENT_LATENCY = REGISTRY.histogram("adk_agent_duration_seconds", "Agent run latency.", ("agent",))
+TOOL_LATENCY = REGISTRY.histogram("adk_tool_duration_seconds", "Tool call latency.", ("tool",))
+TOOL_ERRORS = REGISTRY.counter("adk_tool_errors_total", "Tool calls that raised.", ("tool",))
+MODEL_LATENCY = REGISTRY.histogram("adk_model_duration_seconds", "Model call latency, to the complete response.",
+                                   ("agent", "model"))
+MODEL_ERRORS = REGISTRY.counter("adk_model_errors_total", "Model calls that raised.", ("agent", "model"))
+MODEL_TOKENS = REGISTRY.counter("adk_model_tokens_total", "Tokens reported by the model.", ("model", "type"))
+LOOP_LAG = REGISTRY.histogram("event_loop_lag_seconds", "Delay of the event loop in waking up a sleeping task.",
+                              buckets=LAG_BUCKETS)
+LOOP_LAG_LAST = REGISTRY.gauge("event_loop_lag_last_seconds", "Last measured event-loop lag.")
+
+
+def _collect_cache_stats(registry: MetricsRegistry) -> Callable[[], None]:
+    """Copies the single_flight and response cache counters into `registry` at scrape time."""
+    tool_calls = registry.counter("adk_cached_tool_calls_total", "Calls of single_flight cached tools, by outcome.",
+                                  ("tool", "outcome"))
+    lookups = registry.counter("adk_response_cache_lookups_total", "Model response cache lookups, by outcome.",
+                               ("outcome",))
+    hit_rate = registry.gauge("adk_cache_hit_ratio", "Share of calls answered without running the work.", ("cache",))
+
+    def collect() -> None:
+        from .response_cache import response_cache_stats
+        from .single_flight import single_flight_stats
+
+        for tool, counters in single_flight_stats().items():
+            calls = counters['invocations'] + counters['saved']
+            for outcome in ('invocations', 'cache_hits', 'coalesced', 'errors'):
+                tool_calls.set(tool, outcome, value=counters[outcome])
+            hit_rate.set(f"tool:{tool}", value=counters['saved'] / calls if calls else 0.0)
+        stats = response_cache_stats()
+        for outcome in ('lookups', 'hits', 'semantic_hits', 'bypassed'):
+            lookups.set(outcome, value=getattr(stats, outcome))
+        hit_rate.set("model_response", value=stats.hit_rate)
+
+    return collect
+
+
+REGISTRY.collectors.append(_collect_cache_stats(REGISTRY))
+
+
+class MetricsPlugin(BasePlugin):
+    """
+    Records agent, tool and model latencies, token counts and in-flight
+    invocations into `REGISTRY`. Calls are matched to their start by
+    invocation and agent (tool calls by function call id); starts left over by
+    a callback that short-circuited are dropped when the invocation ends.
+
+    ADK does not call `after_run_callback` when a run raises or its consumer
+    stops early (a client disconnects), so an invocation also ends when its
+    context is released, and the oldest ones are forgotten beyond
+    `max_pending_invocations`.
+
+    With ADK_METRICS_PORT set, creating the plugin serves /metrics on that
+    port (see `start_metrics_server`).
+    """
+
+    def __init__(self, name: str = "metrics"):
+        super().__init__(name=name)
+        self._starts: dict[str, dict[Any, tuple[float, str]]] = {}  # invocation id -> key -> (start, model)
+        self._running: dict[str, str] = {}  # invocation id -> app name, oldest first
+        self._lag_monitor: Optional["EventLoopLagMonitor"] = None
+        if os.getenv("ADK_METRICS_PORT"):
+            # `adk api_server` cannot take the middleware: serve /metrics on a port of its own.
+            start_metrics_server(int(os.environ["ADK_METRICS_PORT"]))
+
+    max_pending_invocations = 10_000
+
+    def _start(self, invocation_id: str, key, model: str = "") -> None:
+        self._starts.setdefault(invocation_id, {})[key] = (time.perf_counter(), model)
+
+    def _stop(self, invocation_id: str, key) -> Optional[tuple[float, str]]:
+        """(seconds since the start, model) of a call, None when it was not started."""
+        start = self._starts.get(invocation_id, {}).pop(key, None)
+        return None if start is None else (time.perf_counter() - start[0], start[1])
+
+    def _finish(self, invocation_id: str) -> None:
+        """Ends an invocation once, whichever of its ends comes first."""
+        self._starts.pop(invocation_id, None)
+        app_name = self._running.pop(invocation_id, None)
+        if app_name is not None:
+            INVOCATIONS_IN_FLIGHT.dec(app_name)
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        loop = asyncio.get_running_loop()
+        if REGISTRY.loop is not loop:
+            REGISTRY.loop = loop
+        if self._lag_monitor is None and os.getenv("ADK_METRICS_PORT"):
+            self._lag_monitor = EventLoopLagMonitor()
+        if len(self._running) >= self.max_pending_invocations:
+            self._finish(next(iter(self._running)))
+        invocation_id = invocation_context.invocation_id
+        self._running[invocation_id] = invocation_context.app_name
+        weakref.finalize(invocation_context, self._finish, invocation_id)
+        INVOCATIONS.inc(invocation_context.app_name)
+        INVOCATIONS_IN_FLIGHT.inc(invocation_context.app_name)
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._finish(invocation_context.invocation_id)
+
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> None:
+        self._start(callback_context.invocation_id, ("agent", agent.name))
+        return None
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> None:
+        stop = self._stop(callback_context.invocation_id, ("agent", agent.name))
+        if stop is not None:
+            AGENT_LATENCY.observe(stop[0], agent.name)
+        return None
+
+    async def before_model_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+        self._start(callback_context.invocation_id, ("model", callback_context.agent_name), llm_request.model or "")
+        return None
+
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+        if llm_response.partial:
+            return None
+        stop = self._stop(callback_context.invocation_id, ("model", callback_context.agent_name))
+        if stop is None:
+            return None
+        seconds, model = stop
+        MODEL_LATENCY.observe(seconds, callback_context.agent_name, model)
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            for kind, count in (("prompt", usage.prompt_token_count), ("completion", usage.candidates_token_count),
+                                ("cached", usage.cached_content_token_count)):
+                if count:
+                    MODEL_TOKENS.inc(model, kind, amount=count)
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> None:
+        self._stop(callback_context.invocation_id, ("model", callback_context.agent_name))
+        MODEL_ERRORS.inc(callback_context.agent_name, llm_request.model or "")
+        return None
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: dict[str, Any],
+                                   tool_context: ToolContext) -> None:
+        self._start(tool_context.invocation_id, ("tool", tool_context.function_call_id))
+        return None
+
+    async def after_tool_callback(self, *, tool: BaseTool, tool_args: dict[str, Any],
+                                  tool_context: ToolContext, result: dict) -> None:
+        stop = self._stop(tool_context.invocation_id, ("tool", tool_context.function_call_id))
+        if stop is not None:
+            TOOL_LATENCY.observe(stop[0], tool.name)
+        return None
+
+    async def on_tool_error_callback(self, *, tool: BaseTool, tool_args: dict[str, Any],
+                                     tool_context: ToolContext, error: Exception) -> None:
+        self._stop(tool_context.invocation_id, ("tool", tool_context.function_call_id))
+        TOOL_ERRORS.inc(tool.name)
+        return None
+
+
+class EventLoopLagMonitor:
+    """
+    Sleeps `interval` seconds in a loop on the running event loop and records
+    how much later than asked it woke up: the time callbacks waited behind
+    blocking code (a sync tool, CPU-bound work) or a crowded loop.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - expected, 0.0)
+            LOOP_LAG.observe(lag)
+            LOOP_LAG_LAST.set(value=lag)
+
+    def stop(self) -> None:
+        self._task.cancel()
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def _send_metrics(send, registry: MetricsRegistry) -> None:
+    body = registry.render().encode()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", CONTENT_TYPE.encode()),
+                    (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests, their latency and those in flight;
+    answers `GET <path>` with the metrics of `registry` and starts the
+    event-loop lag monitor on the app's loop.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = REGISTRY, path: str = "/metrics",
+                 lag_interval: float = 0.1):
+        self.app = app
+        self.registry = registry
+        self.path = path
+        self.lag_interval = lag_interval
+        self._lag_monitor: Optional[EventLoopLagMonitor] = None
+
+    async def __call__(self, scope, receive, send):
+        if self._lag_monitor is None and scope["type"] in ("http", "lifespan"):
+            self._lag_monitor = EventLoopLagMonitor(self.lag_interval)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == self.path and scope["method"] == "GET":
+            await _send_metrics(send, self.registry)
+            return
+
+        status = 500
+        method = scope["method"]
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - start, method)
+            HTTP_REQUESTS.inc(method, status)
+            HTTP_IN_FLIGHT.dec()
+
+
+_metrics_servers: dict[tuple[str, int], ThreadingHTTPServer] = {}
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> Optional[ThreadingHTTPServer]:
+    """
+    Serves `registry` at `http://host:port/metrics` (any path) from a daemon
+    thread, for servers whose app cannot take `MetricsMiddleware`. Started
+    once per address and process. A port that cannot be bound is logged and
+    skipped: metrics never keep the server from serving.
+
+    Returns:
+        ThreadingHTTPServer: The server, or None when the port could not be bound.
+    """
+    address = (host, port)
+    if address in _metrics_servers:
+        return _metrics_servers[address]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            try:
+                body = registry.render_threadsafe().encode()
+            except Exception:
+                logger.exception("Rendering metrics failed")
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer(address, Handler)
+    except OSError as e:
+        logger.error("Not serving metrics on %s:%d: %s", host, port, e)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    _metrics_servers[address] = server
+    logger.info("Serving metrics on http://%s:%d/metrics", host, port)
+    return server
+
+
+# For `adk api_server --extra_plugins adk_common.metrics.metrics_plugin`.
+metrics_plugin = MetricsPlugin()
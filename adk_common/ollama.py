@@ -0,0 +1,121 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP_ALIVE = "30m"
+DEFAULT_NUM_CTX = 8192
+
+_pinned_models: set[str] = set()
+
+
+def _pin_model_info(model: str) -> None:
+    # Unless the model is in its registry, LiteLLM asks Ollama's /api/show
+    # whether it supports tools on every call with tools, synchronously and on
+    # the event loop. Ask once and register the answer.
+    import litellm
+
+    name = model.split("/", 1)[1]
+    info = litellm.get_model_info(model=name, custom_llm_provider="ollama")
+    litellm.register_model({
+        f"ollama/{name}": {
+            "litellm_provider": "ollama",
+            "mode": "chat",
+            "supports_function_calling": info.get("supports_function_calling"),
+            "max_tokens": info.get("max_tokens"),
+            "input_cost_per_token": 0,
+            "output_cost_per_token": 0,
+        }
+    })
+
+
+class OllamaLlm(LiteLlm):
+    """
+    `LiteLlm` for `ollama_chat/...` models that lets Ollama reuse the KV cache
+    of the previous request.
+
+    Ollama skips prefill for the longest token prefix it still holds from the
+    last request, so a session only pays for its new messages when:
+
+    - the model stays loaded between turns (`keep_alive`, 30 minutes by
+      default instead of Ollama's 5),
+    - the context window is large enough that Ollama never truncates the
+      start of the prompt (`num_ctx`, Ollama defaults to 2048-4096), and
+    - the prompt starts with the same bytes on every turn. ADK already
+      renders the global instruction, instruction, identity and transfer
+      instructions in a fixed order; tool declarations are sorted by name
+      here so toolsets that list their tools in varying order (MCP) do not
+      change the prefix.
+
+    Both settings can be overridden with OLLAMA_KEEP_ALIVE and OLLAMA_NUM_CTX.
+
+    The model's capabilities are looked up once per process instead of once
+    per call.
+    """
+
+    def __init__(self, model: str, **kwargs):
+        kwargs.setdefault("keep_alive", os.getenv("OLLAMA_KEEP_ALIVE", DEFAULT_KEEP_ALIVE))
+        kwargs.setdefault("num_ctx", int(os.getenv("OLLAMA_NUM_CTX", DEFAULT_NUM_CTX)))
+        super().__init__(model=model, **kwargs)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.model not in _pinned_models:
+            _pinned_models.add(self.model)
+            try:
+                await asyncio.to_thread(_pin_model_info, self.model)
+            except Exception as e:
+                _pinned_models.discard(self.model)
+                logger.debug("Could not look up Ollama model info for %s: %s", self.model, e)
+        for tool in llm_request.config.tools or []:
+            if tool.function_declarations:
+                tool.function_declarations.sort(key=lambda declaration: declaration.name or "")
+        async for response in super().generate_content_async(llm_request, stream=stream):
+            yield response
+
+
+@dataclass
+class OllamaTiming:
+    """Per-request timings reported by Ollama, in seconds."""
+
+    model: str
+    prompt_tokens: int
+    prefill_seconds: float
+    output_tokens: int
+    decode_seconds: float
+    load_seconds: float
+    total_seconds: float
+
+
+def parse_ollama_timing(raw: str) -> Optional[OllamaTiming]:
+    """
+    Reads the timing fields of a non-streaming Ollama `/api/chat` response.
+    `prompt_tokens` counts only the prompt tokens Ollama evaluated, i.e.
+    excluding the prefix it reused from its cache.
+    """
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or "prompt_eval_count" not in data and "eval_count" not in data:
+        return None
+    ns = 1e9
+    return OllamaTiming(
+        model=data.get("model", ""),
+        prompt_tokens=data.get("prompt_eval_count", 0),
+        prefill_seconds=data.get("prompt_eval_duration", 0) / ns,
+        output_tokens=data.get("eval_count", 0),
+        decode_seconds=data.get("eval_duration", 0) / ns,
+        load_seconds=data.get("load_duration", 0) / ns,
+        total_seconds=data.get("total_duration", 0) / ns,
+    )
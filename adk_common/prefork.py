@@ -0,0 +1,265 @@
+"""
+Preload-then-fork serving for `adk api_server` style apps.
+
+`uvicorn --workers N` spawns fresh interpreters, so every worker imports ADK
+and loads its own copy of each model (the qdrant_rag SentenceTransformer is
+~90 MB of weights per worker). Here the parent imports the agents and loads
+the models once, then forks the workers: they all serve from one socket and
+share the parent's pages copy-on-write. Read-only weights are never written,
+so they stay shared; only what a worker allocates or modifies afterwards is
+its own.
+
+    PYTHONPATH=. uv run python -m adk_common.prefork . --workers 4 --port 8000 --no-web \\
+        --preload qdrant_rag.agent:root_agent --preload qdrant_rag.agent:get_embedding_model
+
+`--preload` takes `module:attr`; a callable attribute is called (e.g. a
+cached model loader). Preload only loads: running a torch model in the
+parent before forking can leave the workers with unusable thread pools, and
+open connections (a Qdrant client) must be created in each worker.
+
+The parent prints the RSS / PSS of every worker once they are up and on
+SIGUSR1. PSS divides each shared page among the processes mapping it, so the
+sum of the PSS column is what the workers really cost.
+"""
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Iterable, Optional
+
+
+def preload(specs: Iterable[str]) -> dict[str, float]:
+    """
+    Imports every `module:attr` and calls it when callable.
+
+    Returns:
+        dict[str, float]: Seconds taken per spec.
+    """
+    seconds = {}
+    for spec in specs:
+        start = time.perf_counter()
+        module, _, attr = spec.partition(":")
+        value = importlib.import_module(module)
+        if attr:
+            value = getattr(value, attr)
+            if callable(value) and not isinstance(value, type):
+                value()
+        seconds[spec] = time.perf_counter() - start
+    return seconds
+
+
+def memory_usage(pid: int) -> dict[str, int]:
+    """
+    RSS, PSS, shared and private memory of a process, in bytes (Linux).
+
+    Returns:
+        dict[str, int]: {"rss", "pss", "shared", "private"}; empty when /proc is unavailable.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) * 1024
+    except OSError:
+        return {}
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def memory_report(processes: dict[str, int]) -> str:
+    """One line per process (label -> pid) with RSS / PSS / shared / private MB, and the totals."""
+    mb = 1024 * 1024
+    lines = [f"{'process':<12} {'pid':>7} {'RSS MB':>8} {'PSS MB':>8} {'shared':>8} {'private':>8}"]
+    total_rss = total_pss = 0
+    for label, pid in processes.items():
+        usage = memory_usage(pid)
+        if not usage:
+            lines.append(f"{label:<12} {pid:>7} {'(gone)':>8}")
+            continue
+        total_rss += usage["rss"]
+        total_pss += usage["pss"]
+        lines.append(
+            f"{label:<12} {pid:>7} {usage['rss'] / mb:>8.1f} {usage['pss'] / mb:>8.1f} "
+            f"{usage['shared'] / mb:>8.1f} {usage['private'] / mb:>8.1f}"
+        )
+    lines.append(f"{'total':<12} {'':>7} {total_rss / mb:>8.1f} {total_pss / mb:>8.1f}")
+    return "\n".join(lines)
+
+
+def fork_worker(target: Callable[[int], Optional[int]], worker_id: int) -> int:
+    """
+    Forks a process running `target(worker_id)`; its return value is the exit code.
+
+    Returns:
+        int: The child's pid (in the parent).
+    """
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 1
+    try:
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGUSR1, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        code = target(worker_id) or 0
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+def _exit_with_parent(parent_pid: int, interval: float = 1.0) -> None:
+    """Shuts the worker down once its parent is gone (e.g. killed with SIGKILL)."""
+    while os.getppid() == parent_pid:
+        time.sleep(interval)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def freeze_heap() -> None:
+    """
+    Collects garbage, then moves every object to the GC's permanent
+    generation, so collections in the workers do not write to (and copy) the
+    parent's pages.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+class PreforkServer:
+    """
+    Serves `app` from `workers` forked uvicorn workers on one listening socket,
+    restarting workers that die (see module docstring).
+
+    Args:
+        app: The ASGI app, built in the parent after preloading.
+        host (str), port (int): Address of the shared socket.
+        workers (int): Worker processes.
+        report_after (float): Seconds after startup at which to print the
+            memory report; 0 disables it (SIGUSR1 always prints it).
+        timeout_graceful_shutdown (int, optional): Passed to each uvicorn worker.
+    """
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 8000, workers: int = 2,
+                 report_after: float = 10.0, timeout_graceful_shutdown: Optional[int] = None):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.report_after = report_after
+        self.timeout_graceful_shutdown = timeout_graceful_shutdown
+        self.pids: dict[int, int] = {}  # worker id -> pid
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+        self._report = False
+
+    def _serve(self, worker_id: int) -> int:
+        import threading
+        import uvicorn
+
+        threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+        config = uvicorn.Config(
+            self.app, host=self.host, port=self.port, log_level="info",
+            timeout_graceful_shutdown=self.timeout_graceful_shutdown,
+        )
+        uvicorn.Server(config).run(sockets=[self._socket])
+        return 0
+
+    def _start_worker(self, worker_id: int) -> None:
+        self.pids[worker_id] = fork_worker(self._serve, worker_id)
+
+    def _stop(self, signum, frame) -> None:
+        self._stopping = True
+        for pid in self.pids.values():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _request_report(self, signum, frame) -> None:
+        self._report = True
+
+    def print_report(self) -> None:
+        processes = {"parent": os.getpid()}
+        processes.update({f"worker {worker_id}": pid for worker_id, pid in sorted(self.pids.items())})
+        print(memory_report(processes), flush=True)
+
+    def run(self) -> None:
+        """Binds the socket, forks the workers and supervises them until SIGINT / SIGTERM."""
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        self._socket = socket.socket(family, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        self._socket.listen(2048)
+        self._socket.set_inheritable(True)
+
+        freeze_heap()
+        for worker_id in range(self.workers):
+            self._start_worker(worker_id)
+        print(f"Serving on http://{self.host}:{self.port} with {self.workers} forked workers "
+              f"(parent pid {os.getpid()})", flush=True)
+
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGUSR1, self._request_report)
+        report_at = time.monotonic() + self.report_after if self.report_after else None
+        try:
+            while self.pids:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if pid:
+                    worker_id = next((w for w, p in self.pids.items() if p == pid), None)
+                    if worker_id is None:
+                        continue
+                    del self.pids[worker_id]
+                    if not self._stopping:
+                        print(f"Worker {worker_id} (pid {pid}) exited with status {status}; restarting", flush=True)
+                        self._start_worker(worker_id)
+                    continue
+                if self._report or (report_at is not None and time.monotonic() >= report_at):
+                    self._report, report_at = False, None
+                    self.print_report()
+                time.sleep(0.2)
+        finally:
+            self._socket.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    argparser = argparse.ArgumentParser(description="adk api_server with preloaded agents and forked workers")
+    argparser.add_argument('agents_dir', nargs='?', default='.', help='Directory holding the agent packages')
+    argparser.add_argument('--host', default='127.0.0.1')
+    argparser.add_argument('--port', type=int, default=8000)
+    argparser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    argparser.add_argument('--preload', action='append', default=[],
+                           help='module:attr to import (and call, if callable) before forking; repeatable')
+    argparser.add_argument('--no-web', action='store_true', help='API server only, without the web UI')
+    argparser.add_argument('--a2a', action='store_true', help='Also serve the agents over A2A')
+    argparser.add_argument('--no-metrics', action='store_true', help='Do not serve /metrics (reported per worker)')
+    argparser.add_argument('--report-after', type=float, default=10.0,
+                           help='Seconds after startup to print per-worker memory (0: only on SIGUSR1)')
+    args = argparser.parse_args()
+
+    from .dev_server import create_dev_app
+
+    agents_dir = os.path.abspath(args.agents_dir)
+    if agents_dir not in sys.path:
+        sys.path.insert(0, agents_dir)
+    for spec, seconds in preload(args.preload).items():
+        print(f"Preloaded {spec} in {seconds:.2f}s")
+    print(memory_report({"parent": os.getpid()}), flush=True)
+
+    app = create_dev_app(agents_dir, args.host, args.port, web=not args.no_web, a2a=args.a2a,
+                         metrics=not args.no_metrics)
+    PreforkServer(app, args.host, args.port, args.workers, report_after=args.report_after).run()
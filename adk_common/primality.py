@@ -0,0 +1,201 @@
+"""
+Primality checks for single numbers and batches.
+
+- Batches whose values sit in a dense-enough window are answered with a NumPy
+  segmented sieve over [min, max], when its estimated cost is below that of
+  checking each value with Miller-Rabin.
+- Everything else goes through Miller-Rabin with the first thirteen prime
+  bases, which is deterministic for every n < 3.31 * 10**24 (so all 64-bit
+  inputs). Larger numbers get the Baillie-PSW test (a base-2 strong test and a
+  strong Lucas test), which has no known counterexample.
+- Numbers below SMALL_PRIME_LIMIT are looked up in a cached sieve table.
+"""
+from functools import lru_cache
+from math import isqrt, log
+from typing import Iterable
+
+import numpy as np
+
+
+SMALL_PRIME_LIMIT = 1 << 16
+SEGMENT_SIZE = 1 << 18
+# Widest [min, max] window a batch may span and still be sieved.
+SIEVE_SPAN_LIMIT = 1 << 26
+# The sieve needs base primes up to sqrt(max); above this Miller-Rabin is cheaper.
+SIEVE_VALUE_LIMIT = 1 << 40
+
+# Cost model for choosing the sieve (seconds, measured on CPython 3.12): every
+# segment loops in Python over the base primes up to sqrt(max), then NumPy
+# clears the multiples; a Miller-Rabin candidate mostly fails on its first base.
+_SIEVE_SECONDS_PER_BASE_PRIME = 1.5e-6
+_SIEVE_SECONDS_PER_VALUE = 4e-9
+_MR_SECONDS_PER_CANDIDATE = 8e-6
+
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+# Smallest strong pseudoprime to all of _MR_BASES.
+_MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+
+@lru_cache(maxsize=8)
+def _sieve_table(limit: int) -> np.ndarray:
+    """Boolean table `t` with `t[n]` True iff n is prime, for 0 <= n < limit."""
+    table = np.ones(limit, dtype=bool)
+    table[:2] = False
+    for p in range(2, isqrt(limit - 1) + 1):
+        if table[p]:
+            table[p * p::p] = False
+    return table
+
+
+def small_primes(limit: int = SMALL_PRIME_LIMIT) -> np.ndarray:
+    """
+    Returns all primes below `limit` (cached per power-of-two bucket).
+
+    Args:
+        limit (int): Exclusive upper bound.
+
+    Returns:
+        np.ndarray: The primes as int64, ascending.
+    """
+    bucket = max(SMALL_PRIME_LIMIT, 1 << (max(limit - 1, 1)).bit_length())
+    primes = np.flatnonzero(_sieve_table(bucket))
+    return primes[primes < limit]
+
+
+def _miller_rabin(n: int, bases: Iterable[int] = _MR_BASES) -> bool:
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        if a % n == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas(n: int) -> bool:
+    """Strong Lucas probable-prime test with Selfridge's parameters, for odd n > 2."""
+    if isqrt(n) ** 2 == n:
+        return False  # no D with (D/n) = -1 exists
+    d = 5
+    while (j := _jacobi(d, n)) != -1:
+        if j == 0 and abs(d) != n:
+            return False
+        d = -d - 2 if d > 0 else -d + 2
+    p, q = 1, (1 - d) // 4
+
+    def half(x: int) -> int:
+        return (x if x % 2 == 0 else x + n) // 2 % n
+
+    k, s = n + 1, 0
+    while k % 2 == 0:
+        k //= 2
+        s += 1
+    u, v, qk = 1, p, q % n  # U_1, V_1, Q^1
+    for bit in bin(k)[3:]:
+        u, v, qk = u * v % n, (v * v - 2 * qk) % n, qk * qk % n
+        if bit == '1':
+            u, v, qk = half(p * u + v), half(d * u + p * v), qk * q % n
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v, qk = (v * v - 2 * qk) % n, qk * qk % n
+        if v == 0:
+            return True
+    return False
+
+
+def is_prime(n: int) -> bool:
+    """
+    Checks a single integer.
+
+    Args:
+        n (int): The number to check.
+
+    Returns:
+        bool: True if n is prime.
+    """
+    if n < SMALL_PRIME_LIMIT:
+        return n >= 2 and bool(_sieve_table(SMALL_PRIME_LIMIT)[n])
+    for p in _MR_BASES:
+        if n % p == 0:
+            return False
+    if n < _MR_DETERMINISTIC_LIMIT:
+        return _miller_rabin(n)
+    return _miller_rabin(n, (2,)) and _strong_lucas(n)
+
+
+def _sieve_range(lo: int, hi: int) -> np.ndarray:
+    """Boolean array `f` with `f[i]` True iff lo + i is prime, for lo <= lo + i <= hi."""
+    flags = np.ones(hi - lo + 1, dtype=bool)
+    if lo < 2:
+        flags[:2 - lo] = False
+    base = small_primes(isqrt(hi) + 1)
+    for seg_lo in range(lo, hi + 1, SEGMENT_SIZE):
+        seg_hi = min(seg_lo + SEGMENT_SIZE - 1, hi)
+        segment = flags[seg_lo - lo:seg_hi - lo + 1]
+        for p in base[:np.searchsorted(base, isqrt(seg_hi), side='right')].tolist():
+            start = max(p * p, -(-seg_lo // p) * p)
+            segment[start - seg_lo::p] = False
+    return flags
+
+
+def _sieve_is_cheaper(lo: int, hi: int, count: int) -> bool:
+    """Whether sieving [lo, hi] beats `count` Miller-Rabin checks (see the cost model above)."""
+    span = hi - lo + 1
+    if hi < SMALL_PRIME_LIMIT:
+        return False  # is_prime is a table lookup
+    if hi >= SIEVE_VALUE_LIMIT or span > SIEVE_SPAN_LIMIT:
+        return False
+    root = isqrt(hi)
+    base_primes = root / log(root) if root > 2 else 1
+    segments = -(-span // SEGMENT_SIZE)
+    sieve_seconds = segments * base_primes * _SIEVE_SECONDS_PER_BASE_PRIME + span * _SIEVE_SECONDS_PER_VALUE
+    return sieve_seconds < count * _MR_SECONDS_PER_CANDIDATE
+
+
+def find_primes(nums: Iterable[int]) -> list[int]:
+    """
+    Returns the distinct primes in `nums`, in order of first appearance.
+
+    Args:
+        nums (Iterable[int]): The numbers to check.
+
+    Returns:
+        list[int]: The primes found.
+    """
+    candidates = [n for n in dict.fromkeys(int(n) for n in nums) if n >= 2]
+    if not candidates:
+        return []
+
+    lo, hi = min(candidates), max(candidates)
+    if _sieve_is_cheaper(lo, hi, len(candidates)):
+        values = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        mask = _sieve_range(lo, hi)[values - lo]
+        return values[mask].tolist()
+    return [n for n in candidates if is_prime(n)]
@@ -0,0 +1,273 @@
+import copy
+import hashlib
+import json
+import os
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Iterable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+def _strip_call_ids(content: types.Content) -> dict:
+    data = content.model_dump(mode='json', exclude_none=True)
+    for part in data.get('parts', []):
+        for key in ('function_call', 'function_response'):
+            if key in part:
+                part[key].pop('id', None)
+    return data
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _last_user_text(contents: list[types.Content]) -> Optional[str]:
+    if not contents or contents[-1].role != 'user':
+        return None
+    parts = contents[-1].parts or []
+    if any(part.function_response for part in parts):
+        return None
+    return ' '.join(part.text for part in parts if part.text) or None
+
+
+@dataclass
+class CacheStats:
+    lookups: int = 0
+    hits: int = 0
+    semantic_hits: int = 0
+    bypassed: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.semantic_hits) / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Response cache: {self.hits} exact + {self.semantic_hits} semantic hits / "
+            f"{self.lookups} lookups ({self.hit_rate:.0%}), {self.bypassed} bypassed, "
+            f"{self.stores} stored, {self.evictions} evicted"
+        )
+
+
+@dataclass
+class _Entry:
+    response: LlmResponse
+    expires_at: float
+    prefix: str
+    embedding: Any = None
+
+
+class LlmResponseCache:
+    """
+    Caches model responses across sessions.
+
+    Attach `before_model_callback` and `after_model_callback` to an agent. The
+    key is a SHA-256 of the canonical JSON of the model name, system
+    instruction, tool declarations (sorted by name), conversation contents
+    (with ADK's per-session function call ids removed) and the values of
+    `state_keys`, so "What's the weather in London?" asked in a new session
+    is answered without calling the model, function calls included; the
+    tools themselves still run.
+
+    Requests whose contents hold a result of one of `bypass_tools` (prices,
+    clocks, anything whose answer goes stale) are neither looked up nor
+    stored. Errors and partial (streamed) responses are never stored.
+
+    With `encode` (e.g. `SentenceTransformer(...).encode`), a miss on the
+    first model call of a turn is retried against cached turns that share
+    everything but the user's message, accepting the closest one with cosine
+    similarity of at least `similarity_threshold`. Only text answers are
+    served this way: a response that calls tools was decided for the exact
+    request it answered (its arguments come from that wording), so it is only
+    replayed on an exact hit.
+
+    Args:
+        ttl (float): Seconds a response stays valid.
+        max_size (int): Entries kept; the least recently used are evicted.
+        state_keys (Iterable[str]): Session state that changes the answer,
+            e.g. the preferred temperature unit.
+        bypass_tools (Iterable[str]): Names of tools with time-sensitive results.
+        encode (Callable, optional): Maps a list of texts to embeddings.
+        similarity_threshold (float): Minimum similarity for a semantic hit.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 600,
+        max_size: int = 1024,
+        state_keys: Iterable[str] = (),
+        bypass_tools: Iterable[str] = (),
+        encode: Optional[Callable] = None,
+        similarity_threshold: float = 0.92,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.state_keys = tuple(state_keys)
+        self.bypass_tools = frozenset(bypass_tools)
+        self.encode = encode
+        self.similarity_threshold = similarity_threshold
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Keys of the model calls in progress, by invocation; bounded because a
+        # later before_model_callback may answer the call and skip ours after it.
+        self._pending: OrderedDict[str, tuple[str, str, Any]] = OrderedDict()
+        _caches.add(self)
+        weakref.finalize(self, _add_stats, _retired, self.stats)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _is_time_sensitive(self, llm_request: LlmRequest) -> bool:
+        return any(
+            part.function_response and part.function_response.name in self.bypass_tools
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+
+    def _keys(self, callback_context: CallbackContext, llm_request: LlmRequest) -> tuple[str, str]:
+        """Returns the full key and the key of everything but the last user message."""
+        config = llm_request.config
+        declarations = sorted(
+            (
+                declaration.model_dump(mode='json', exclude_none=True)
+                for tool in (config.tools or [])
+                for declaration in (tool.function_declarations or [])
+            ),
+            key=lambda declaration: declaration['name'],
+        )
+        system_instruction = config.system_instruction
+        if isinstance(system_instruction, types.Content):
+            system_instruction = _strip_call_ids(system_instruction)
+        prefix = {
+            'model': llm_request.model,
+            'system_instruction': system_instruction,
+            'tools': declarations,
+            'state': {key: callback_context.state.get(key) for key in self.state_keys},
+            'history': [_strip_call_ids(content) for content in llm_request.contents[:-1]],
+        }
+        last = [_strip_call_ids(content) for content in llm_request.contents[-1:]]
+        return _digest({**prefix, 'last': last}), _digest(prefix)
+
+    def _get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _nearest(self, prefix: str, text: str) -> tuple[Optional[_Entry], Any]:
+        import numpy as np
+
+        embedding = np.asarray(self.encode([text]))[0]
+        embedding = embedding / np.linalg.norm(embedding)
+        now = self._clock()
+        best, best_score = None, self.similarity_threshold
+        for entry in self._entries.values():
+            if entry.prefix == prefix and entry.embedding is not None and entry.expires_at > now:
+                score = float(entry.embedding @ embedding)
+                if score >= best_score:
+                    best, best_score = entry, score
+        return best, embedding
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if self._is_time_sensitive(llm_request):
+            self.stats.bypassed += 1
+            return None
+
+        self.stats.lookups += 1
+        key, prefix = self._keys(callback_context, llm_request)
+        entry = self._get(key)
+        if entry is not None:
+            self.stats.hits += 1
+            return copy.deepcopy(entry.response)
+
+        text = _last_user_text(llm_request.contents) if self.encode else None
+        if text is not None:
+            entry, embedding = self._nearest(prefix, text)
+            if entry is not None:
+                self.stats.semantic_hits += 1
+                return copy.deepcopy(entry.response)
+        else:
+            embedding = None
+
+        self._pending[callback_context.invocation_id] = (key, prefix, embedding)
+        while len(self._pending) > 256:
+            self._pending.popitem(last=False)
+        return None
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial or llm_response.error_code or not llm_response.content:
+            return None
+        pending = self._pending.pop(callback_context.invocation_id, None)
+        if pending is None:
+            return None
+        key, prefix, embedding = pending
+        response = copy.deepcopy(llm_response)
+        for part in response.content.parts or []:
+            if part.function_call:
+                part.function_call.id = None
+                embedding = None  # exact hits only, see the class docstring
+        self._entries[key] = _Entry(response, self._clock() + self.ttl, prefix, embedding)
+        self._entries.move_to_end(key)
+        self.stats.stores += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return None
+
+
+# Every live cache of the process, for response_cache_stats().
+_caches: "weakref.WeakSet[LlmResponseCache]" = weakref.WeakSet()
+# Counters of the caches already garbage-collected.
+_retired = CacheStats()
+
+
+def _add_stats(totals: CacheStats, stats: CacheStats) -> None:
+    for field in fields(CacheStats):
+        setattr(totals, field.name, getattr(totals, field.name) + getattr(stats, field.name))
+
+
+def response_cache_stats() -> CacheStats:
+    """
+    The counters of every response cache the process created, summed. Caches
+    that were garbage-collected still count, so the totals never go down.
+    """
+    totals = CacheStats()
+    _add_stats(totals, _retired)
+    for cache in list(_caches):
+        _add_stats(totals, cache.stats)
+    return totals
+
+
+def create_response_cache(**kwargs) -> LlmResponseCache:
+    """
+    `LlmResponseCache(**kwargs)`, with semantic lookup when the
+    LLM_CACHE_EMBEDDING_MODEL environment variable names a sentence-transformers
+    model. LLM_CACHE_TTL_SECONDS overrides the TTL.
+    """
+    embedding_model = os.getenv("LLM_CACHE_EMBEDDING_MODEL")
+    if embedding_model and 'encode' not in kwargs:
+        from sentence_transformers import SentenceTransformer
+
+        kwargs['encode'] = SentenceTransformer(embedding_model).encode
+    if os.getenv("LLM_CACHE_TTL_SECONDS"):
+        kwargs['ttl'] = float(os.environ["LLM_CACHE_TTL_SECONDS"])
+    return LlmResponseCache(**kwargs)
@@ -0,0 +1,179 @@
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w' ]+", " ", text.lower()).split())
+
+
+def _last_user_text(llm_request: LlmRequest) -> Optional[str]:
+    """The user message of a fresh turn, or None once the turn has tool results."""
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts or any(p.function_response for p in last.parts):
+        return None
+    return " ".join(p.text for p in last.parts if p.text) or None
+
+
+class EmbeddingClassifier:
+    """
+    Nearest-centroid intent classifier over sentence embeddings.
+
+    Args:
+        examples (dict[str, list[str]]): Example utterances per label.
+        encode (Callable): Maps a list of texts to an array of embeddings,
+            e.g. `SentenceTransformer(...).encode`.
+        threshold (float): Minimum cosine similarity to report a label.
+    """
+
+    def __init__(self, examples: dict[str, list[str]], encode: Callable, threshold: float = 0.75):
+        import numpy as np
+
+        self.encode = encode
+        self.threshold = threshold
+        self.labels = list(examples)
+        centroids = np.stack([np.asarray(encode(texts)).mean(axis=0) for texts in examples.values()])
+        self._centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+    @classmethod
+    def from_sentence_transformer(
+        cls,
+        examples: dict[str, list[str]],
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.75,
+    ) -> "EmbeddingClassifier":
+        from sentence_transformers import SentenceTransformer
+
+        return cls(examples, SentenceTransformer(model_name).encode, threshold)
+
+    def classify(self, text: str) -> tuple[Optional[str], float]:
+        """
+        Returns:
+            tuple: The best label (None below `threshold`) and its similarity.
+        """
+        import numpy as np
+
+        vector = np.asarray(self.encode([text]))[0]
+        scores = self._centroids @ (vector / np.linalg.norm(vector))
+        best = int(scores.argmax())
+        score = float(scores[best])
+        return (self.labels[best] if score >= self.threshold else None), score
+
+
+@dataclass
+class RouterStats:
+    turns: int = 0
+    routed: dict[str, int] = field(default_factory=dict)
+    fallback_model_calls: int = 0
+    fallback_model_seconds: float = 0.0
+
+    @property
+    def routed_turns(self) -> int:
+        return sum(self.routed.values())
+
+    @property
+    def saved_model_seconds(self) -> float:
+        """Routed turns times the mean latency of the model calls that were made."""
+        if not self.fallback_model_calls:
+            return 0.0
+        return self.routed_turns * self.fallback_model_seconds / self.fallback_model_calls
+
+    def summary(self) -> str:
+        share = self.routed_turns / self.turns if self.turns else 0.0
+        return (
+            f"Router: {self.routed_turns}/{self.turns} turns routed without the model ({share:.0%}), "
+            f"~{self.saved_model_seconds:.2f}s of model latency saved, by route: {self.routed}"
+        )
+
+
+class IntentRouter:
+    """
+    Routes obvious intents to a sub-agent without asking the model.
+
+    Attach `before_model_callback` to the coordinating agent (after any
+    guardrail). On the first model call of a turn the user's message is
+    matched against `routes` (full-match regular expressions on the
+    lowercased, punctuation-free text) and then, if given, the embedding
+    `classifier`. A hit answers the model call with a `transfer_to_agent`
+    function call, which ADK executes exactly as if the model had chosen it;
+    anything else falls through to the model.
+
+    Attach `after_model_callback` as well to time the model calls that still
+    happen, which `stats.saved_model_seconds` extrapolates from.
+
+    Args:
+        routes (dict[str, Sequence[str]]): Regular expressions per agent name.
+        classifier (EmbeddingClassifier, optional): Used when no pattern matches.
+        max_words (int): Longer messages always go to the model; the patterns
+            and classifier are meant for short, single-intent messages.
+    """
+
+    def __init__(
+        self,
+        routes: dict[str, Sequence[str]],
+        classifier: Optional[EmbeddingClassifier] = None,
+        max_words: int = 8,
+    ):
+        self.routes = {
+            agent_name: [re.compile(pattern) for pattern in patterns]
+            for agent_name, patterns in routes.items()
+        }
+        self.classifier = classifier
+        self.max_words = max_words
+        self.stats = RouterStats()
+        # Bounded: a later before_model_callback may answer the call and skip ours.
+        self._started: OrderedDict[str, float] = OrderedDict()
+
+    def route(self, text: str) -> Optional[str]:
+        """Returns the agent name for `text`, or None to ask the model."""
+        normalized = _normalize(text)
+        if not normalized or len(normalized.split()) > self.max_words:
+            return None
+        for agent_name, patterns in self.routes.items():
+            if any(pattern.fullmatch(normalized) for pattern in patterns):
+                return agent_name
+        if self.classifier is not None:
+            label, _ = self.classifier.classify(normalized)
+            return label
+        return None
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        text = _last_user_text(llm_request)
+        if text is not None:
+            self.stats.turns += 1
+            agent_name = self.route(text)
+            sub_agents = {agent.name for agent in callback_context._invocation_context.agent.sub_agents}
+            if agent_name in sub_agents:
+                self.stats.routed[agent_name] = self.stats.routed.get(agent_name, 0) + 1
+                return LlmResponse(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(function_call=types.FunctionCall(
+                            name="transfer_to_agent", args={"agent_name": agent_name},
+                        ))],
+                    )
+                )
+        self._started[callback_context.invocation_id] = time.perf_counter()
+        while len(self._started) > 256:
+            self._started.popitem(last=False)
+        return None
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        started = self._started.pop(callback_context.invocation_id, None)
+        if started is not None:
+            self.stats.fallback_model_calls += 1
+            self.stats.fallback_model_seconds += time.perf_counter() - started
+        return None
@@ -0,0 +1,377 @@
+"""
+Session-affine sharding of one agent over worker processes.
+
+A `ShardedRunner` is the front dispatcher: it maps every
+`(app_name, user_id, session_id)` to a worker process with a consistent hash
+ring, and each worker runs its own `InMemoryRunner` and keeps the sessions it
+owns in memory. Turns of different sessions run in parallel on as many
+interpreters (and GILs) as there are workers; turns of one session are
+serialized by the dispatcher, so they always see the session's full history.
+
+Adding or removing a worker moves only the sessions whose owner changes on
+the ring (about 1/N of them); each is exported from its old worker, with its
+events and state, and imported into the new one between two of its turns.
+
+    async with ShardedRunner("my_app.agent:create_agent", app_name="my_app", workers=4) as runner:
+        reply = await runner.run("user", "session-1", "What is the weather in Paris?")
+        await runner.add_worker()
+
+`user:` and `app:` state lives in each worker's session service: it moves
+with a handed-off session but is not kept in sync between workers.
+"""
+import asyncio
+import bisect
+import hashlib
+import importlib
+import itertools
+import multiprocessing
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Iterable, Optional
+
+_STOP = None  # end-of-work marker on the queues
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring with `replicas` virtual points per node: a key
+    belongs to the first node point at or after its hash. Adding or removing
+    a node only moves the keys of the arcs it gains or loses.
+    """
+
+    def __init__(self, nodes: Iterable[Hashable] = (), replicas: int = 64):
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[Hashable] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> set:
+        return set(self._owners)
+
+    def add(self, node: Hashable) -> None:
+        for replica in range(self.replicas):
+            point = _ring_hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: Hashable) -> None:
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def node_for(self, key: str) -> Hashable:
+        if not self._points:
+            raise LookupError("The hash ring has no nodes")
+        index = bisect.bisect_left(self._points, _ring_hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+def session_key(app_name: str, user_id: str, session_id: str) -> str:
+    return f"{app_name}/{user_id}/{session_id}"
+
+
+def _load_agent(spec: str):
+    """The agent for `module:attr`; a callable attribute is called to build it."""
+    from google.adk.agents.base_agent import BaseAgent
+
+    module, _, attr = spec.partition(":")
+    agent = getattr(importlib.import_module(module), attr or "root_agent")
+    return agent if isinstance(agent, BaseAgent) else agent()
+
+
+class _Shard:
+    """A worker's runner and the sessions it owns."""
+
+    def __init__(self, worker_id: int, agent_spec: str, app_name: str):
+        from google.adk.runners import InMemoryRunner
+
+        self.worker_id = worker_id
+        self.app_name = app_name
+        self.runner = InMemoryRunner(agent=_load_agent(agent_spec), app_name=app_name)
+        self.service = self.runner.session_service
+
+    def _stored(self, user_id: str, session_id: str):
+        # The service's own copy: get_session would deep-copy the whole history.
+        return self.service.sessions.get(self.app_name, {}).get(user_id, {}).get(session_id)
+
+    async def run(self, user_id: str, session_id: str, text: str, state: Optional[dict] = None) -> dict:
+        from google.genai import types
+        from .llm_registry import llm_fairness_key
+
+        if self._stored(user_id, session_id) is None:
+            await self.service.create_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id, state=state,
+            )
+        llm_fairness_key.set(session_id)
+        message = types.Content(role="user", parts=[types.Part(text=text)])
+        response, events = "", 0
+        async for event in self.runner.run_async(user_id=user_id, session_id=session_id, new_message=message):
+            events += 1
+            if event.is_final_response() and event.content and event.content.parts:
+                response = "".join(part.text or "" for part in event.content.parts)
+        return {
+            "response": response,
+            "events": events,
+            "session_events": len(self._stored(user_id, session_id).events),
+            "worker": self.worker_id,
+        }
+
+    async def export_session(self, user_id: str, session_id: str) -> Optional[dict]:
+        """Removes a session from this worker and returns it with its user state."""
+        session = self.service.sessions.get(self.app_name, {}).get(user_id, {}).pop(session_id, None)
+        if session is None:
+            return None
+        return {
+            "session": session,
+            "user_state": dict(self.service.user_state.get(self.app_name, {}).get(user_id, {})),
+            "app_state": dict(self.service.app_state.get(self.app_name, {})),
+        }
+
+    async def import_session(self, exported: dict) -> None:
+        session = exported["session"]
+        self.service.sessions.setdefault(self.app_name, {}).setdefault(session.user_id, {})[session.id] = session
+        self.service.user_state.setdefault(self.app_name, {}).setdefault(session.user_id, {}).update(
+            exported["user_state"])
+        self.service.app_state.setdefault(self.app_name, {}).update(exported["app_state"])
+
+    async def sessions(self) -> int:
+        return sum(len(by_user) for by_user in self.service.sessions.get(self.app_name, {}).values())
+
+
+def _worker(worker_id: int, agent_spec: str, app_name: str,
+            requests: multiprocessing.Queue, responses: multiprocessing.Queue):
+    import logging
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    logging.basicConfig(level=logging.ERROR)
+    # Agent and tool banners go to stderr, away from the dispatcher's output.
+    sys.stdout = sys.stderr
+
+    async def handle(request_id: int, op: str, args: tuple):
+        try:
+            responses.put((request_id, True, await getattr(shard, op)(*args)))
+        except Exception as e:
+            responses.put((request_id, False, f"{type(e).__name__}: {e}"))
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        pending = set()
+        while (request := await loop.run_in_executor(None, requests.get)) is not _STOP:
+            task = asyncio.create_task(handle(*request))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+
+    try:
+        shard = _Shard(worker_id, agent_spec, app_name)
+    except Exception as e:
+        responses.put((("ready", worker_id), False, f"{type(e).__name__}: {e}"))
+        return
+    responses.put((("ready", worker_id), True, None))
+    asyncio.run(main())
+
+
+@dataclass
+class ShardingStats:
+    turns: dict[int, int] = field(default_factory=dict)
+    handoffs: int = 0
+    handoff_seconds: float = 0.0
+
+    def summary(self) -> str:
+        per_worker = ", ".join(f"w{worker}={turns}" for worker, turns in sorted(self.turns.items()))
+        return (
+            f"Sharding: {sum(self.turns.values())} turns ({per_worker}), "
+            f"{self.handoffs} session hand-offs in {self.handoff_seconds * 1000:.1f} ms"
+        )
+
+
+class ShardedRunner:
+    """
+    Front dispatcher over worker processes that each own a shard of the sessions.
+
+    Args:
+        agent (str): `module:attr` of the root agent or of a factory returning
+            it, imported in every worker process.
+        app_name (str): App name of the sessions.
+        workers (int): Worker processes started by `start`.
+        replicas (int): Virtual points per worker on the hash ring.
+        start_method (str): multiprocessing start method; "spawn" by default
+            because the dispatcher runs an event loop and a reader thread.
+    """
+
+    def __init__(self, agent: str, app_name: str, workers: int = 2, replicas: int = 64,
+                 start_method: str = "spawn"):
+        self.agent = agent
+        self.app_name = app_name
+        self.initial_workers = workers
+        self.stats = ShardingStats()
+        self._context = multiprocessing.get_context(start_method)
+        self._ring = HashRing(replicas=replicas)
+        self._processes: dict[int, Any] = {}
+        self._requests: dict[int, multiprocessing.Queue] = {}
+        self._responses = self._context.Queue()
+        self._futures: dict[Any, asyncio.Future] = {}
+        self._owners: dict[str, int] = {}  # session key -> worker holding it
+        self._ids: dict[str, tuple[str, str]] = {}  # session key -> (user_id, session_id)
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._request_ids = itertools.count(1)
+        self._worker_ids = itertools.count()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ShardedRunner":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def workers(self) -> list[int]:
+        return sorted(self._processes)
+
+    async def start(self) -> None:
+        self._reader = asyncio.create_task(self._read_responses())
+        await asyncio.gather(*(self._start_worker() for _ in range(self.initial_workers)))
+
+    async def close(self) -> None:
+        for worker_id in list(self._processes):
+            await self._stop_worker(worker_id)
+        if self._reader is not None:
+            self._responses.put(_STOP)
+            await self._reader
+            self._reader = None
+
+    def owner(self, user_id: str, session_id: str) -> int:
+        """The worker a session belongs to on the ring."""
+        return self._ring.node_for(session_key(self.app_name, user_id, session_id))
+
+    async def run(self, user_id: str, session_id: str, text: str, state: Optional[dict] = None) -> dict:
+        """
+        Runs one turn on the session's worker, creating the session (with
+        `state`) on its first turn.
+
+        Returns:
+            dict: "response" (final text), "events" (events of this turn),
+            "session_events" (events in the session so far) and "worker".
+        """
+        key = session_key(self.app_name, user_id, session_id)
+        async with self._lock(key):
+            # A session stays where it is until a rebalance hands it off.
+            worker_id = self._owners.get(key)
+            if worker_id is None:
+                worker_id = self._owners[key] = self._ring.node_for(key)
+                self._ids[key] = (user_id, session_id)
+            result = await self._call(worker_id, "run", user_id, session_id, text, state)
+        self.stats.turns[worker_id] = self.stats.turns.get(worker_id, 0) + 1
+        return result
+
+    async def add_worker(self) -> int:
+        """Starts a worker and hands it the sessions it now owns on the ring."""
+        worker_id = await self._start_worker()
+        await self._rebalance()
+        return worker_id
+
+    async def remove_worker(self, worker_id: int) -> None:
+        """Hands a worker's sessions to their new owners, then stops it."""
+        if len(self._processes) == 1:
+            raise ValueError("Cannot remove the last worker")
+        self._ring.remove(worker_id)
+        await self._rebalance()
+        await self._stop_worker(worker_id)
+
+    async def session_counts(self) -> dict[int, int]:
+        """Sessions held by each worker."""
+        counts = await asyncio.gather(*(self._call(w, "sessions") for w in self.workers))
+        return dict(zip(self.workers, counts))
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    async def _rebalance(self) -> None:
+        moves = [
+            (key, old, new) for key, old in self._owners.items()
+            if (new := self._ring.node_for(key)) != old
+        ]
+        await asyncio.gather(*(self._hand_off(key, old) for key, old, _ in moves))
+
+    async def _hand_off(self, key: str, old: int) -> None:
+        user_id, session_id = self._ids[key]
+        async with self._lock(key):
+            new = self._ring.node_for(key)
+            if self._owners.get(key) != old or new == old:
+                return  # already moved
+            start = time.perf_counter()
+            exported = await self._call(old, "export_session", user_id, session_id)
+            if exported is not None:
+                await self._call(new, "import_session", exported)
+            self._owners[key] = new
+            self.stats.handoffs += 1
+            self.stats.handoff_seconds += time.perf_counter() - start
+
+    async def _start_worker(self) -> int:
+        worker_id = next(self._worker_ids)
+        requests = self._context.Queue()
+        process = self._context.Process(
+            target=_worker, args=(worker_id, self.agent, self.app_name, requests, self._responses),
+            name=f"shard-{worker_id}", daemon=True,
+        )
+        ready = self._future(("ready", worker_id))
+        process.start()
+        self._processes[worker_id], self._requests[worker_id] = process, requests
+        try:
+            await self._wait(worker_id, ready)
+        except Exception:
+            del self._processes[worker_id], self._requests[worker_id]
+            raise
+        self._ring.add(worker_id)
+        return worker_id
+
+    async def _stop_worker(self, worker_id: int) -> None:
+        process = self._processes.pop(worker_id)
+        self._requests.pop(worker_id).put(_STOP)
+        if worker_id in self._ring.nodes:
+            self._ring.remove(worker_id)
+        await asyncio.get_running_loop().run_in_executor(None, process.join)
+
+    def _future(self, request_id) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._futures[request_id] = future
+        return future
+
+    async def _call(self, worker_id: int, op: str, *args):
+        request_id = next(self._request_ids)
+        future = self._future(request_id)
+        self._requests[worker_id].put((request_id, op, args))
+        return await self._wait(worker_id, future)
+
+    async def _wait(self, worker_id: int, future: asyncio.Future):
+        # A worker that dies never answers: check on it while waiting.
+        while not future.done():
+            await asyncio.wait({future}, timeout=1.0)
+            if not future.done() and not self._processes[worker_id].is_alive():
+                raise RuntimeError(f"Worker {worker_id} exited with code {self._processes[worker_id].exitcode}")
+        return future.result()
+
+    async def _read_responses(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (response := await loop.run_in_executor(None, self._responses.get)) is not _STOP:
+            request_id, ok, result = response
+            future = self._futures.pop(request_id, None)
+            if future is None or future.done():
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(result))
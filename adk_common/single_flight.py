@@ -0,0 +1,188 @@
+import asyncio
+import copy
+import inspect
+import json
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ToolCallStats:
+    """Counters for a single cached tool."""
+
+    invocations: int = 0  # times the wrapped function actually ran
+    cache_hits: int = 0   # calls answered from the memoized results
+    coalesced: int = 0    # calls that joined an identical in-flight call
+    errors: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.cache_hits + self.coalesced
+
+
+class CachedFunctionTool(FunctionTool):
+    """
+    A FunctionTool that memoizes results and deduplicates in-flight calls.
+
+    Calls are keyed on the tool arguments only, so the cache is shared by every
+    session that uses the tool instance. Only wrap functions whose result depends
+    on their arguments alone: functions that take a `tool_context` are rejected
+    unless a `scope` maps the context to the part of it the result depends on
+    (e.g. the user id), which is then part of the key. Exceptions are never cached.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        *,
+        ttl: float = 60.0,
+        max_size: int = 1024,
+        key_fn: Optional[Callable[[dict[str, Any]], str]] = None,
+        scope: Optional[Callable[[ToolContext], str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if 'tool_context' in inspect.signature(func).parameters and scope is None:
+            raise ValueError(
+                f"'{func.__name__}' takes a tool_context and cannot be shared across sessions without a scope."
+            )
+        super().__init__(func)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = ToolCallStats()
+        self._key_fn = key_fn or _canonical_key
+        self._scope = scope
+        self._clock = clock
+        self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        _registry.add(self)
+        # A tool that is garbage-collected keeps counting in single_flight_stats().
+        weakref.finalize(self, _retire, self.name, self.stats)
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        key = self._key_fn(args)
+        if self._scope is not None:
+            key = f"{self._scope(tool_context)}|{key}"
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, result = cached
+            if expires_at > self._clock():
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+                return copy.deepcopy(result)
+            del self._cache[key]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+            logger.debug("Coalesced call to %s(%s)", self.name, key)
+        else:
+            self.stats.invocations += 1
+            future = asyncio.ensure_future(
+                self._run_and_store(key, args, tool_context)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so a cancelled caller does not cancel the call others are awaiting.
+        return copy.deepcopy(await asyncio.shield(future))
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        """
+        Drops memoized results (of one scope, or all), e.g. after the underlying
+        data changed. Calls already running are detached: later identical calls
+        start a fresh one, and their possibly stale results are not stored.
+        """
+        if scope is None:
+            self._cache.clear()
+            self._inflight.clear()
+            return
+        prefix = f"{scope}|"
+        for entries in (self._cache, self._inflight):
+            for key in [key for key in entries if key.startswith(prefix)]:
+                del entries[key]
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def _run_and_store(
+        self, key: str, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        call = asyncio.current_task()
+        try:
+            result = await super().run_async(args=args, tool_context=tool_context)
+        except Exception:
+            self.stats.errors += 1
+            raise
+        # Not stored if invalidate() ran meanwhile: the result may predate the change.
+        if self.ttl > 0 and self.max_size > 0 and self._inflight.get(key) is call:
+            self._cache[key] = (self._clock() + self.ttl, result)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return result
+
+
+def _canonical_key(args: dict[str, Any]) -> str:
+    return json.dumps(args, sort_keys=True, separators=(',', ':'), default=str)
+
+
+_registry: "weakref.WeakSet[CachedFunctionTool]" = weakref.WeakSet()
+_STAT_FIELDS = ('invocations', 'cache_hits', 'coalesced', 'errors', 'saved')
+# Counters of the tools already garbage-collected, by tool name.
+_retired: dict[str, dict[str, int]] = {}
+
+
+def _add_stats(totals: dict[str, dict[str, int]], name: str, stats: ToolCallStats) -> None:
+    counters = totals.setdefault(name, dict.fromkeys(_STAT_FIELDS, 0))
+    for field, value in asdict(stats).items():
+        counters[field] += value
+    counters['saved'] += stats.saved
+
+
+def _retire(name: str, stats: ToolCallStats) -> None:
+    _add_stats(_retired, name, stats)
+
+
+def cached_tool(
+    func: Callable[..., Any],
+    *,
+    ttl: float = 60.0,
+    max_size: int = 1024,
+    scope: Optional[Callable[[ToolContext], str]] = None,
+) -> CachedFunctionTool:
+    """
+    Wraps a pure tool function so identical calls are served once.
+
+    Args:
+        func (Callable): The tool function. It may take a `tool_context` only with a `scope`.
+        ttl (float): Seconds a result stays cached. 0 keeps only the single-flight dedup.
+        max_size (int): Maximum number of cached argument sets (LRU eviction).
+        scope (Callable, optional): Maps the tool context to the key results are
+            shared under (e.g. the user id); calls in different scopes never share.
+
+    Returns:
+        CachedFunctionTool: The tool to put in an agent's `tools` list.
+    """
+    return CachedFunctionTool(func, ttl=ttl, max_size=max_size, scope=scope)
+
+
+def single_flight_stats() -> dict[str, dict[str, int]]:
+    """
+    Returns the call counters of every cached tool the process created, summed
+    by tool name. Tools that were garbage-collected still count, so the totals
+    never go down.
+    """
+    totals = {name: dict(counters) for name, counters in _retired.items()}
+    for tool in list(_registry):
+        _add_stats(totals, tool.name, tool.stats)
+    return totals
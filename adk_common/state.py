@@ -0,0 +1,96 @@
+import base64
+from array import array
+from typing import Any, Iterator, MutableMapping
+
+
+class AppendOnlyList:
+    """
+    An append-only sequence of numbers stored in ADK session state.
+
+    Writing `state[key] = state[key] + [item]` copies the whole list on every
+    append and puts the whole list into the event's state delta. This view
+    instead splits the values into fixed-size chunks under separate keys
+    (`<key>#len`, `<key>#0`, `<key>#1`, ...), each a base64-encoded `array`
+    of `typecode` items, so an append only rewrites the last chunk and only
+    that chunk plus the length goes into the delta.
+
+    A plain list left under `<key>` by older code is read as a prefix.
+
+    Example:
+        AppendOnlyList(tool_context.state, 'rolls').append(result)
+        rolls = AppendOnlyList(tool_context.state, 'rolls').to_list()
+    """
+
+    def __init__(
+        self,
+        state: MutableMapping[str, Any],
+        key: str,
+        *,
+        typecode: str = 'q',
+        chunk_size: int = 64,
+    ):
+        self.state = state
+        self.key = key
+        self.typecode = typecode
+        self.chunk_size = chunk_size
+        self._len_key = f'{key}#len'
+
+    def __len__(self) -> int:
+        return len(self._legacy()) + self.state.get(self._len_key, 0)
+
+    def __iter__(self) -> Iterator:
+        yield from self._legacy()
+        for index in range(self._chunk_count()):
+            yield from self._read_chunk(index)
+
+    def __getitem__(self, i: int):
+        legacy = self._legacy()
+        length = len(self)
+        if i < 0:
+            i += length
+        if not 0 <= i < length:
+            raise IndexError(f'{self.key} index out of range')
+        if i < len(legacy):
+            return legacy[i]
+        i -= len(legacy)
+        return self._read_chunk(i // self.chunk_size)[i % self.chunk_size]
+
+    def append(self, item) -> None:
+        self.extend([item])
+
+    def extend(self, items) -> None:
+        """Appends items, touching only the chunks they land in."""
+        items = array(self.typecode, items)
+        if not items:
+            return
+        n = self.state.get(self._len_key, 0)
+        start = 0
+        while start < len(items):
+            index, offset = divmod(n, self.chunk_size)
+            chunk = self._read_chunk(index) if offset else array(self.typecode)
+            take = min(self.chunk_size - offset, len(items) - start)
+            chunk.extend(items[start:start + take])
+            self.state[self._chunk_key(index)] = base64.b64encode(chunk.tobytes()).decode('ascii')
+            start += take
+            n += take
+        self.state[self._len_key] = n
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def _legacy(self) -> list:
+        value = self.state.get(self.key)
+        return value if isinstance(value, list) else []
+
+    def _chunk_count(self) -> int:
+        return -(-self.state.get(self._len_key, 0) // self.chunk_size)
+
+    def _chunk_key(self, index: int) -> str:
+        return f'{self.key}#{index}'
+
+    def _read_chunk(self, index: int) -> array:
+        chunk = array(self.typecode)
+        encoded = self.state.get(self._chunk_key(index))
+        if encoded:
+            chunk.frombytes(base64.b64decode(encoded))
+        return chunk
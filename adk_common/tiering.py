@@ -0,0 +1,195 @@
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from pydantic import Field
+
+from .llm_registry import get_llm
+
+
+def _declared_parameters(llm_request: LlmRequest) -> dict[str, tuple[set[str], Optional[set[str]]]]:
+    """Required and allowed (None: any) argument names per declared function."""
+    declared = {}
+    tools = llm_request.config.tools if llm_request.config else None
+    for tool in tools or []:
+        for declaration in getattr(tool, "function_declarations", None) or []:
+            schema = declaration.parameters_json_schema
+            if schema is None and declaration.parameters is not None:
+                schema = declaration.parameters.model_dump(exclude_none=True)
+            schema = schema or {}
+            properties = schema.get("properties")
+            declared[declaration.name] = (
+                set(schema.get("required") or []),
+                set(properties) if properties is not None else None,
+            )
+    return declared
+
+
+def _looks_like_tool_call(text: str) -> bool:
+    # Small models often write the call as JSON text instead of a tool call.
+    text = text.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    if not text.startswith("{"):
+        return False
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and "name" in data and ("arguments" in data or "parameters" in data)
+
+
+def validate_response(llm_request: LlmRequest, llm_response: LlmResponse) -> Optional[str]:
+    """
+    Checks a model response against the request's tool declarations.
+
+    Returns:
+        str: Why the response is unusable (`error`, `empty`, `unknown_tool`,
+            `bad_arguments`, `tool_call_as_text`), or None if it is fine.
+    """
+    if llm_response.error_code:
+        return "error"
+    parts = llm_response.content.parts if llm_response.content else None
+    calls = [part.function_call for part in parts or [] if part.function_call]
+    text = "".join(part.text for part in parts or [] if part.text and not part.thought)
+    if not calls and not text.strip():
+        return "empty"
+    declared = _declared_parameters(llm_request)
+    for call in calls:
+        if call.name not in declared:
+            return "unknown_tool"
+        required, allowed = declared[call.name]
+        args = set(call.args or {})
+        if not required <= args or (allowed is not None and not args <= allowed):
+            return "bad_arguments"
+    if not calls and declared and _looks_like_tool_call(text):
+        return "tool_call_as_text"
+    return None
+
+
+@dataclass
+class TieringStats:
+    calls: int = 0
+    escalations: dict[str, int] = field(default_factory=dict)
+    small_seconds: float = 0.0
+    large_calls: int = 0
+    large_seconds: float = 0.0
+
+    @property
+    def escalated(self) -> int:
+        return sum(self.escalations.values())
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.calls if self.calls else 0.0
+
+    @property
+    def saved_seconds(self) -> Optional[float]:
+        """
+        Latency saved against sending every call to the large model, estimated
+        from the large model's mean latency on escalated calls (None before the
+        first one). Small-model attempts that were escalated count as a cost.
+        """
+        if not self.large_calls:
+            return None
+        mean_large = self.large_seconds / self.large_calls
+        return (self.calls - self.escalated) * mean_large - self.small_seconds
+
+    def summary(self) -> str:
+        saved = self.saved_seconds
+        saved_text = f"~{saved:.2f}s" if saved is not None else "n/a (no large-model calls yet)"
+        return (
+            f"Tiering: {self.escalated}/{self.calls} calls escalated ({self.escalation_rate:.0%}), "
+            f"latency saved {saved_text}, by reason: {self.escalations}"
+        )
+
+
+class TieredLlm(BaseLlm):
+    """
+    Tries a small model first and escalates to a large one when the small
+    model's answer does not validate (see `validate_response`): an error, an
+    empty answer, a call to an undeclared tool, missing or unknown arguments,
+    or a tool call written out as text. Meant for agents whose job is a
+    single simple tool call.
+
+    The small model is always called without streaming so its answer can be
+    checked before anything reaches the user.
+
+    Example:
+        model=TieredLlm.of('ollama_chat/qwen2.5:0.5b', 'ollama_chat/qwen2.5:7b')
+    """
+
+    small: BaseLlm
+    large: BaseLlm
+    stats: TieringStats = Field(default_factory=TieringStats)
+
+    @classmethod
+    def of(cls, small_model: str, large_model: str) -> "TieredLlm":
+        return cls(
+            model=f"tiered:{small_model}>{large_model}",
+            small=get_llm(small_model),
+            large=get_llm(large_model),
+        )
+
+    async def _call(self, llm: BaseLlm, llm_request: LlmRequest, stream: bool):
+        # LiteLlm prefers llm_request.model over its own and appends to contents.
+        request = llm_request.model_copy(update={"model": llm.model, "contents": list(llm_request.contents)})
+        async for response in llm.generate_content_async(request, stream=stream):
+            yield response
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.stats.calls += 1
+        start = time.perf_counter()
+        response = None
+        try:
+            async for response in self._call(self.small, llm_request, stream=False):
+                pass
+            reason = validate_response(llm_request, response) if response is not None else "empty"
+        except Exception:
+            reason = "error"
+        self.stats.small_seconds += time.perf_counter() - start
+        if reason is None:
+            yield response
+            return
+
+        self.stats.escalations[reason] = self.stats.escalations.get(reason, 0) + 1
+        start = time.perf_counter()
+        try:
+            async for response in self._call(self.large, llm_request, stream=stream):
+                yield response
+        finally:
+            self.stats.large_calls += 1
+            self.stats.large_seconds += time.perf_counter() - start
+
+
+def model_for_agent(agent_name: str, default_model: str) -> BaseLlm:
+    """
+    Model of one agent, configured per agent in the environment:
+
+    - `<AGENT_NAME>_MODEL` (e.g. `GREETING_AGENT_MODEL`) pins the agent to
+      that model;
+    - `<AGENT_NAME>_SMALL_MODEL`, or `SMALL_MODEL_NAME` for every agent that
+      asks, makes it a `TieredLlm` that tries that model first and escalates
+      to `default_model`;
+    - otherwise the agent uses `default_model`.
+    """
+    prefix = agent_name.upper()
+    pinned = os.getenv(f"{prefix}_MODEL")
+    if pinned:
+        return get_llm(pinned)
+    small_model = os.getenv(f"{prefix}_SMALL_MODEL") or os.getenv("SMALL_MODEL_NAME")
+    if small_model and small_model != default_model:
+        return TieredLlm.of(small_model, default_model)
+    return get_llm(default_model)
+
+
+def tiering_summary(*agents) -> str:
+    """Tiering stats of the given agents that use a `TieredLlm`."""
+    return "\n".join(
+        f"{agent.name}: {agent.model.stats.summary()}" for agent in agents if isinstance(agent.model, TieredLlm)
+    )
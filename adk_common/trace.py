@@ -0,0 +1,267 @@
+import abc
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.events.event import Event
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from .response_cache import _strip_call_ids
+
+
+TRACE_VERSION = 1
+
+
+def _request_fingerprint(llm_request: LlmRequest) -> str:
+    """Hash of what the model was asked, without ADK's per-run function call ids."""
+    data = [_strip_call_ids(content) for content in llm_request.contents]
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def event_summary(event: Event) -> dict:
+    """The parts of an event a replay must reproduce: author, calls, text and state changes."""
+    parts = event.content.parts if event.content else None
+    return {
+        "author": event.author,
+        "calls": [[p.function_call.name, p.function_call.args or {}] for p in parts or [] if p.function_call],
+        "responses": [p.function_response.name for p in parts or [] if p.function_response],
+        "text": "".join(p.text for p in parts or [] if p.text and not p.thought),
+        "state_delta": sorted(event.actions.state_delta) if event.actions else [],
+        "transfer": event.actions.transfer_to_agent if event.actions else None,
+    }
+
+
+@dataclass
+class Trace:
+    """
+    A recorded run: its model responses per agent, in call order, and a
+    summary of every event per turn. Stored as gzip-compressed JSON lines,
+    typically a few KB per conversation.
+    """
+
+    meta: dict = field(default_factory=dict)
+    model_calls: list[dict] = field(default_factory=list)
+    turns: list[dict] = field(default_factory=list)
+
+    def save(self, path: str) -> None:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "meta", "version": TRACE_VERSION, **self.meta}) + "\n")
+            for call in self.model_calls:
+                f.write(json.dumps({"type": "model", **call}, separators=(",", ":")) + "\n")
+            for turn in self.turns:
+                f.write(json.dumps({"type": "turn", **turn}, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        trace = cls()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                kind = record.pop("type")
+                if kind == "meta":
+                    if record.pop("version", None) != TRACE_VERSION:
+                        raise ValueError(f"{path}: unsupported trace version")
+                    trace.meta = record
+                elif kind == "model":
+                    trace.model_calls.append(record)
+                elif kind == "turn":
+                    trace.turns.append(record)
+        return trace
+
+
+class RecordingLlm(BaseLlm):
+    """Passes calls to `inner` and appends its responses to the recorder's trace."""
+
+    inner: BaseLlm
+    agent_name: str
+    recorder: Any
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        fingerprint = _request_fingerprint(llm_request)
+        responses = []
+        try:
+            async for response in self.inner.generate_content_async(llm_request, stream=stream):
+                responses.append(response.model_dump(mode="json", exclude_none=True))
+                yield response
+        finally:
+            self.recorder.stats.model_calls += 1
+            self.recorder.trace.model_calls.append(
+                {"agent": self.agent_name, "request": fingerprint, "responses": responses}
+            )
+
+
+class ReplayLlm(BaseLlm):
+    """Answers each call of one agent with the next recorded responses of that agent."""
+
+    agent_name: str
+    replayer: Any
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        queue = self.replayer._calls[self.agent_name]
+        if not queue:
+            raise RuntimeError(f"Trace has no more model calls for agent {self.agent_name!r}")
+        call = queue.popleft()
+        self.replayer.stats.model_calls += 1
+        if call["request"] != _request_fingerprint(llm_request):
+            self.replayer.stats.request_mismatches += 1
+        for response in call["responses"]:
+            yield LlmResponse.model_validate(response)
+
+
+@dataclass
+class TraceStats:
+    turns: int = 0
+    turn_seconds: list[float] = field(default_factory=list)
+    model_calls: int = 0
+    request_mismatches: int = 0
+    event_mismatches: list[str] = field(default_factory=list)
+
+    @property
+    def mean_turn_ms(self) -> float:
+        return 1000 * sum(self.turn_seconds) / len(self.turn_seconds) if self.turn_seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Trace: {self.turns} turns, mean {self.mean_turn_ms:.1f} ms/turn, {self.model_calls} model calls, "
+            f"{self.request_mismatches} request mismatches, {len(self.event_mismatches)} event mismatches"
+        )
+
+
+class _TracedRunner:
+    """A `Runner` whose `run_async` reports each turn to a recorder or replayer."""
+
+    def __init__(self, runner, tracer: "_Tracer"):
+        self._runner = runner
+        self._tracer = tracer
+
+    def __getattr__(self, name: str):
+        return getattr(self._runner, name)
+
+    async def run_async(self, *, user_id: str, session_id: str, new_message, **kwargs):
+        # A turn ends at its first final response: callers usually stop there,
+        # and an abandoned generator is only closed whenever it is collected.
+        query = "".join(p.text or "" for p in new_message.parts or []) if new_message else ""
+        events, ended = [], False
+        start = time.perf_counter()
+        try:
+            async for event in self._runner.run_async(
+                user_id=user_id, session_id=session_id, new_message=new_message, **kwargs
+            ):
+                if not ended:
+                    events.append(event_summary(event))
+                    if event.is_final_response():
+                        ended = True
+                        self._tracer._end_turn(query, events, time.perf_counter() - start)
+                yield event
+        finally:
+            if not ended:
+                self._tracer._end_turn(query, events, time.perf_counter() - start)
+
+
+class _Tracer(abc.ABC):
+    """What `TraceRecorder` and `TraceReplayer` share: agent instrumentation and turn bookkeeping."""
+
+    def __init__(self):
+        self.stats = TraceStats()
+
+    @abc.abstractmethod
+    def _model_for(self, agent: LlmAgent) -> BaseLlm:
+        """The model that replaces `agent`'s model."""
+
+    def instrument(self, agent) -> None:
+        """Swaps the model of `agent` and of every LLM agent below it."""
+        if isinstance(agent, LlmAgent):
+            agent.model = self._model_for(agent)
+        for sub_agent in agent.sub_agents:
+            self.instrument(sub_agent)
+
+    def wrap_runner(self, runner):
+        """Returns `runner` with its turns recorded (or checked against the trace)."""
+        return _TracedRunner(runner, self)
+
+    def _end_turn(self, query: str, events: list[dict], seconds: float) -> None:
+        self.stats.turns += 1
+        self.stats.turn_seconds.append(seconds)
+
+
+class TraceRecorder(_Tracer):
+    """
+    Records a run into a `Trace`.
+
+        recorder = TraceRecorder(scenario="team")
+        recorder.instrument(root_agent)
+        runner = recorder.wrap_runner(Runner(agent=root_agent, ...))
+        ...  # run the conversation
+        recorder.save("run.trace.gz")
+    """
+
+    def __init__(self, **meta):
+        super().__init__()
+        self.trace = Trace(meta=meta)
+
+    def _model_for(self, agent: LlmAgent) -> BaseLlm:
+        model = agent.canonical_model
+        return RecordingLlm(model=model.model, inner=model, agent_name=agent.name, recorder=self)
+
+    def _end_turn(self, query: str, events: list[dict], seconds: float) -> None:
+        super()._end_turn(query, events, seconds)
+        self.trace.turns.append({"query": query, "events": events, "seconds": round(seconds, 4)})
+
+    def save(self, path: str) -> None:
+        self.trace.save(path)
+
+
+class TraceReplayer(_Tracer):
+    """
+    Runs the framework against a `Trace`: every model call is answered with
+    the recorded responses (no model server needed) while callbacks, tools,
+    transfers and state handling run for real, and each turn's events are
+    compared with the recorded ones. Drive it with the same conversation
+    that was recorded.
+
+    Args:
+        trace (Trace): The recording.
+        strict (bool): Raise on the first event mismatch instead of counting it.
+    """
+
+    def __init__(self, trace: Trace, strict: bool = False):
+        super().__init__()
+        self.trace = trace
+        self.strict = strict
+        self._calls: dict[str, deque] = defaultdict(deque)
+        for call in trace.model_calls:
+            self._calls[call["agent"]].append(call)
+        self._turns = deque(trace.turns)
+
+    def _model_for(self, agent: LlmAgent) -> BaseLlm:
+        return ReplayLlm(model=f"replay:{agent.name}", agent_name=agent.name, replayer=self)
+
+    def _end_turn(self, query: str, events: list[dict], seconds: float) -> None:
+        super()._end_turn(query, events, seconds)
+        expected: Optional[dict] = self._turns.popleft() if self._turns else None
+        problem = None
+        if expected is None:
+            problem = f"turn {self.stats.turns} ({query!r}) is not in the trace"
+        elif expected["query"] != query:
+            problem = f"turn {self.stats.turns}: query {query!r}, trace has {expected['query']!r}"
+        elif expected["events"] != events:
+            problem = f"turn {self.stats.turns} ({query!r}): events differ from the trace"
+        if problem:
+            self.stats.event_mismatches.append(problem)
+            if self.strict:
+                raise AssertionError(problem)
+
+    @property
+    def unused_model_calls(self) -> int:
+        return sum(len(queue) for queue in self._calls.values())
@@ -1,11 +1,14 @@
 from google.adk.agents.llm_agent import Agent, LlmAgent
-from google.adk.models.lite_llm import LiteLlm
 
-import yfinance as yf
 from datetime import datetime
 
+from adk_common.llm_registry import get_llm
+from adk_common.response_cache import create_response_cache
 
-def get_stock_price(ticker: str) -> float:
+from .quotes import get_provider
+
+
+async def get_stock_price(ticker: str) -> dict:
     """
     Fetches the current stock price for the given ticker symbol.
 
@@ -13,11 +16,28 @@ def get_stock_price(ticker: str) -> float:
         ticker (str): The stock ticker symbol.
 
     Returns:
-        float: The current stock price.
+        dict: The ticker and its current price.
+    """
+    price = await get_provider().get_price(ticker)
+    return {'ticker': ticker, 'price': price if price is not None else 'Price not available'}
+
+async def get_stock_prices(tickers: list[str]) -> dict:
     """
-    stock = yf.Ticker(ticker)
-    price = stock.info.get('currentPrice', 'Price not available')
-    return {'ticker': ticker, 'price': price}
+    Fetches the current stock prices for several ticker symbols at once.
+
+    Args:
+        tickers (list[str]): The stock ticker symbols.
+
+    Returns:
+        dict: The list of tickers with their current prices.
+    """
+    prices = await get_provider().get_prices(tickers)
+    return {
+        'prices': [
+            {'ticker': ticker, 'price': price if price is not None else 'Price not available'}
+            for ticker, price in prices.items()
+        ]
+    }
 
 def get_current_time() -> dict:
     """
@@ -31,12 +51,19 @@ def get_current_time() -> dict:
 
     return {'status': 'success', 'report': report}
 
+# Prices and the clock go stale, so turns holding their results skip the cache.
+response_cache = create_response_cache(
+    bypass_tools=['get_current_time', 'get_stock_price', 'get_stock_prices'],
+)
+
 time_agent = Agent(
     name='time_agent',
     description='A helpful assistant that provides the current system time.',
     instruction='You are a time assistant. Always use the get_current_time tool.',
-    model=LiteLlm(model='ollama_chat/qwen2.5:7b'),
+    model=get_llm('ollama_chat/qwen2.5:7b'),
     tools=[get_current_time],
+    before_model_callback=response_cache.before_model_callback,
+    after_model_callback=response_cache.after_model_callback,
 )
 
 base_agent = LlmAgent(
@@ -44,17 +71,20 @@ base_agent = LlmAgent(
     description='A helpful assistant that get stock price.',
     instruction=(
         'You are a stock price assistant. Always use the get_stock_price tool.'
+        'When asked about several tickers, use the get_stock_prices tool once with all of them.'
         'Include the ticker symbol in your response.'
         'You have access to a specialist sub-agent called time_agent that can provide the current system time.'
     ),
-    model=LiteLlm(model='ollama_chat/qwen2.5:7b'),
+    model=get_llm('ollama_chat/qwen2.5:7b'),
     # model=LiteLlm(
     #     api_base='http://localhost:11434/v1',
     #     model='openai/qwen2.5:7b',
     #     api_key='ollama', # Replace with your actual API key if needed
     # ),
-    tools=[get_stock_price],
+    tools=[get_stock_price, get_stock_prices],
     sub_agents=[time_agent],
+    before_model_callback=response_cache.before_model_callback,
+    after_model_callback=response_cache.after_model_callback,
 )
 
 root_agent = base_agent
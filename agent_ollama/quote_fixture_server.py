@@ -0,0 +1,61 @@
+"""
+Local stand-in for the quote backend, so the stock agent can run without network.
+
+    uv run agent_ollama/quote_fixture_server.py --port 8765
+    STOCK_QUOTE_SOURCE_URL=http://localhost:8765 adk web
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_PRICES = {
+    "AAPL": 190.12,
+    "GOOGL": 172.45,
+    "MSFT": 415.3,
+    "NVDA": 121.78,
+}
+
+
+def make_handler(prices: dict, delay: float):
+    class QuoteHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            prefix = "/quote/"
+            if not self.path.startswith(prefix):
+                self.send_error(404)
+                return
+            ticker = self.path[len(prefix):].upper()
+            if delay:
+                time.sleep(delay)
+            if ticker not in prices:
+                self.send_error(404)
+                return
+            body = json.dumps({"ticker": ticker, "price": prices[ticker]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return QuoteHandler
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Serve fixed stock quotes over HTTP")
+    argparser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    argparser.add_argument('--prices', type=str, required=False, help='JSON file mapping ticker to price')
+    argparser.add_argument('--delay', type=float, default=0.0, help='Artificial latency per request in seconds')
+    args = argparser.parse_args()
+
+    prices = DEFAULT_PRICES
+    if args.prices:
+        with open(args.prices) as f:
+            prices = {k.upper(): v for k, v in json.load(f).items()}
+
+    server = ThreadingHTTPServer(("localhost", args.port), make_handler(prices, args.delay))
+    print(f"Serving {len(prices)} quotes on http://localhost:{args.port}/quote/<ticker>")
+    server.serve_forever()
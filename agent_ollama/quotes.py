@@ -0,0 +1,160 @@
+import asyncio
+import os
+import time
+from typing import Optional, Protocol
+
+import httpx
+
+
+class QuoteSource(Protocol):
+    """Anything that can fetch the latest price for a single ticker."""
+
+    async def fetch(self, ticker: str) -> Optional[float]:
+        ...
+
+
+class YFinanceQuoteSource:
+    """
+    Reads the last traded price from yfinance.
+
+    Uses `Ticker.fast_info`, which only hits the lightweight quote endpoint,
+    instead of `Ticker.info`, which downloads the full company profile.
+    """
+
+    async def fetch(self, ticker: str) -> Optional[float]:
+        # yfinance is synchronous; keep it off the event loop.
+        return await asyncio.to_thread(self._fetch_sync, ticker)
+
+    @staticmethod
+    def _fetch_sync(ticker: str) -> Optional[float]:
+        import yfinance as yf
+
+        try:
+            price = yf.Ticker(ticker).fast_info['last_price']
+        except Exception:
+            return None
+        if price is None or price != price:  # NaN for unknown symbols
+            return None
+        return float(price)
+
+
+class HttpQuoteSource:
+    """
+    Fetches prices from an HTTP service answering `GET {base_url}/quote/{ticker}`
+    with `{"price": <float>}`. Used to point the agent at a local fixture server
+    (see `quote_fixture_server.py`) instead of the network.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 5.0):
+        self.base_url = base_url.rstrip('/')
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def fetch(self, ticker: str) -> Optional[float]:
+        # Like YFinanceQuoteSource, a failed lookup is "no price", so one bad
+        # ticker does not fail a whole get_prices batch.
+        try:
+            response = await self._client.get(f'{self.base_url}/quote/{ticker}')
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            price = response.json().get('price')
+        except (httpx.HTTPError, ValueError):
+            return None
+        return None if price is None else float(price)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class QuoteProvider:
+    """
+    Per-ticker TTL cache in front of a `QuoteSource`.
+
+    Concurrent lookups of the same ticker share a single in-flight fetch, so a
+    burst of identical requests costs one upstream call. Failed or unknown
+    tickers are not cached.
+    """
+
+    def __init__(self, source: QuoteSource, ttl: float = 30.0, clock=time.monotonic):
+        self.source = source
+        self.ttl = ttl
+        self._clock = clock
+        self._cache: dict[str, tuple[float, float]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def normalize(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    async def get_price(self, ticker: str) -> Optional[float]:
+        """
+        Returns the cached price for `ticker`, fetching it if missing or stale.
+
+        Args:
+            ticker (str): The stock ticker symbol.
+
+        Returns:
+            Optional[float]: The price, or None if the source has no price.
+        """
+        key = self.normalize(ticker)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > self._clock():
+            return cached[1]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the shared fetch.
+        return await asyncio.shield(future)
+
+    async def get_prices(self, tickers: list[str]) -> dict[str, Optional[float]]:
+        """
+        Fetches several tickers concurrently.
+
+        Args:
+            tickers (list[str]): The stock ticker symbols.
+
+        Returns:
+            dict[str, Optional[float]]: Normalized ticker to price (None if unavailable).
+        """
+        keys = list(dict.fromkeys(self.normalize(t) for t in tickers))
+        prices = await asyncio.gather(*(self.get_price(k) for k in keys))
+        return dict(zip(keys, prices))
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        if ticker is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self.normalize(ticker), None)
+
+    async def _load(self, key: str) -> Optional[float]:
+        price = await self.source.fetch(key)
+        if price is not None:
+            self._cache[key] = (self._clock() + self.ttl, price)
+        return price
+
+
+_provider: Optional[QuoteProvider] = None
+
+
+def get_provider() -> QuoteProvider:
+    """
+    Returns the process-wide provider, built on first use from the environment:
+    `STOCK_QUOTE_SOURCE_URL` selects an `HttpQuoteSource` (default: yfinance) and
+    `STOCK_QUOTE_TTL_SECONDS` sets the cache TTL (default: 30).
+    """
+    global _provider
+    if _provider is None:
+        source_url = os.getenv('STOCK_QUOTE_SOURCE_URL')
+        source = HttpQuoteSource(source_url) if source_url else YFinanceQuoteSource()
+        ttl = float(os.getenv('STOCK_QUOTE_TTL_SECONDS', '30'))
+        _provider = QuoteProvider(source, ttl=ttl)
+    return _provider
+
+
+def set_provider(provider: Optional[QuoteProvider]) -> None:
+    """Replaces the process-wide provider (None resets it to the env default)."""
+    global _provider
+    _provider = provider
@@ -0,0 +1,20 @@
+"""
+Entry point for `adk web` / `adk run`: `root_agent` is the stateful weather
+team (weather_agent_team_context). It is built on first access, so importing
+this package constructs nothing, reads nothing and prints nothing.
+"""
+
+_root_agent = None
+
+
+def __getattr__(name: str):
+    global _root_agent
+    if name != "root_agent":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _root_agent is None:
+        from dotenv import load_dotenv
+        from .weather_agent_team_context import create_weather_agent_team_context
+
+        load_dotenv()
+        _root_agent = create_weather_agent_team_context()
+    return _root_agent
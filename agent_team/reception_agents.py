@@ -1,10 +1,9 @@
 import os
 from typing import Optional # Make sure to import Optional
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
 
-from dotenv import load_dotenv
-load_dotenv()
+from adk_common.router import EmbeddingClassifier, IntentRouter
+from adk_common.tiering import model_for_agent
 
 
 def say_hello(name: Optional[str] = None) -> str:
@@ -29,30 +28,65 @@ def say_goodbye() -> str:
     print(f"--- Tool: say_goodbye called ---")
     return "Goodbye! Have a great day."
 
-print("Greeting and Farewell tools defined.")
-
-AGENT_MODEL = os.getenv("MODEL_NAME")
-
-greeting_agent = Agent(
-    model=LiteLlm(model=AGENT_MODEL),
-    name="greeting_agent",
-    instruction="You are the Greeting Agent. Your ONLY task is to provide a friendly greeting to the user. "
-                "Use the 'say_hello' tool to generate the greeting. "
-                "If the user provides their name, make sure to pass it to the tool. "
-                "Do not engage in any other conversation or tasks.",
-    description="Handles simple greetings and hellos using the 'say_hello' tool.", # Crucial for delegation
-    tools=[say_hello],
-)
-print(f"✅ Agent '{greeting_agent.name}' created using model '{greeting_agent.model}'.")
-
-farewell_agent = Agent(
-    model=LiteLlm(model=AGENT_MODEL),
-    name="farewell_agent",
-    instruction="You are the Farewell Agent. Your ONLY task is to provide a polite goodbye message. "
-                "Use the 'say_goodbye' tool when the user indicates they are leaving or ending the conversation "
-                "(e.g., using words like 'bye', 'goodbye', 'thanks bye', 'see you'). "
-                "Do not perform any other actions.",
-    description="Handles simple farewells and goodbyes using the 'say_goodbye' tool.", # Crucial for delegation
-    tools=[say_goodbye],
-)
-print(f"✅ Agent '{farewell_agent.name}' created using model '{farewell_agent.model}'.")
+# Each agent can get its own model: GREETING_AGENT_MODEL pins one, and
+# GREETING_AGENT_SMALL_MODEL (or SMALL_MODEL_NAME for both) tries a small model
+# first and escalates to MODEL_NAME when its tool call does not validate.
+
+# An agent can only be the sub-agent of one parent, so every team builds its own.
+def create_greeting_agent() -> Agent:
+    greeting_agent = Agent(
+        model=model_for_agent("greeting_agent", os.getenv("MODEL_NAME")),
+        name="greeting_agent",
+        instruction="You are the Greeting Agent. Your ONLY task is to provide a friendly greeting to the user. "
+                    "Use the 'say_hello' tool to generate the greeting. "
+                    "If the user provides their name, make sure to pass it to the tool. "
+                    "Do not engage in any other conversation or tasks.",
+        description="Handles simple greetings and hellos using the 'say_hello' tool.", # Crucial for delegation
+        tools=[say_hello],
+    )
+    print(f"✅ Agent '{greeting_agent.name}' created using model '{greeting_agent.model.model}'.")
+    return greeting_agent
+
+def create_farewell_agent() -> Agent:
+    farewell_agent = Agent(
+        model=model_for_agent("farewell_agent", os.getenv("MODEL_NAME")),
+        name="farewell_agent",
+        instruction="You are the Farewell Agent. Your ONLY task is to provide a polite goodbye message. "
+                    "Use the 'say_goodbye' tool when the user indicates they are leaving or ending the conversation "
+                    "(e.g., using words like 'bye', 'goodbye', 'thanks bye', 'see you'). "
+                    "Do not perform any other actions.",
+        description="Handles simple farewells and goodbyes using the 'say_goodbye' tool.", # Crucial for delegation
+        tools=[say_goodbye],
+    )
+    print(f"✅ Agent '{farewell_agent.name}' created using model '{farewell_agent.model.model}'.")
+    return farewell_agent
+
+# Messages that are nothing but a greeting or a farewell, after lowercasing and
+# dropping punctuation ("Hello there!" -> "hello there").
+RECEPTION_ROUTES = {
+    "greeting_agent": [
+        r"(hi|hello|hey|hiya|howdy|greetings|good (morning|afternoon|evening))( there| again| all| everyone)?",
+        r"(hi|hello|hey)( there)? (i'm|i am|my name is) \w+",
+    ],
+    "farewell_agent": [
+        r"((ok|okay|thanks|thank you|cheers)( so much)? )?"
+        r"(bye|bye bye|goodbye|good bye|see you|see ya|farewell|take care|good night)( now| then| later| soon| for now)?",
+    ],
+}
+
+# Examples for the optional embedding classifier (ROUTER_EMBEDDING_MODEL).
+RECEPTION_EXAMPLES = {
+    "greeting_agent": ["hello", "hi there", "good morning", "hey, how are you", "nice to meet you"],
+    "farewell_agent": ["goodbye", "thanks, bye", "see you later", "that's all for today", "talk to you later"],
+}
+
+
+def create_reception_router() -> IntentRouter:
+    """Pre-router for greetings and farewells; set ROUTER_EMBEDDING_MODEL to add the embedding classifier."""
+    embedding_model = os.getenv("ROUTER_EMBEDDING_MODEL")
+    classifier = (
+        EmbeddingClassifier.from_sentence_transformer(RECEPTION_EXAMPLES, embedding_model)
+        if embedding_model
+        else None
+    )
+    return IntentRouter(RECEPTION_ROUTES, classifier=classifier)
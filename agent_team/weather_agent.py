@@ -1,22 +1,13 @@
 import os
 import asyncio
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.genai import types
 
-import warnings
-# Ignore all warnings
-warnings.filterwarnings("ignore")
-
-import logging
-logging.basicConfig(level=logging.ERROR)
-
-from dotenv import load_dotenv
-load_dotenv()
-
-print("Libraries imported.")
+from adk_common.llm_registry import get_llm
+from adk_common.response_cache import LlmResponseCache, create_response_cache
+from adk_common.single_flight import cached_tool
 
 # --- Tool definition ---
 def get_weather(city: str) -> dict:
@@ -46,36 +37,45 @@ def get_weather(city: str) -> dict:
     else:
         return {"status": "error", "error_message": f"Sorry, I don't have weather information for '{city}'."}
 
-print(get_weather("New York"))
-print(get_weather("Paris"))
-
-# --- Agent Initialization ---
-AGENT_MODEL = os.getenv("MODEL_NAME")
-
-weather_agent = Agent(
-    name="weather_agent_v1",
-    model=LiteLlm(model=AGENT_MODEL),
-    description="Provides weather information for specific cities.",
-    instruction="You are a helpful weather assistant. "
-                "When the user asks for the weather in a specific city, "
-                "use the 'get_weather' tool to find the information. "
-                "If the tool returns an error, inform the user politely. "
-                "If the tool is successful, present the weather report clearly.",
-    tools=[get_weather],
-)
-
-print(f"Agent '{weather_agent.name}' created using model '{AGENT_MODEL}'.")
-
-# --- Session Initialization ---
-# Key Concept: SessionService stores conversation history & state.
-# InMemorySessionService is simple, non-persistent storage for this tutorial.
-session_service = InMemorySessionService()
+# The mock data is static, so identical lookups from any session are served once.
+get_weather_tool = cached_tool(get_weather, ttl=300)
 
 APP_NAME = "weather_tutorial_app"
 USER_ID = "user_1"
 SESSION_ID = "session_001"
 
-async def init_session(app_name:str,user_id:str,session_id:str) -> InMemorySessionService:
+# --- Agent Initialization ---
+def create_weather_agent(response_cache: LlmResponseCache = None) -> Agent:
+    """Builds the weather agent of the single-agent tutorial.
+
+    Args:
+        response_cache (LlmResponseCache, optional): Cache for the agent's model responses.
+            A new one is created if not provided.
+
+    Returns:
+        Agent: The weather agent using the `MODEL_NAME` model.
+    """
+    agent_model = os.getenv("MODEL_NAME")
+    # Repeated questions (from any session) are answered without calling the model.
+    response_cache = response_cache or create_response_cache()
+
+    weather_agent = Agent(
+        name="weather_agent_v1",
+        model=get_llm(agent_model),
+        description="Provides weather information for specific cities.",
+        instruction="You are a helpful weather assistant. "
+                    "When the user asks for the weather in a specific city, "
+                    "use the 'get_weather' tool to find the information. "
+                    "If the tool returns an error, inform the user politely. "
+                    "If the tool is successful, present the weather report clearly.",
+        tools=[get_weather_tool],
+        before_model_callback=response_cache.before_model_callback,
+        after_model_callback=response_cache.after_model_callback,
+    )
+    print(f"Agent '{weather_agent.name}' created using model '{agent_model}'.")
+    return weather_agent
+
+async def init_session(session_service: InMemorySessionService, app_name: str, user_id: str, session_id: str):
     session = await session_service.create_session(
         app_name=app_name,
         user_id=user_id,
@@ -84,17 +84,6 @@ async def init_session(app_name:str,user_id:str,session_id:str) -> InMemorySessi
     print(f"Session created: App='{app_name}', User='{user_id}', Session='{session_id}'")
     return session
 
-_ = asyncio.run(init_session(APP_NAME, USER_ID, SESSION_ID))
-
-# --- Runner ---
-# Key Concept: Runner orchestrates the agent execution loop.
-runner = Runner(
-    agent=weather_agent, # The agent we want to run
-    app_name=APP_NAME,   # Associates runs with our app
-    session_service=session_service # Uses our session manager
-)
-print(f"Runner created for agent '{runner.agent.name}'.")
-
 async def call_agent_async(query: str, runner, user_id, session_id):
     """Sends a query to the agent and prints the final response."""
     print(f">>> User Query: {query}")
@@ -126,6 +115,27 @@ async def call_agent_async(query: str, runner, user_id, session_id):
     print(f"<<< Agent Response: {final_response_text}")
 
 async def run_conversation():
+    print(get_weather("New York"))
+    print(get_weather("Paris"))
+
+    response_cache = create_response_cache()
+    weather_agent = create_weather_agent(response_cache)
+
+    # --- Session Initialization ---
+    # Key Concept: SessionService stores conversation history & state.
+    # InMemorySessionService is simple, non-persistent storage for this tutorial.
+    session_service = InMemorySessionService()
+    await init_session(session_service, APP_NAME, USER_ID, SESSION_ID)
+
+    # --- Runner ---
+    # Key Concept: Runner orchestrates the agent execution loop.
+    runner = Runner(
+        agent=weather_agent, # The agent we want to run
+        app_name=APP_NAME,   # Associates runs with our app
+        session_service=session_service # Uses our session manager
+    )
+    print(f"Runner created for agent '{runner.agent.name}'.")
+
     await call_agent_async("What is the weather like in London?",
                            runner=runner, user_id=USER_ID, session_id=SESSION_ID)
 
@@ -135,7 +145,22 @@ async def run_conversation():
     await call_agent_async("Tell me the weather in New York",
                            runner=runner, user_id=USER_ID, session_id=SESSION_ID)
 
+    # Same question in a new session: served from the response cache.
+    await init_session(session_service, APP_NAME, USER_ID, "session_002")
+    await call_agent_async("What is the weather like in London?",
+                           runner=runner, user_id=USER_ID, session_id="session_002")
+    print(response_cache.stats.summary())
+
 if __name__ == "__main__":
+    import logging
+    import warnings
+    from dotenv import load_dotenv
+
+    # Ignore all warnings
+    warnings.filterwarnings("ignore")
+    logging.basicConfig(level=logging.ERROR)
+    load_dotenv()
+
     try:
         asyncio.run(run_conversation())
     except Exception as e:
@@ -1,48 +1,58 @@
 import os
 import asyncio
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
-from google.genai import types
 
-import warnings
-# Ignore all warnings
-warnings.filterwarnings("ignore")
+from agent_team.weather_agent import get_weather_tool, call_agent_async
+from agent_team.reception_agents import create_greeting_agent, create_farewell_agent, create_reception_router
+from adk_common.llm_registry import get_llm
+from adk_common.response_cache import LlmResponseCache, create_response_cache
+from adk_common.router import IntentRouter
+from adk_common.tiering import tiering_summary
 
-import logging
-logging.basicConfig(level=logging.ERROR)
 
-from dotenv import load_dotenv
-load_dotenv()
+def create_weather_agent_team(reception_router: IntentRouter = None, response_cache: LlmResponseCache = None) -> Agent:
+    """Builds the weather team: a `MODEL_GPT_4` coordinator with greeting and farewell sub-agents.
 
-from weather_agent import get_weather, call_agent_async
-from reception_agents import greeting_agent, farewell_agent
+    Args:
+        reception_router (IntentRouter, optional): Pre-router for greetings and farewells.
+        response_cache (LlmResponseCache, optional): Cache for the coordinator's model responses.
 
-print("Libraries imported.")
+    Returns:
+        Agent: The root agent of the team.
+    """
+    agent_model = os.getenv("MODEL_GPT_4")
+    # Sends plain greetings/farewells straight to the sub-agents, skipping one model call.
+    reception_router = reception_router or create_reception_router()
+    # Repeated questions (from any session) are answered without calling the model.
+    response_cache = response_cache or create_response_cache()
 
-
-AGENT_MODEL = os.getenv("MODEL_GPT_4")
-
-weather_agent_team = Agent(
-    name="weather_agent_v2",
-    model=LiteLlm(model=AGENT_MODEL),
-    description="The main coordinator agent. Handles weather requests and delegates greetings/farewells to specialists.",
-    instruction="You are the main Weather Agent coordinating a team. Your primary responsibility is to provide weather information. "
-                "Use the 'get_weather' tool ONLY for specific weather requests (e.g., 'weather in London'). "
-                "You have specialized sub-agents: "
-                "1. 'greeting_agent': Handles simple greetings like 'Hi', 'Hello'. Delegate to it for these. "
-                "2. 'farewell_agent': Handles simple farewells like 'Bye', 'See you'. Delegate to it for these. "
-                "Analyze the user's query. If it's a greeting, delegate to 'greeting_agent'. If it's a farewell, delegate to 'farewell_agent'. "
-                "If it's a weather request, handle it yourself using 'get_weather'. "
-                "For anything else, respond appropriately or state you cannot handle it.",
-    tools=[get_weather],
-    sub_agents=[greeting_agent, farewell_agent]
-)
-print(f"✅ Root Agent '{weather_agent_team.name}' created using model '{AGENT_MODEL}' with sub-agents: {[sa.name for sa in weather_agent_team.sub_agents]}")
+    weather_agent_team = Agent(
+        name="weather_agent_v2",
+        model=get_llm(agent_model),
+        description="The main coordinator agent. Handles weather requests and delegates greetings/farewells to specialists.",
+        instruction="You are the main Weather Agent coordinating a team. Your primary responsibility is to provide weather information. "
+                    "Use the 'get_weather' tool ONLY for specific weather requests (e.g., 'weather in London'). "
+                    "You have specialized sub-agents: "
+                    "1. 'greeting_agent': Handles simple greetings like 'Hi', 'Hello'. Delegate to it for these. "
+                    "2. 'farewell_agent': Handles simple farewells like 'Bye', 'See you'. Delegate to it for these. "
+                    "Analyze the user's query. If it's a greeting, delegate to 'greeting_agent'. If it's a farewell, delegate to 'farewell_agent'. "
+                    "If it's a weather request, handle it yourself using 'get_weather'. "
+                    "For anything else, respond appropriately or state you cannot handle it.",
+        tools=[get_weather_tool],
+        sub_agents=[create_greeting_agent(), create_farewell_agent()],
+        before_model_callback=[reception_router.before_model_callback, response_cache.before_model_callback],
+        after_model_callback=[reception_router.after_model_callback, response_cache.after_model_callback],
+    )
+    print(f"✅ Root Agent '{weather_agent_team.name}' created using model '{agent_model}' with sub-agents: {[sa.name for sa in weather_agent_team.sub_agents]}")
+    return weather_agent_team
 
 async def run_team_conversation():
     print("\n--- Testing Agent Team Delegation ---")
+    reception_router = create_reception_router()
+    response_cache = create_response_cache()
+    weather_agent_team = create_weather_agent_team(reception_router, response_cache)
     session_service = InMemorySessionService()
     APP_NAME = "weather_tutorial_agent_team"
     USER_ID = "user_1_agent_team"
@@ -65,8 +75,20 @@ async def run_team_conversation():
                            runner=runner_agent_team, user_id=USER_ID, session_id=SESSION_ID)
     await call_agent_async(query = "Thanks, bye!",
                            runner=runner_agent_team, user_id=USER_ID, session_id=SESSION_ID)
+    print(reception_router.stats.summary())
+    print(tiering_summary(*weather_agent_team.sub_agents))
+    print(response_cache.stats.summary())
 
 if __name__ == "__main__":
+    import logging
+    import warnings
+    from dotenv import load_dotenv
+
+    # Ignore all warnings
+    warnings.filterwarnings("ignore")
+    logging.basicConfig(level=logging.ERROR)
+    load_dotenv()
+
     print("Executing using 'asyncio.run()' (for standard Python scripts)...")
     try:
         asyncio.run(run_team_conversation())
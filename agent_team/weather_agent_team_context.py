@@ -2,27 +2,18 @@ import os
 import argparse
 import asyncio
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools.tool_context import ToolContext
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
-from google.genai import types
 
-import warnings
-# Ignore all warnings
-warnings.filterwarnings("ignore")
-
-import logging
-logging.basicConfig(level=logging.ERROR)
-
-from dotenv import load_dotenv
-load_dotenv()
-
-from weather_agent import call_agent_async
-from reception_agents import greeting_agent, farewell_agent
-from guardrail_callback import block_keyword_guardrail, block_paris_tool_guardrail
-
-print("Libraries imported.")
+from agent_team.weather_agent import call_agent_async
+from agent_team.reception_agents import create_greeting_agent, create_farewell_agent, create_reception_router
+from agent_team.guardrail_callback import block_keyword_guardrail, block_paris_tool_guardrail
+from adk_common.guardrails import SpeculativeGuardrail
+from adk_common.llm_registry import get_llm
+from adk_common.response_cache import LlmResponseCache, create_response_cache
+from adk_common.router import IntentRouter
+from adk_common.tiering import tiering_summary
 
 
 def get_weather_stateful(city: str, tool_context: ToolContext) -> dict:
@@ -70,28 +61,66 @@ def get_weather_stateful(city: str, tool_context: ToolContext) -> dict:
         print(f"--- Tool: City '{city}' not found. ---")
         return {"status": "error", "error_message": error_msg}
 
-print("✅ State-aware 'get_weather_stateful' tool defined.")
-
-AGENT_MODEL = os.getenv("MODEL_NAME")
-
-weather_agent_team = Agent(
-    name="weather_agent_v4_stateful",
-    model=LiteLlm(model=AGENT_MODEL),
-    description="Main agent: Provides weather (state-aware unit), delegates greetings/farewells, saves report to state.",
-    instruction="You are the main Weather Agent. Your job is to provide weather using 'get_weather_stateful'. "
-                "The tool will format the temperature based on user preference stored in state. "
-                "Delegate simple greetings to 'greeting_agent' and farewells to 'farewell_agent'. "
-                "Handle only weather requests, greetings, and farewells.",
-    tools=[get_weather_stateful], # Use the state-aware tool
-    sub_agents=[greeting_agent, farewell_agent], # Include sub-agents
-    before_model_callback=block_keyword_guardrail, # Attach model guardrail
-    before_tool_callback=block_paris_tool_guardrail, # Attach tool guardrail
-    output_key="last_weather_report"
-)
-print(f"✅ Root Agent '{weather_agent_team.name}' created using model '{AGENT_MODEL}' with sub-agents: {[sa.name for sa in weather_agent_team.sub_agents]}")
-
-async def run_team_conversation():
+def create_weather_agent_team_context(
+    reception_router: IntentRouter = None, response_cache: LlmResponseCache = None,
+    heavy_guardrails: list = None, speculative_guardrails: bool = True,
+) -> Agent:
+    """Builds the stateful weather team with model and tool guardrails.
+
+    Args:
+        reception_router (IntentRouter, optional): Pre-router for greetings and farewells.
+        response_cache (LlmResponseCache, optional): Cache for the coordinator's model responses.
+        heavy_guardrails (list, optional): Slow model guardrails (e.g. a classifier),
+            checked after the cheap inline ones and only for calls that reach the model.
+        speculative_guardrails (bool): Run `heavy_guardrails` concurrently with the
+            model call (see adk_common.guardrails) instead of before it.
+
+    Returns:
+        Agent: The root agent of the team.
+    """
+    agent_model = os.getenv("MODEL_NAME")
+    # Sends plain greetings/farewells straight to the sub-agents, skipping one model call.
+    reception_router = reception_router or create_reception_router()
+    # Repeated questions are answered without calling the model; the temperature
+    # unit is part of the key since it changes the answer.
+    response_cache = response_cache or create_response_cache(state_keys=["user_preference_temperature_unit"])
+    model = get_llm(agent_model)
+    # Guardrail first, then pre-router, then cache
+    before_model_callback = [block_keyword_guardrail, reception_router.before_model_callback,
+                             response_cache.before_model_callback]
+    if heavy_guardrails and speculative_guardrails:
+        # Started together with the model call, which is cancelled if they block.
+        guard = SpeculativeGuardrail(heavy_guardrails)
+        model = guard.wrap(model)
+        before_model_callback.append(guard.before_model_callback)
+    elif heavy_guardrails:
+        before_model_callback += heavy_guardrails
+
+    weather_agent_team = Agent(
+        name="weather_agent_v4_stateful",
+        model=model,
+        description="Main agent: Provides weather (state-aware unit), delegates greetings/farewells, saves report to state.",
+        instruction="You are the main Weather Agent. Your job is to provide weather using 'get_weather_stateful'. "
+                    "The tool will format the temperature based on user preference stored in state. "
+                    "Delegate simple greetings to 'greeting_agent' and farewells to 'farewell_agent'. "
+                    "Handle only weather requests, greetings, and farewells.",
+        tools=[get_weather_stateful], # Use the state-aware tool
+        sub_agents=[create_greeting_agent(), create_farewell_agent()], # Include sub-agents
+        before_model_callback=before_model_callback,
+        after_model_callback=[reception_router.after_model_callback, response_cache.after_model_callback],
+        before_tool_callback=block_paris_tool_guardrail, # Attach tool guardrail
+        output_key="last_weather_report"
+    )
+    print(f"✅ Root Agent '{weather_agent_team.name}' created using model '{agent_model}' with sub-agents: {[sa.name for sa in weather_agent_team.sub_agents]}")
+    return weather_agent_team
+
+async def run_team_conversation(tracer=None):
     print("\n--- Testing Agent Team Delegation with context ---")
+    reception_router = create_reception_router()
+    response_cache = create_response_cache(state_keys=["user_preference_temperature_unit"])
+    weather_agent_team = create_weather_agent_team_context(reception_router, response_cache)
+    if tracer:
+        tracer.instrument(weather_agent_team)
     session_service_stateful = InMemorySessionService()
     print("✅ New InMemorySessionService created for state demonstration.")
 
@@ -129,6 +158,8 @@ async def run_team_conversation():
         app_name=APP_NAME,
         session_service=session_service_stateful
     )
+    if tracer:
+        runner_agent_team = tracer.wrap_runner(runner_agent_team)
     print(f"Runner created for agent '{weather_agent_team.name}'.")
     print("\n\n\n--- Testing State: Temp Unit Conversion & output_key ---")
 
@@ -177,9 +208,17 @@ async def run_team_conversation():
         # print(f"Full State Dict: {final_session.state}") # For detailed view
     else:
         print("\n❌ Error: Could not retrieve final session state.")
+    print(reception_router.stats.summary())
+    print(tiering_summary(*weather_agent_team.sub_agents))
+    print(response_cache.stats.summary())
 
-async def run_guardrail_test_conversation():
+async def run_guardrail_test_conversation(tracer=None):
     print("\n--- Testing Model Input Guardrail ---")
+    reception_router = create_reception_router()
+    response_cache = create_response_cache(state_keys=["user_preference_temperature_unit"])
+    weather_agent_team = create_weather_agent_team_context(reception_router, response_cache)
+    if tracer:
+        tracer.instrument(weather_agent_team)
 
     session_service_stateful = InMemorySessionService()
     print("✅ New InMemorySessionService created for state demonstration.")
@@ -218,6 +257,8 @@ async def run_guardrail_test_conversation():
         app_name=APP_NAME,
         session_service=session_service_stateful
     )
+    if tracer:
+        runner_root_model_guardrail = tracer.wrap_runner(runner_root_model_guardrail)
     print(f"Runner created for agent '{weather_agent_team.name}'.")
 
     # Use the runner for the agent with the callback and the existing stateful session ID
@@ -250,9 +291,15 @@ async def run_guardrail_test_conversation():
         # print(f"Full State Dict: {final_session.state}") # For detailed view
     else:
         print("\n❌ Error: Could not retrieve final session state.")
+    print(reception_router.stats.summary())
+    print(tiering_summary(*weather_agent_team.sub_agents))
+    print(response_cache.stats.summary())
 
-async def run_tool_guardrail_test():
+async def run_tool_guardrail_test(tracer=None):
     print("\n--- Testing Tool Argument Guardrail ('Paris' blocked) ---")
+    weather_agent_team = create_weather_agent_team_context()
+    if tracer:
+        tracer.instrument(weather_agent_team)
 
     session_service_stateful = InMemorySessionService()
     print("✅ New InMemorySessionService created for state demonstration.")
@@ -291,6 +338,8 @@ async def run_tool_guardrail_test():
         app_name=APP_NAME,
         session_service=session_service_stateful
     )
+    if tracer:
+        runner_root_tool_guardrail = tracer.wrap_runner(runner_root_tool_guardrail)
     print(f"Runner created for agent '{weather_agent_team.name}'.")
 
     interaction_func = lambda query: call_agent_async(query, runner_root_tool_guardrail,
@@ -308,7 +357,23 @@ async def run_tool_guardrail_test():
     print("\n--- Turn 3: Requesting weather in London (expect allowed) ---")
     await interaction_func("Tell me the weather in London.")
 
+SCENARIOS = {
+    "team": run_team_conversation,
+    "model_guardrail": run_guardrail_test_conversation,
+    "tool_guardrail": run_tool_guardrail_test,
+}
+
 if __name__ == "__main__":
+    import logging
+    import warnings
+    from dotenv import load_dotenv
+    from adk_common.trace import Trace, TraceRecorder, TraceReplayer
+
+    # Ignore all warnings
+    warnings.filterwarnings("ignore")
+    logging.basicConfig(level=logging.ERROR)
+    load_dotenv()
+
     parser = argparse.ArgumentParser(description="Run Weather Agent Team with Context Tutorial")
     parser.add_argument(
         "--test_model_guardrail", action="store_true",
@@ -318,15 +383,36 @@ if __name__ == "__main__":
         "--test_tool_guardrail", action="store_true",
         help="If set, runs the guardrail test conversation instead of the stateful conversation.",
     )
+    parser.add_argument("--record", metavar="TRACE", help="Record the model responses and events to TRACE")
+    parser.add_argument(
+        "--replay", metavar="TRACE",
+        help="Answer model calls from TRACE (no model server needed) and compare the events with it.",
+    )
     args = parser.parse_args()
 
+    if args.test_model_guardrail:
+        scenario = "model_guardrail"
+    elif args.test_tool_guardrail:
+        scenario = "tool_guardrail"
+    else:
+        scenario = "team"
+    tracer = None
+    if args.replay:
+        trace = Trace.load(args.replay)
+        scenario = trace.meta.get("scenario", scenario)
+        tracer = TraceReplayer(trace)
+    elif args.record:
+        tracer = TraceRecorder(scenario=scenario)
+
     print("Executing using 'asyncio.run()' (for standard Python scripts)...")
     try:
-        if args.test_model_guardrail:
-            asyncio.run(run_guardrail_test_conversation())
-        elif args.test_tool_guardrail:
-            asyncio.run(run_tool_guardrail_test())
-        else:
-            asyncio.run(run_team_conversation())
+        asyncio.run(SCENARIOS[scenario](tracer))
     except Exception as e:
         print(f"An error occurred: {e}")
+    if tracer:
+        print(tracer.stats.summary())
+        for problem in tracer.stats.event_mismatches:
+            print(f"  {problem}")
+    if args.record and not args.replay:
+        tracer.save(args.record)
+        print(f"Trace written to {args.record}")
@@ -0,0 +1,121 @@
+"""
+Measures the per-delegation transport overhead of a RemoteA2aAgent against a
+local uvicorn-hosted check_prime_agent: a fresh agent per delegation (new TCP
+connection + card fetch, as a reloaded RemoteA2aAgent would do) versus
+PooledRemoteA2aAgent (shared keep-alive pool + cached card).
+
+Each iteration is one real delegation: the remote agent is run through an
+InMemoryRunner, which sends `message/send` and turns the reply into events.
+The server's check_prime_agent answers with a stand-in model (no latency), so
+no Ollama is needed and the numbers are the client and transport cost.
+
+    PYTHONPATH=. uv run benchmarks/bench_a2a_client.py --iterations 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import warnings
+
+import httpx
+
+warnings.filterwarnings("ignore")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def serve(port: int):
+    import uvicorn
+
+    sys.path.append(os.path.join(ROOT, 'a2a_tutorial'))
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+    from a2a_basic.remote_a2a.check_prime_agent.agent import root_agent
+    from fake_llm import FakeLlm
+
+    root_agent.model = FakeLlm(text="7 and 13 are prime.")
+    uvicorn.run(to_a2a(root_agent, port=port), host="localhost", port=port, log_level="warning")
+
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+async def delegate_once(agent) -> float:
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    runner = InMemoryRunner(agent=agent, app_name="a2a_client_bench")
+    session = await runner.session_service.create_session(app_name="a2a_client_bench", user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text="Which of 7, 10, 13 are prime?")])
+    start = time.perf_counter()
+    texts = []
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        if event.error_message:
+            raise RuntimeError(event.error_message)
+        if event.content and not event.partial:
+            texts.extend(part.text for part in event.content.parts or [] if part.text)
+    elapsed = time.perf_counter() - start
+    if not texts:
+        raise RuntimeError("The remote agent did not answer")
+    return elapsed
+
+
+async def run(card_url: str, iterations: int):
+    from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+    from adk_common.a2a_client import PooledRemoteA2aAgent
+
+    results = {}
+    # Warm the server up (imports, first model call) outside the measurements.
+    warm = RemoteA2aAgent(name="prime_agent", agent_card=card_url)
+    await delegate_once(warm)
+    await warm.cleanup()
+
+    fresh = []
+    for _ in range(iterations):
+        agent = RemoteA2aAgent(name="prime_agent", agent_card=card_url)
+        fresh.append(await delegate_once(agent))
+        await agent.cleanup()
+    results["fresh RemoteA2aAgent"] = fresh
+
+    pooled_agent = PooledRemoteA2aAgent(name="prime_agent", agent_card=card_url)
+    results["PooledRemoteA2aAgent"] = [await delegate_once(pooled_agent) for _ in range(iterations)]
+
+    print(f"{'client':<24} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, samples in results.items():
+        samples_ms = sorted(s * 1000 for s in samples)
+        p95 = samples_ms[int(0.95 * (len(samples_ms) - 1))]
+        print(f"{label:<24} {statistics.mean(samples_ms):>9.2f} {statistics.median(samples_ms):>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Benchmark pooled A2A client vs per-agent clients")
+    argparser.add_argument('--port', type=int, default=8011)
+    argparser.add_argument('--iterations', type=int, default=200)
+    argparser.add_argument('--serve', action='store_true', help='Only run the check_prime_agent server')
+    args = argparser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        sys.exit(0)
+
+    server = subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(args.port)])
+    try:
+        card_url = f"http://localhost:{args.port}/.well-known/agent-card.json"
+        asyncio.run(wait_until_up(card_url))
+        asyncio.run(run(card_url, args.iterations))
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,195 @@
+"""
+Delegation latency to check_prime_agent through adk_common.a2a_resilience,
+against local uvicorn stand-ins of the remote agent whose fake model takes
+`--latency` to start every turn and `--slow-seconds` more for a `--slow-rate`
+share of them. The delay is in the model, as with a real slow replica: the
+A2A server still acknowledges the task at once. Scenarios, `--requests`
+delegations each:
+
+- single: a plain PooledRemoteA2aAgent on one stand-in.
+- hedged: ResilientRemoteA2aAgent over two stand-ins, hedging after the p95.
+- primary down: the first stand-in is stopped; failover, then its breaker opens.
+- all down: both stand-ins are stopped; the local fallback (in-process
+  check_prime) answers, or the breakers fail fast.
+
+    PYTHONPATH=. uv run benchmarks/bench_a2a_resilience.py --requests 200 --slow-rate 0.03 --slow-seconds 1
+
+Hedging after the p95 only helps while fewer than 5% of the calls are slow;
+for a slower tail pass a lower `--hedge-percentile`.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+
+warnings.filterwarnings("ignore")
+logging.disable(logging.CRITICAL)  # endpoints going down are logged as errors by ADK
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'a2a_tutorial'))
+
+
+def slow_model(latency: float, slow_rate: float, slow_seconds: float, seed: int):
+    """
+    A ToolCallingLlm whose first call of every turn takes `latency`, and
+    `slow_seconds` more for a `slow_rate` share of the turns.
+    """
+    from fake_llm import ToolCallingLlm
+
+    rng = random.Random(seed)
+
+    class SlowLlm(ToolCallingLlm):
+        async def generate_content_async(self, llm_request, stream: bool = False):
+            last = llm_request.contents[-1] if llm_request.contents else None
+            if not (last and any(part.function_response for part in last.parts or [])):
+                await asyncio.sleep(latency + (slow_seconds if rng.random() < slow_rate else 0.0))
+            async for response in super().generate_content_async(llm_request, stream):
+                yield response
+
+    return SlowLlm(calls=[("check_prime", {"nums": [7]})], text="7 is a prime number.")
+
+
+def serve(args):
+    import uvicorn
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+    from a2a_basic.remote_a2a.check_prime_agent.agent import root_agent
+
+    root_agent.model = slow_model(args.latency, args.slow_rate, args.slow_seconds, seed=args.port)
+    uvicorn.run(to_a2a(root_agent, port=args.port), host="localhost", port=args.port, log_level="warning")
+
+
+def start_server(port: int, args) -> subprocess.Popen:
+    return subprocess.Popen([
+        sys.executable, __file__, '--serve', '--port', str(port), '--latency', str(args.latency),
+        '--slow-rate', str(args.slow_rate), '--slow-seconds', str(args.slow_seconds),
+    ])
+
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    server.wait()
+
+
+async def wait_until_up(url: str, timeout: float = 60.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def local_prime_agent():
+    from google.adk.agents.llm_agent import LlmAgent
+    from fake_llm import ToolCallingLlm
+    from a2a_basic.remote_a2a.check_prime_agent.agent import check_prime
+
+    return LlmAgent(
+        name="prime_agent",
+        model=ToolCallingLlm(calls=[("check_prime", {"nums": [7]})], text="7 is a prime number (local)."),
+        tools=[check_prime],
+    )
+
+
+async def delegate(agent, requests: int) -> tuple[list[float], dict]:
+    """Sends `requests` delegations, one session each; latencies and final answers."""
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    runner = InMemoryRunner(agent=agent, app_name="resilience_bench")
+    latencies, answers = [], {}
+    for _ in range(requests):
+        session = await runner.session_service.create_session(app_name="resilience_bench", user_id="bench")
+        message = types.Content(role="user", parts=[types.Part(text="Is 7 a prime number?")])
+        answer = "(no answer)"
+        start = time.perf_counter()
+        async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            if event.error_message:
+                answer = "error: " + event.error_message[:40]
+            elif event.is_final_response() and event.content and event.content.parts:
+                answer = "".join(part.text or "" for part in event.content.parts)
+        latencies.append(time.perf_counter() - start)
+        answers[answer] = answers.get(answer, 0) + 1
+    return latencies, answers
+
+
+def report(label: str, latencies: list[float], answers: dict, stats=None):
+    ordered = sorted(seconds * 1000 for seconds in latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    print(f"{label:<22} {statistics.median(ordered):>8.1f} {p95:>8.1f} {p99:>8.1f} {ordered[-1]:>8.1f}  {answers}")
+    if stats is not None:
+        print(f"{'':<22} {stats.summary()}")
+
+
+async def run(cards: list[str], servers: list[subprocess.Popen], args):
+    from adk_common.a2a_client import PooledRemoteA2aAgent
+    from adk_common.a2a_resilience import ResilientRemoteA2aAgent
+
+    print(f"stand-ins: {args.latency * 1000:.0f} ms per turn, {args.slow_rate:.0%} slowed by "
+          f"{args.slow_seconds * 1000:.0f} ms")
+    print(f"{'scenario':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  answers")
+
+    single = PooledRemoteA2aAgent(name="prime_agent", agent_card=cards[0])
+    report("single", *await delegate(single, args.requests))
+
+    def resilient(fallback: bool = True):
+        return ResilientRemoteA2aAgent.of(
+            name="prime_agent", agent_cards=cards, fallback=local_prime_agent() if fallback else None,
+            min_samples=10, hedge_percentile=args.hedge_percentile,
+        )
+
+    hedged = resilient()
+    report("hedged", *await delegate(hedged, args.requests), hedged.stats)
+
+    stop_server(servers[0])
+    primary_down = resilient()
+    report("primary down", *await delegate(primary_down, args.requests), primary_down.stats)
+
+    stop_server(servers[1])
+    all_down = resilient()
+    report("all down, fallback", *await delegate(all_down, args.requests), all_down.stats)
+
+    no_fallback = resilient(fallback=False)
+    report("all down, no fallback", *await delegate(no_fallback, args.requests), no_fallback.stats)
+    print(f"breakers: {[breaker.state for breaker in no_fallback.breakers]}")
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Hedging, circuit breaking and fallback for remote A2A agents")
+    argparser.add_argument('--port', type=int, default=8031, help='First stand-in port; the second uses port + 1')
+    argparser.add_argument('--requests', type=int, default=200)
+    argparser.add_argument('--latency', type=float, default=0.02, help='Seconds the model takes per turn')
+    argparser.add_argument('--slow-rate', type=float, default=0.03, help='Share of turns slowed down')
+    argparser.add_argument('--slow-seconds', type=float, default=1.0, help='Seconds added to a slowed turn')
+    argparser.add_argument('--hedge-percentile', type=float, default=95.0)
+    argparser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+
+    if args.serve:
+        serve(args)
+        sys.exit(0)
+
+    ports = [args.port, args.port + 1]
+    servers = [start_server(port, args) for port in ports]
+    try:
+        cards = [f"http://localhost:{port}/.well-known/agent-card.json" for port in ports]
+        for card in cards:
+            asyncio.run(wait_until_up(card))
+        asyncio.run(run(cards, servers, args))
+    finally:
+        for server in servers:
+            if server.poll() is None:
+                stop_server(server)
@@ -0,0 +1,130 @@
+"""
+Load test for the multi-worker hello_world A2A server
+(a2a_root.remote_a2a.hello_world.serve): sends concurrent `message/send` calls
+and reports throughput for 1..N workers. The model is replaced by FakeLlm so
+the numbers reflect serving overhead, not Ollama.
+
+    PYTHONPATH=. uv run benchmarks/bench_a2a_workers.py --max-workers 4 --requests 400
+
+With the default SQLite store, writes serialize on the database file; pass a
+Postgres `--db-url` to see the scaling of the serving layer itself.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import warnings
+
+import httpx
+
+warnings.filterwarnings("ignore")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'a2a_tutorial'))
+
+
+def create_bench_app():
+    from fake_llm import FakeLlm
+    from a2a_root.remote_a2a.hello_world import agent, serve
+
+    agent.root_agent.model = FakeLlm(latency=float(os.getenv("FAKE_LLM_LATENCY", "0")))
+    return serve.create_app()
+
+
+def serve(port: int, workers: int, db_url: str):
+    import uvicorn
+    from adk_common.a2a_serving import prepare_stores
+
+    os.environ.update({"A2A_DB_URL": db_url, "A2A_PORT": str(port), "A2A_MAX_IN_FLIGHT": "1000"})
+    asyncio.run(prepare_stores(db_url, app_name="hello_world_agent"))
+    uvicorn.run("bench_a2a_workers:create_bench_app", factory=True, host="localhost",
+                port=port, workers=workers, log_level="warning")
+
+
+async def wait_until_up(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+async def load(url: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one(client: httpx.AsyncClient, i: int):
+        payload = {
+            "jsonrpc": "2.0", "id": i, "method": "message/send",
+            "params": {"message": {
+                "kind": "message", "role": "user", "messageId": uuid.uuid4().hex,
+                "parts": [{"kind": "text", "text": "Roll a 6-sided die"}],
+            }},
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(url, json=payload)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, statuses
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Throughput of the hello_world A2A server by worker count")
+    argparser.add_argument('--port', type=int, default=8021)
+    argparser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    argparser.add_argument('--requests', type=int, default=400)
+    argparser.add_argument('--concurrency', type=int, default=64)
+    argparser.add_argument('--fake-latency', type=float, default=0.0, help='Seconds the fake model waits per call')
+    argparser.add_argument('--db-url', type=str, required=False, help='Shared store (default: temporary SQLite file)')
+    argparser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    argparser.add_argument('--workers', type=int, default=1, help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.workers, args.db_url)
+        sys.exit(0)
+
+    worker_counts = sorted({1, *[2**i for i in range(1, 8) if 2**i < args.max_workers], args.max_workers})
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}  statuses")
+    baseline = None
+    for workers in worker_counts:
+        db_dir = tempfile.mkdtemp()
+        db_url = args.db_url or f"sqlite+aiosqlite:///{db_dir}/bench.db"
+        env = {**os.environ, "FAKE_LLM_LATENCY": str(args.fake_latency)}
+        server = subprocess.Popen(
+            [sys.executable, __file__, '--serve', '--port', str(args.port),
+             '--workers', str(workers), '--db-url', db_url],
+            env=env,
+        )
+        try:
+            asyncio.run(wait_until_up(f"http://localhost:{args.port}/.well-known/agent-card.json"))
+            elapsed, latencies, statuses = asyncio.run(
+                load(f"http://localhost:{args.port}/", args.requests, args.concurrency)
+            )
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+        throughput = args.requests / elapsed
+        baseline = baseline or throughput
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+        p95 = latencies_ms[int(0.95 * (len(latencies_ms) - 1))]
+        print(f"{workers:>7} {throughput:>9.1f} {statistics.median(latencies_ms):>9.1f} {p95:>9.1f}  "
+              f"{statuses}  ({throughput / baseline:.2f}x)")
@@ -0,0 +1,100 @@
+"""
+Ingestion throughput of qdrant_rag's chunking pipeline for large documents
+(1 MB by default): tokenize and cut into overlapping windows, encode every
+chunk in one batched call (versus one call per chunk, measured on a sample),
+upload to an in-memory local Qdrant, then search and collapse chunk hits
+back to documents. Needs sentence-transformers and qdrant-client; no Qdrant
+server.
+
+    PYTHONPATH=. uv run benchmarks/bench_chunking.py --size-mb 1
+    PYTHONPATH=. uv run benchmarks/bench_chunking.py --input some_long_document.txt
+"""
+import argparse
+import random
+import time
+import uuid
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+from sentence_transformers import SentenceTransformer
+
+from qdrant_rag.chunking import CHUNK_OVERLAP, chunk_payload, chunk_text, chunk_window, collapse_hits, embed_chunks
+
+VECTOR_NAME = "text"
+WORDS = (
+    "the river city mountain engine protein theorem harbour election violin glacier archive "
+    "orbit census lantern mineral treaty falcon circuit meadow dialect reactor canyon ledger"
+).split()
+
+
+def synthetic_document(size_bytes: int, seed: int = 0) -> str:
+    """Sentences of random words, about `size_bytes` long."""
+    rng = random.Random(seed)
+    sentences, size = [], 0
+    while size < size_bytes:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Chunking and batched embedding throughput for long documents")
+    argparser.add_argument('--size-mb', type=float, default=1.0, help='Size of the synthetic document')
+    argparser.add_argument('--input', help='Text file to use instead of a synthetic document')
+    argparser.add_argument('--overlap', type=int, default=CHUNK_OVERLAP, help='Tokens shared by consecutive chunks')
+    argparser.add_argument('--batch-size', type=int, default=64)
+    argparser.add_argument('--sample', type=int, default=64, help='Chunks encoded one call each, for comparison')
+    args = argparser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            document = f.read()
+    else:
+        document = synthetic_document(int(args.size_mb * 1024 * 1024))
+    megabytes = len(document.encode()) / 1024 / 1024
+
+    model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    model.encode(["warm-up"])
+
+    window = chunk_window(model)
+    chunks, chunk_seconds = timed(chunk_text, document, model.tokenizer, max_tokens=window, overlap=args.overlap)
+    embeddings, embed_seconds = timed(embed_chunks, model, chunks, batch_size=args.batch_size)
+    sample = chunks[:args.sample]
+    _, single_seconds = timed(lambda: [model.encode(chunk.text) for chunk in sample])
+
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name="chunks", vectors_config={VECTOR_NAME: VectorParams(size=len(embeddings[0]), distance=Distance.COSINE)},
+    )
+    doc_id = str(uuid.uuid4())
+    points = [
+        PointStruct(id=str(uuid.uuid4()), vector={VECTOR_NAME: embedding.tolist()},
+                    payload=chunk_payload(chunk, doc_id, len(chunks)))
+        for chunk, embedding in zip(chunks, embeddings)
+    ]
+    _, upload_seconds = timed(client.upload_points, collection_name="chunks", points=points, batch_size=256, wait=True)
+
+    def search(query: str):
+        hits = client.query_points("chunks", query=model.encode([query])[0], using=VECTOR_NAME, limit=20)
+        return hits, collapse_hits(hits.points, limit=5)
+
+    (hits, documents), search_seconds = timed(search, " ".join(chunks[len(chunks) // 2].text.split()[:12]))
+
+    total = chunk_seconds + embed_seconds + upload_seconds
+    print(f"document: {megabytes:.2f} MB, {len(chunks)} chunks of <= {window} tokens, overlap {args.overlap}")
+    print(f"  without chunking only the first {window} tokens (~{1 / len(chunks):.2%} of it) would be indexed")
+    print(f"{'stage':<26} {'seconds':>8} {'chunks/s':>10} {'MB/s':>8}")
+    for stage, seconds in (("tokenize + chunk", chunk_seconds), ("encode (one batched call)", embed_seconds),
+                           ("upload", upload_seconds), ("total", total)):
+        print(f"{stage:<26} {seconds:>8.2f} {len(chunks) / seconds:>10.1f} {megabytes / seconds:>8.3f}")
+    print(f"{'encode (one call/chunk)':<26} {single_seconds * len(chunks) / len(sample):>8.2f} "
+          f"{len(sample) / single_seconds:>10.1f} {'':>8}  (extrapolated from {len(sample)} chunks)")
+    print(f"search + collapse: {search_seconds * 1000:.1f} ms, {len(hits.points)} chunk hits -> "
+          f"{len(documents)} document(s)")
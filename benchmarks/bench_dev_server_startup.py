@@ -0,0 +1,82 @@
+"""
+Startup of the dev server with ADK's stock agent discovery (`adk web`)
+versus manifest-driven discovery (`python -m adk_common.dev_server`): time
+from launch until `/list-apps` answers, latency of the detailed listing the
+web UI can ask for (which makes the stock loader import every agent), and
+the server's resident memory after listing.
+
+    PYTHONPATH=. uv run benchmarks/bench_dev_server_startup.py
+    PYTHONPATH=. uv run benchmarks/bench_dev_server_startup.py --agents-dir a2a_tutorial
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rss_mb(pid: int) -> float:
+    """Resident memory of `pid` and its children, from /proc (Linux only)."""
+    total_kb = 0
+    pids = [pid]
+    try:
+        children = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True).stdout.split()
+        pids += [int(child) for child in children]
+        for p in pids:
+            with open(f"/proc/{p}/status") as f:
+                total_kb += next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    except (OSError, StopIteration, ValueError):
+        return float("nan")
+    return total_kb / 1024
+
+
+def measure(label: str, command: list[str], port: int, timeout: float) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        with httpx.Client(timeout=timeout) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"{label} exited with code {process.returncode}")
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError(f"{label} did not start within {timeout:.0f}s")
+                try:
+                    apps = client.get(f"{url}/list-apps").json()
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.05)
+            ready = time.perf_counter() - start
+
+            detailed_start = time.perf_counter()
+            response = client.get(f"{url}/list-apps", params={"detailed": "true"})
+            detailed = time.perf_counter() - detailed_start
+            listed = [app["name"] for app in response.json().get("apps", [])] if response.is_success else []
+            memory = rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+    return {"label": label, "ready": ready, "detailed": detailed, "rss": memory, "apps": apps, "listed": listed}
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Dev server startup: stock vs manifest-driven discovery")
+    argparser.add_argument('--agents-dir', default='.', help='Directory of agent packages, relative to the repo root')
+    argparser.add_argument('--port', type=int, default=8765)
+    argparser.add_argument('--timeout', type=float, default=180.0)
+    args = argparser.parse_args()
+
+    runs = [
+        ("adk web", ["adk", "web", "--port", str(args.port), args.agents_dir]),
+        ("manifest", [sys.executable, "-m", "adk_common.dev_server", args.agents_dir, "--port", str(args.port)]),
+    ]
+    print(f"{'server':<10} {'ready s':>8} {'detailed list s':>16} {'RSS MB':>8}  apps")
+    for label, command in runs:
+        r = measure(label, command, args.port, args.timeout)
+        print(f"{r['label']:<10} {r['ready']:>8.2f} {r['detailed']:>16.2f} {r['rss']:>8.0f}  "
+              f"{r['apps']} (detailed: {r['listed']})")
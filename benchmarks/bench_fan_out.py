@@ -0,0 +1,126 @@
+"""
+Wall-clock of one root-agent turn that needs two remote A2A agents, with the
+calls made one after another (max_concurrency=1) versus fanned out
+(adk_common.fan_out). Both remote agents run in a local uvicorn process with
+a FakeLlm that waits `--remote-latency` seconds, and the root model is a
+scripted stand-in that asks for both agents in one response, so no Ollama is
+needed.
+
+    PYTHONPATH=. uv run benchmarks/bench_fan_out.py --iterations 20 --remote-latency 0.5
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+
+import httpx
+
+warnings.filterwarnings("ignore")
+
+REMOTES = {
+    "roll_agent": "I rolled a 4 for you.",
+    "prime_agent": "7 is a prime number.",
+}
+
+
+def serve(port: int, latency: float):
+    import uvicorn
+    from google.adk.agents.llm_agent import Agent
+    from fake_llm import FakeLlm
+    from adk_common.a2a_serving import build_a2a_app
+
+    async def main():
+        servers = []
+        for offset, (name, text) in enumerate(REMOTES.items()):
+            agent = Agent(name=name, description=f"Remote {name}", model=FakeLlm(text=text, latency=latency))
+            app = build_a2a_app(agent, port=port + offset)
+            config = uvicorn.Config(app, host="localhost", port=port + offset, log_level="warning")
+            servers.append(uvicorn.Server(config))
+        await asyncio.gather(*(server.serve() for server in servers))
+
+    asyncio.run(main())
+
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+async def run(port: int, iterations: int):
+    from google.adk.agents.llm_agent import Agent
+    from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+    from fake_llm import ToolCallingLlm
+    from adk_common.a2a_client import PooledRemoteA2aAgent
+    from adk_common.fan_out import fan_out_tools
+
+    print(f"{'mode':<12} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    baseline = None
+    for label, max_concurrency in (("sequential", 1), ("fan-out", len(REMOTES))):
+        remotes = [
+            PooledRemoteA2aAgent(
+                name=name,
+                description=f"Remote {name}",
+                agent_card=f"http://localhost:{port + offset}{AGENT_CARD_WELL_KNOWN_PATH}",
+            )
+            for offset, name in enumerate(REMOTES)
+        ]
+        root_agent = Agent(
+            name="root_agent",
+            model=ToolCallingLlm(calls=[(name, {"request": "go"}) for name in REMOTES]),
+            tools=fan_out_tools(*remotes, max_concurrency=max_concurrency),
+        )
+        runner = InMemoryRunner(agent=root_agent, app_name="bench")
+        message = types.Content(role="user", parts=[types.Part(text="Roll a die and check if 7 is prime.")])
+
+        samples = []
+        for i in range(iterations + 1):
+            session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+            start = time.perf_counter()
+            responses = []
+            async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+                responses += [p.function_response.response for p in event.content.parts if p.function_response]
+            if i:  # the first turn warms up connections and agent cards
+                samples.append(time.perf_counter() - start)
+        assert len(responses) == len(REMOTES), responses
+
+        samples_ms = sorted(s * 1000 for s in samples)
+        p95 = samples_ms[int(0.95 * (len(samples_ms) - 1))]
+        mean = statistics.mean(samples_ms)
+        baseline = baseline or mean
+        print(f"{label:<12} {mean:>9.1f} {statistics.median(samples_ms):>8.1f} {p95:>8.1f}  ({baseline / mean:.2f}x)")
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Benchmark sequential vs fanned-out remote agent calls")
+    argparser.add_argument('--port', type=int, default=8031)
+    argparser.add_argument('--iterations', type=int, default=20)
+    argparser.add_argument('--remote-latency', type=float, default=0.5, help='Seconds each remote model takes')
+    argparser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.remote_latency)
+        sys.exit(0)
+
+    server = subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(args.port),
+                               '--remote-latency', str(args.remote_latency)])
+    try:
+        for offset in range(len(REMOTES)):
+            asyncio.run(wait_until_up(f"http://localhost:{args.port + offset}/.well-known/agent-card.json"))
+        asyncio.run(run(args.port, args.iterations))
+    finally:
+        server.terminate()
+        server.wait()
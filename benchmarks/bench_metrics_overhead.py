@@ -0,0 +1,189 @@
+"""
+Overhead of adk_common.metrics, and what /metrics reports.
+
+1. In process: `--turns` turns of an agent with a tool (fake model, no
+   latency) through an InMemoryRunner, with and without MetricsPlugin; the
+   difference per turn is the plugin's cost.
+2. Over HTTP: check_prime_agent served by build_a2a_app (fake model calling
+   check_prime, then answering) with metrics on and off, `--requests`
+   `message/send` calls at `--concurrency`; then a scrape of /metrics.
+
+    PYTHONPATH=. uv run benchmarks/bench_metrics_overhead.py --turns 2000 --requests 400
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import warnings
+
+warnings.filterwarnings("ignore")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'a2a_tutorial'))
+NUMS = [7, 10, 13]
+
+
+def prime_agent():
+    from google.adk.agents.llm_agent import LlmAgent
+    from fake_llm import ToolCallingLlm
+    from a2a_basic.remote_a2a.check_prime_agent.agent import check_prime
+
+    return LlmAgent(
+        name="check_prime_agent",
+        model=ToolCallingLlm(calls=[("check_prime", {"nums": NUMS})], text="7 and 13 are prime."),
+        tools=[check_prime],
+    )
+
+
+async def in_process(turns: int, plugins: list) -> float:
+    """Seconds per turn."""
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    runner = InMemoryRunner(agent=prime_agent(), app_name="metrics_bench", plugins=plugins)
+    session = await runner.session_service.create_session(app_name="metrics_bench", user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text="Which of 7, 10, 13 are prime?")])
+
+    async def turn():
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+
+    await turn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(turns):
+        # A fresh session each turn, so the history does not grow.
+        session = await runner.session_service.create_session(app_name="metrics_bench", user_id="bench")
+        await turn()
+    return (time.perf_counter() - start) / turns
+
+
+def serve(port: int, metrics: bool):
+    import uvicorn
+    from adk_common.a2a_serving import build_a2a_app
+
+    app = build_a2a_app(prime_agent(), port=port, streaming=False, max_in_flight=1000, metrics=metrics)
+    uvicorn.run(app, host="localhost", port=port, log_level="warning")
+
+
+async def wait_until_up(url: str, timeout: float = 60.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def message() -> dict:
+    return {
+        "jsonrpc": "2.0", "id": uuid.uuid4().hex, "method": "message/send",
+        "params": {"message": {"kind": "message", "role": "user", "messageId": uuid.uuid4().hex,
+                               "parts": [{"kind": "text", "text": "Which of 7, 10, 13 are prime?"}]}},
+    }
+
+
+async def load(url: str, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(client):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(url, json=message())
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    async with httpx.AsyncClient(timeout=120, limits=httpx.Limits(max_connections=concurrency)) as client:
+        await one(client)
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(requests)))
+        return time.perf_counter() - start, latencies
+
+
+async def scrape(url: str) -> str:
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+
+
+def over_http(args):
+    print(f"\nA2A server, {args.requests} message/send at concurrency {args.concurrency}, "
+          f"{args.rounds} alternating rounds (median)")
+    print(f"{'metrics':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    exposition = ""
+    results = {False: [], True: []}  # metrics -> [(req/s, p50, p95)]
+    for _ in range(args.rounds):
+        for metrics in (False, True):
+            server = subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(args.port)]
+                                      + ([] if metrics else ['--no-metrics']))
+            try:
+                base = f"http://localhost:{args.port}/"
+                asyncio.run(wait_until_up(f"{base}.well-known/agent-card.json"))
+                elapsed, latencies = asyncio.run(load(base, args.requests, args.concurrency))
+                if metrics:
+                    exposition = asyncio.run(scrape(f"{base}metrics"))
+            finally:
+                server.terminate()
+                server.wait()
+            ordered = sorted(seconds * 1000 for seconds in latencies)
+            results[metrics].append(
+                (args.requests / elapsed, statistics.median(ordered), ordered[int(0.95 * (len(ordered) - 1))])
+            )
+    for metrics, rounds in results.items():
+        throughput, p50, p95 = (statistics.median(values) for values in zip(*rounds))
+        print(f"{'on' if metrics else 'off':<8} {throughput:>8.1f} {p50:>8.1f} {p95:>8.1f}")
+
+    shown = ("http_requests_total", "http_requests_in_flight", "adk_invocations_total", "adk_invocations_in_flight",
+             "adk_agent_duration_seconds_count", "adk_tool_duration_seconds_count", "adk_model_duration_seconds_sum",
+             "adk_model_duration_seconds_count", "adk_cached_tool_calls_total", "adk_cache_hit_ratio",
+             "event_loop_lag_seconds_count", "event_loop_lag_last_seconds")
+    print(f"\n/metrics: {len(exposition.splitlines())} lines, {len(exposition)} bytes; some of them:")
+    for line in exposition.splitlines():
+        if line.startswith(shown):
+            print("  " + line)
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Overhead of the metrics plugin and middleware")
+    argparser.add_argument('--turns', type=int, default=2000)
+    argparser.add_argument('--requests', type=int, default=400)
+    argparser.add_argument('--concurrency', type=int, default=16)
+    argparser.add_argument('--rounds', type=int, default=3, help='Alternating off/on server runs')
+    argparser.add_argument('--port', type=int, default=8051)
+    argparser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    argparser.add_argument('--no-metrics', action='store_true', help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+
+    if args.serve:
+        serve(args.port, metrics=not args.no_metrics)
+        sys.exit(0)
+
+    from adk_common.metrics import MetricsPlugin, REGISTRY
+
+    print(f"in process, {args.turns} turns (model call, tool call, model call)")
+    without = asyncio.run(in_process(args.turns, []))
+    with_plugin = asyncio.run(in_process(args.turns, [MetricsPlugin()]))
+    print(f"  without plugin {without * 1e6:8.0f} us/turn")
+    print(f"  with plugin    {with_plugin * 1e6:8.0f} us/turn  ({(with_plugin - without) * 1e6:+.0f} us, "
+          f"{(with_plugin - without) / without:+.1%})")
+    start = time.perf_counter()
+    body = REGISTRY.render()
+    print(f"  rendering /metrics: {(time.perf_counter() - start) * 1000:.2f} ms for {len(body)} bytes")
+
+    over_http(args)
@@ -0,0 +1,123 @@
+"""
+Reports prefill (prompt evaluation) vs decode time for every Ollama call of a
+multi-turn conversation, from the timings Ollama returns with each response.
+
+With adk_common.ollama.OllamaLlm the static prefix (system prompt and tool
+schemas) stays byte-identical and the model stays loaded, so after the first
+call each call only evaluates the tokens that are new since the previous one.
+`--keep-alive 0` unloads the model after every call, which shows the cost of
+paying the full prefill (and load) each time.
+
+    PYTHONPATH=. uv run benchmarks/bench_ollama_prefill.py
+    PYTHONPATH=. uv run benchmarks/bench_ollama_prefill.py --keep-alive 0
+    PYTHONPATH=. uv run benchmarks/bench_ollama_prefill.py --agent a2a_root.agent:root_agent "Roll a die"
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import sys
+import warnings
+
+warnings.filterwarnings("ignore")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_QUERIES = [
+    "What time is it?",
+    "Thanks. Can you tell me the time again?",
+    "Which tools can you use?",
+    "What time is it now?",
+]
+
+
+def load_agent(spec: str):
+    """Imports `module:attr`; a2a_tutorial packages are importable as in `adk web`."""
+    module, _, attr = spec.partition(":")
+    sys.path.append(os.path.join(ROOT, 'a2a_tutorial'))
+    return getattr(importlib.import_module(module), attr or "root_agent")
+
+
+def set_keep_alive(agent, keep_alive: str):
+    from adk_common.ollama import OllamaLlm
+
+    if isinstance(getattr(agent, "model", None), OllamaLlm):
+        agent.model._additional_args["keep_alive"] = keep_alive
+    for sub_agent in agent.sub_agents:
+        set_keep_alive(sub_agent, keep_alive)
+
+
+def timing_logger(calls: list):
+    from litellm.integrations.custom_logger import CustomLogger
+    from adk_common.ollama import parse_ollama_timing
+
+    class OllamaTimingLogger(CustomLogger):
+        async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+            timing = parse_ollama_timing(kwargs.get("original_response"))
+            messages = kwargs.get("messages") or []
+            system = [m for m in messages if m.get("role") == "system"]
+            tools = (kwargs.get("optional_params") or {}).get("tools")
+            prefix = hashlib.sha256(json.dumps([system, tools], sort_keys=True, default=str).encode()).hexdigest()
+            calls.append((timing, prefix[:8], (end_time - start_time).total_seconds()))
+
+    return OllamaTimingLogger()
+
+
+async def run(agent, queries: list[str]):
+    import litellm
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    calls = []
+    litellm.callbacks.append(timing_logger(calls))
+
+    runner = InMemoryRunner(agent=agent, app_name="prefill_bench")
+    session = await runner.session_service.create_session(app_name="prefill_bench", user_id="bench")
+
+    print(f"{'turn':>4} {'prefix':>8} {'prompt tok':>10} {'prefill ms':>10} {'out tok':>7} "
+          f"{'decode ms':>9} {'load ms':>8} {'wall ms':>8}")
+    seen_prefixes = set()
+    totals = {"prefill": 0.0, "decode": 0.0, "load": 0.0}
+    for turn, query in enumerate(queries, 1):
+        first = len(calls)
+        model_calls = 0
+        message = types.Content(role="user", parts=[types.Part(text=query)])
+        async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            model_calls += event.usage_metadata is not None
+        # litellm reports success in the background; wait for this turn's calls.
+        for _ in range(100):
+            if len(calls) >= first + model_calls:
+                break
+            await asyncio.sleep(0.05)
+        for timing, prefix, wall in calls[first:]:
+            marker = prefix if prefix not in seen_prefixes else "  same"
+            seen_prefixes.add(prefix)
+            if timing is None:
+                print(f"{turn:>4} {marker:>8} {'(not an Ollama response)':>40} {wall * 1000:>8.0f}")
+                continue
+            totals["prefill"] += timing.prefill_seconds
+            totals["decode"] += timing.decode_seconds
+            totals["load"] += timing.load_seconds
+            print(f"{turn:>4} {marker:>8} {timing.prompt_tokens:>10} {timing.prefill_seconds * 1000:>10.0f} "
+                  f"{timing.output_tokens:>7} {timing.decode_seconds * 1000:>9.0f} "
+                  f"{timing.load_seconds * 1000:>8.0f} {wall * 1000:>8.0f}")
+    print(f"total: prefill {totals['prefill']:.2f}s, decode {totals['decode']:.2f}s, load {totals['load']:.2f}s "
+          f"over {len(calls)} model calls, {len(seen_prefixes)} distinct prefixes (one per agent is ideal)")
+
+    from adk_common.llm_registry import llm_backend_summary
+    print(llm_backend_summary())
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Prefill vs decode time per Ollama call")
+    argparser.add_argument('queries', nargs='*', default=DEFAULT_QUERIES, help='User messages, one per turn')
+    argparser.add_argument('--agent', default='agent_ollama.agent:root_agent', help='module:attribute')
+    argparser.add_argument('--keep-alive', help='Override keep_alive of the OllamaLlm models (e.g. 0)')
+    args = argparser.parse_args()
+
+    agent = load_agent(args.agent)
+    if args.keep_alive is not None:
+        set_keep_alive(agent, args.keep_alive)
+    asyncio.run(run(agent, args.queries))
@@ -0,0 +1,135 @@
+"""
+Memory per worker with and without preload-then-fork (adk_common.prefork).
+
+- per-worker load: the parent forks bare workers, each imports the model's
+  module and loads its own copy of the weights, as `uvicorn --workers` does.
+- preload: the parent loads the model once, then forks the workers, which
+  share its pages copy-on-write.
+
+Every worker then runs the model on a few inputs and the parent prints RSS /
+PSS / shared / private memory of each process. The sum of PSS is what the
+workers cost; private is what one more worker would add.
+
+    PYTHONPATH=. uv run benchmarks/bench_prefork_memory.py --workers 4
+    PYTHONPATH=. uv run benchmarks/bench_prefork_memory.py --workers 4 --synthetic-mb 90
+
+By default the model is qdrant_rag's SentenceTransformer (`--loader
+qdrant_rag.agent:get_embedding_model`); `--synthetic-mb` uses a NumPy array of
+that size as weights instead, for machines without sentence-transformers.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from functools import lru_cache
+
+from adk_common.prefork import fork_worker, freeze_heap, memory_report, memory_usage
+
+SENTENCES = [
+    "Qdrant stores one vector per chunk of every document.",
+    "Workers forked after preloading share the embedding weights.",
+    "Copy-on-write keeps read-only pages shared between processes.",
+] * 8
+MB = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def synthetic_model():
+    """Stand-in weights: `BENCH_SYNTHETIC_MB` of float32, as a 384-column matrix."""
+    import numpy as np
+
+    rows = int(float(os.environ["BENCH_SYNTHETIC_MB"]) * MB) // (384 * 4)
+    return np.random.default_rng(0).standard_normal((rows, 384), dtype=np.float32)
+
+
+def resolve(spec: str):
+    import importlib
+
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def exercise(model) -> None:
+    """One inference pass: reads every weight, writes none."""
+    if hasattr(model, "encode"):
+        model.encode(SENTENCES, batch_size=8)
+    else:
+        query = model[:len(SENTENCES)]
+        (model @ query.T).max(axis=0)
+
+
+def run_mode(mode: str, args) -> dict:
+    """Forks the workers of one mode and reports their memory once all ran the model."""
+    loader = synthetic_model if args.synthetic_mb else lambda: resolve(args.loader)()
+    load_seconds = 0.0
+    if mode == "preload":
+        start = time.perf_counter()
+        loader()
+        load_seconds = time.perf_counter() - start
+        freeze_heap()
+
+    ready_r, ready_w = os.pipe()
+    go_r, go_w = os.pipe()
+
+    def work(worker_id: int) -> int:
+        exercise(loader())
+        os.write(ready_w, b"x")
+        os.read(go_r, 1)  # stay alive until the parent has measured
+        return 0
+
+    start = time.perf_counter()
+    pids = {f"worker {worker_id}": fork_worker(work, worker_id) for worker_id in range(args.workers)}
+    for _ in pids:
+        os.read(ready_r, 1)
+    ready_seconds = time.perf_counter() - start
+
+    print(f"== {mode}: {args.workers} workers, model loaded in the parent in {load_seconds:.2f}s, "
+          f"workers ready after {ready_seconds:.2f}s")
+    print(memory_report({"parent": os.getpid(), **pids}))
+    usage = {label: memory_usage(pid) for label, pid in pids.items()}
+    parent = memory_usage(os.getpid())
+
+    os.write(go_w, b"x" * len(pids))
+    for pid in pids.values():
+        os.waitpid(pid, 0)
+    return {
+        "mode": mode,
+        "ready_seconds": ready_seconds,
+        "total_pss": parent.get("pss", 0) + sum(u.get("pss", 0) for u in usage.values()),
+        "worker_private": sum(u.get("private", 0) for u in usage.values()) / len(usage),
+        "worker_rss": sum(u.get("rss", 0) for u in usage.values()) / len(usage),
+    }
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Worker memory with and without preload-then-fork")
+    argparser.add_argument('--workers', type=int, default=4)
+    argparser.add_argument('--loader', default="qdrant_rag.agent:get_embedding_model",
+                           help='module:attr returning the (cached) model')
+    argparser.add_argument('--synthetic-mb', type=float, default=0.0, help='Use NumPy weights of this size instead')
+    argparser.add_argument('--mode', choices=["per-worker load", "preload"], help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+
+    if args.mode:
+        if args.synthetic_mb:
+            os.environ["BENCH_SYNTHETIC_MB"] = str(args.synthetic_mb)
+        print(json.dumps(run_mode(args.mode, args)))
+        sys.exit(0)
+
+    # Each mode runs in a fresh interpreter so the other's model is not in memory.
+    results = []
+    for mode in ("per-worker load", "preload"):
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--workers', str(args.workers),
+             '--loader', args.loader, '--synthetic-mb', str(args.synthetic_mb)],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()
+        print("\n".join(output[:-1]) + "\n")
+        results.append(json.loads(output[-1]))
+
+    print(f"{'mode':<16} {'total PSS MB':>13} {'worker RSS MB':>14} {'worker private MB':>18} {'ready s':>8}")
+    for result in results:
+        print(f"{result['mode']:<16} {result['total_pss'] / MB:>13.1f} {result['worker_rss'] / MB:>14.1f} "
+              f"{result['worker_private'] / MB:>18.1f} {result['ready_seconds']:>8.2f}")
@@ -0,0 +1,62 @@
+"""
+Compares adk_common.primality.find_primes with the trial-division loop that
+check_prime used before, on lists of random numbers.
+
+    PYTHONPATH=. uv run benchmarks/bench_primality.py --count 100000
+"""
+import argparse
+import random
+import time
+
+from adk_common.primality import find_primes
+
+
+def trial_division_primes(nums):
+    """The original check_prime loop (set semantics kept)."""
+    primes = set()
+    for number in nums:
+        number = int(number)
+        if number <= 1:
+            continue
+        is_prime = True
+        for i in range(2, int(number**0.5) + 1):
+            if number % i == 0:
+                is_prime = False
+                break
+        if is_prime:
+            primes.add(number)
+    return primes
+
+
+def timed(func, nums):
+    start = time.perf_counter()
+    result = func(nums)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Benchmark batch primality checks")
+    argparser.add_argument('--count', type=int, default=100_000, help='Numbers per list')
+    argparser.add_argument('--seed', type=int, default=0)
+    argparser.add_argument('--baseline-max', type=int, default=10**9,
+                           help='Skip the trial-division baseline for ranges above this bound')
+    args = argparser.parse_args()
+
+    rng = random.Random(args.seed)
+    ranges = {
+        "dice (1..20)": 20,
+        "small (< 1e6)": 10**6,
+        "medium (< 1e9)": 10**9,
+        "64-bit": 2**64 - 1,
+    }
+
+    print(f"{'range':<16} {'baseline s':>12} {'engine s':>10} {'speedup':>9} {'primes':>8}")
+    for label, upper in ranges.items():
+        nums = [rng.randint(1, upper) for _ in range(args.count)]
+        engine_s, primes = timed(find_primes, nums)
+        if upper <= args.baseline_max:
+            baseline_s, baseline = timed(trial_division_primes, nums)
+            assert baseline == set(primes), label
+            print(f"{label:<16} {baseline_s:>12.3f} {engine_s:>10.3f} {baseline_s / engine_s:>8.1f}x {len(primes):>8}")
+        else:
+            print(f"{label:<16} {'skipped':>12} {engine_s:>10.3f} {'-':>9} {len(primes):>8}")
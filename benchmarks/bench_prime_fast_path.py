@@ -0,0 +1,127 @@
+"""
+Throughput of check_prime_agent over A2A for structured requests (a data
+part {"nums": [...]}, answered by check_prime without a model call) versus
+free-text requests (model turn to extract the numbers, check_prime, model turn
+to answer). The model is a fake waiting `--model-latency` per call, so the
+text path stands for the cheapest possible model; with qwen2.5:7b on Ollama
+each of its two calls takes seconds.
+
+    PYTHONPATH=. uv run benchmarks/bench_prime_fast_path.py --requests 200 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUMS = [7, 10, 13, 1_000_003]
+
+
+def serve(port: int, model_latency: float):
+    import warnings
+    import uvicorn
+
+    warnings.filterwarnings("ignore")
+    sys.path.append(os.path.join(ROOT, 'a2a_tutorial'))
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+    from fake_llm import ToolCallingLlm
+    from a2a_basic.remote_a2a.check_prime_agent.agent import root_agent
+
+    root_agent.model = ToolCallingLlm(
+        calls=[("check_prime", {"nums": NUMS})], text="The prime numbers are 7, 13 and 1000003.", latency=model_latency,
+    )
+    uvicorn.run(to_a2a(root_agent, port=port), host="localhost", port=port, log_level="warning")
+
+
+async def wait_until_up(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def message(structured: bool) -> dict:
+    part = (
+        {"kind": "data", "data": {"nums": NUMS}} if structured
+        else {"kind": "text", "text": f"Which of {', '.join(map(str, NUMS))} are prime?"}
+    )
+    return {
+        "jsonrpc": "2.0", "id": uuid.uuid4().hex, "method": "message/send",
+        "params": {"message": {"kind": "message", "role": "user", "messageId": uuid.uuid4().hex, "parts": [part]}},
+    }
+
+
+def answer(response: httpx.Response) -> str:
+    result = response.json().get("result", {})
+    texts = [
+        part.get("text", "") for artifact in result.get("artifacts", []) for part in artifact.get("parts", [])
+    ]
+    return " ".join(texts) or str(response.json().get("error"))
+
+
+async def load(url: str, structured: bool, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, answers = [], {}
+
+    async def one(client: httpx.AsyncClient):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(url, json=message(structured))
+            latencies.append(time.perf_counter() - start)
+            text = answer(response)
+            answers[text] = answers.get(text, 0) + 1
+
+    async with httpx.AsyncClient(timeout=120, limits=httpx.Limits(max_connections=concurrency)) as client:
+        await one(client)  # warm-up
+        latencies.clear(), answers.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, answers
+
+
+async def main(args):
+    url = f"http://localhost:{args.port}/"
+    await wait_until_up(f"{url}.well-known/agent-card.json")
+    print(f"fake model {args.model_latency * 1000:.0f} ms/call, {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'path':<11} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}  answers")
+    for label, structured in (("text", False), ("structured", True)):
+        elapsed, latencies, answers = await load(url, structured, args.requests, args.concurrency)
+        ordered = sorted(seconds * 1000 for seconds in latencies)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        print(f"{label:<11} {args.requests / elapsed:>8.1f} {statistics.median(ordered):>8.1f} {p95:>8.1f}  {answers}")
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="check_prime_agent: structured fast path vs model path")
+    argparser.add_argument('--port', type=int, default=8041)
+    argparser.add_argument('--requests', type=int, default=200)
+    argparser.add_argument('--concurrency', type=int, default=16)
+    argparser.add_argument('--model-latency', type=float, default=0.1, help='Seconds the fake model waits per call')
+    argparser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.model_latency)
+        sys.exit(0)
+
+    server = subprocess.Popen([
+        sys.executable, __file__, '--serve', '--port', str(args.port), '--model-latency', str(args.model_latency),
+    ])
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,89 @@
+"""
+Per-turn framework overhead of the weather_agent_team_context scenarios,
+replayed from recorded traces (adk_common.trace): model calls are answered
+from the trace, everything else (callbacks, router, cache, tools, state,
+transfers) runs for real, so the timings are deterministic and need no model
+server. Fails when a replay diverges from its trace or, with `--baseline`,
+when a scenario's median turn time regresses by more than `--max-regression`.
+
+    PYTHONPATH=. uv run benchmarks/bench_replay.py --save-baseline /tmp/replay_baseline.json
+    PYTHONPATH=. uv run benchmarks/bench_replay.py --baseline /tmp/replay_baseline.json --max-regression 0.25
+
+Record new traces with the tutorial itself, e.g.
+`uv run agent_team/weather_agent_team_context.py --test_tool_guardrail --record benchmarks/traces/tool_guardrail.trace.gz`.
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import io
+import json
+import os
+import statistics
+import sys
+import warnings
+
+warnings.filterwarnings("ignore")
+
+TRACES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces")
+
+
+async def replay_once(path: str):
+    from adk_common.trace import Trace, TraceReplayer
+    from agent_team.weather_agent_team_context import SCENARIOS
+
+    trace = Trace.load(path)
+    replayer = TraceReplayer(trace)
+    with contextlib.redirect_stdout(io.StringIO()):
+        await SCENARIOS[trace.meta["scenario"]](replayer)
+    return replayer
+
+
+async def main(args) -> int:
+    # The agents are built as usual before their models are swapped for the trace.
+    os.environ.setdefault("MODEL_NAME", "ollama_chat/qwen2.5:7b")
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results, failures = {}, 0
+    print(f"{'trace':<20} {'turns':>5} {'median ms/turn':>15} {'p95 ms/turn':>12} {'baseline':>9}  result")
+    for path in sorted(glob.glob(os.path.join(args.traces, "*.trace.gz"))):
+        name = os.path.basename(path).removesuffix(".trace.gz")
+        turn_ms, problems = [], []
+        for _ in range(args.warmup + args.iterations):
+            replayer = await replay_once(path)
+            turn_ms.append([seconds * 1000 for seconds in replayer.stats.turn_seconds])
+            problems += replayer.stats.event_mismatches
+            if replayer.unused_model_calls:
+                problems.append(f"{replayer.unused_model_calls} recorded model calls were not replayed")
+        per_turn = [ms for run in turn_ms[args.warmup:] for ms in run]
+        median = statistics.median(per_turn)
+        p95 = sorted(per_turn)[int(0.95 * (len(per_turn) - 1))]
+        results[name] = median
+
+        reference = baseline.get(name)
+        if reference and median > reference * (1 + args.max_regression):
+            problems.append(f"median {median:.2f} ms is {median / reference - 1:.0%} above the baseline")
+        failures += bool(problems)
+        problems = sorted(set(problems))
+        print(f"{name:<20} {len(turn_ms[0]):>5} {median:>15.2f} {p95:>12.2f} "
+              f"{(f'{reference:.2f}' if reference else '-'):>9}  {'; '.join(problems) or 'ok'}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Replay recorded traces and check per-turn overhead")
+    argparser.add_argument('--traces', default=TRACES, help='Directory of *.trace.gz files')
+    argparser.add_argument('--iterations', type=int, default=20)
+    argparser.add_argument('--warmup', type=int, default=2)
+    argparser.add_argument('--baseline', help='JSON of median ms/turn per trace to compare with')
+    argparser.add_argument('--max-regression', type=float, default=0.25, help='Allowed slowdown vs the baseline')
+    argparser.add_argument('--save-baseline', help='Write the measured medians to this JSON file')
+    sys.exit(asyncio.run(main(argparser.parse_args())))
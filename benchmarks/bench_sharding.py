@@ -0,0 +1,123 @@
+"""
+Throughput of adk_common.sharding.ShardedRunner for 1..N worker processes.
+Every session plays a few turns of a tool-calling agent whose model is a fake
+that burns `--cpu-ms` of CPU per call (standing in for the request/response
+work a real model client does), so a single process is bound by its GIL and
+the scaling with workers is visible without a model server. Afterwards a
+worker is added and one removed mid-conversation, and every session must
+continue with its full history on its new worker.
+
+    PYTHONPATH=. uv run benchmarks/bench_sharding.py --max-workers 4 --sessions 64 --turns 4
+
+Worker start-up (importing ADK in each process) is not part of the timings.
+Scaling stops at the number of cores (`os.cpu_count()`).
+"""
+import argparse
+import asyncio
+import os
+import time
+import warnings
+
+from google.adk.agents.llm_agent import LlmAgent
+
+from fake_llm import ToolCallingLlm
+
+warnings.filterwarnings("ignore")
+
+
+class CpuBoundLlm(ToolCallingLlm):
+    """ToolCallingLlm that spends `cpu_ms` of CPU on every call."""
+
+    cpu_ms: float = 2.0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        deadline = time.process_time() + self.cpu_ms / 1000
+        while time.process_time() < deadline:
+            pass
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
+
+
+def lookup_city(city: str) -> dict:
+    """Returns a fixed report for a city."""
+    return {"status": "success", "report": f"Sunny in {city}."}
+
+
+def build_agent():
+    return LlmAgent(
+        name="shard_bench_agent",
+        model=CpuBoundLlm(
+            calls=[("lookup_city", {"city": "Paris"})],
+            text="It is sunny in Paris.",
+            cpu_ms=float(os.getenv("FAKE_LLM_CPU_MS", "2")),
+            latency=float(os.getenv("FAKE_LLM_LATENCY", "0")),
+        ),
+        tools=[lookup_city],
+    )
+
+
+async def play(runner, sessions: int, turns: int, history: dict) -> int:
+    async def session(index: int):
+        for turn in range(turns):
+            result = await runner.run("bench", f"session-{index}", f"Weather in Paris? ({turn})")
+            history.setdefault(index, []).append(result["session_events"])
+
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    return sessions * turns
+
+
+async def measure(workers: int, args) -> float:
+    from adk_common.sharding import ShardedRunner
+
+    async with ShardedRunner("bench_sharding:build_agent", app_name="shard_bench", workers=workers) as runner:
+        await play(runner, workers, 1, {})  # warm-up
+        start = time.perf_counter()
+        turns = await play(runner, args.sessions, args.turns, {})
+        return turns / (time.perf_counter() - start)
+
+
+async def check_rebalance(workers: int, args) -> str:
+    """Plays half the turns, adds a worker, removes the first one, plays the rest."""
+    from adk_common.sharding import ShardedRunner
+
+    history = {}
+    async with ShardedRunner("bench_sharding:build_agent", app_name="shard_bench", workers=workers) as runner:
+        await play(runner, args.sessions, args.turns, history)
+        before = await runner.session_counts()
+        await runner.add_worker()
+        await runner.remove_worker(runner.workers[0])
+        after = await runner.session_counts()
+        await play(runner, args.sessions, args.turns, history)
+        stats = runner.stats
+
+    # Each turn appends the same number of events, so history must grow evenly.
+    broken = [
+        index for index, counts in history.items()
+        if any(b - a != counts[0] for a, b in zip([0] + counts, counts))
+    ]
+    return (
+        f"sessions per worker {before} -> {after}; {stats.summary()}; "
+        f"{'history kept for all sessions' if not broken else f'{len(broken)} sessions lost history'}"
+    )
+
+
+async def main(args):
+    print(f"cores: {os.cpu_count()}, fake model CPU per call: {os.getenv('FAKE_LLM_CPU_MS', '2')} ms")
+    print(f"{'workers':>7} {'turns/s':>9} {'speedup':>8} {'efficiency':>11}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rate = await measure(workers, args)
+        baseline = baseline or rate
+        print(f"{workers:>7} {rate:>9.1f} {rate / baseline:>7.2f}x {rate / baseline / workers:>10.0%}")
+    print("rebalance:", await check_rebalance(args.max_workers, args))
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Throughput of session-sharded runners per worker count")
+    argparser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    argparser.add_argument('--sessions', type=int, default=64)
+    argparser.add_argument('--turns', type=int, default=4)
+    argparser.add_argument('--cpu-ms', type=float, default=2.0, help='CPU per fake model call')
+    args = argparser.parse_args()
+    os.environ["FAKE_LLM_CPU_MS"] = str(args.cpu_ms)
+    asyncio.run(main(args))
@@ -0,0 +1,58 @@
+"""
+Compares the list-copy pattern roll_die used for `state['rolls']` with
+adk_common.state.AppendOnlyList over one long session.
+
+Each roll is one tool call: a fresh ADK `State` view with an empty delta, an
+append, then the delta is serialized (as it would be into the event) and
+committed back into the session state.
+
+    PYTHONPATH=. uv run benchmarks/bench_state_list.py --rolls 100000
+"""
+import argparse
+import json
+import random
+import time
+
+from google.adk.sessions.state import State
+
+from adk_common.state import AppendOnlyList
+
+
+def naive_append(state: State, value: int):
+    if 'rolls' not in state:
+        state['rolls'] = []
+    state['rolls'] = state['rolls'] + [value]
+
+
+def chunked_append(state: State, value: int):
+    AppendOnlyList(state, 'rolls').append(value)
+
+
+def run_session(append, rolls: int):
+    session_state: dict = {}
+    delta_bytes = 0
+    start = time.perf_counter()
+    for _ in range(rolls):
+        delta: dict = {}
+        append(State(value=session_state, delta=delta), random.randint(1, 6))
+        delta_bytes += len(json.dumps(delta))
+        session_state.update(delta)
+    return time.perf_counter() - start, delta_bytes, session_state
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Benchmark append-only session state")
+    argparser.add_argument('--rolls', type=int, default=100_000)
+    argparser.add_argument('--naive-rolls', type=int, default=20_000,
+                           help='The list-copy baseline is O(n^2); cap its session length')
+    args = argparser.parse_args()
+
+    print(f"{'storage':<16} {'rolls':>8} {'total s':>9} {'us/roll':>9} {'delta MB':>10}")
+    for label, append, rolls in [
+        ("list copy", naive_append, min(args.rolls, args.naive_rolls)),
+        ("AppendOnlyList", chunked_append, min(args.rolls, args.naive_rolls)),
+        ("AppendOnlyList", chunked_append, args.rolls),
+    ]:
+        elapsed, delta_bytes, state = run_session(append, rolls)
+        print(f"{label:<16} {rolls:>8} {elapsed:>9.2f} {elapsed / rolls * 1e6:>9.1f} {delta_bytes / 1e6:>10.2f}")
+    assert len(AppendOnlyList(State(value=state, delta={}), 'rolls')) == args.rolls
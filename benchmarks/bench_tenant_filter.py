@@ -0,0 +1,153 @@
+"""
+Latency of qdrant_rag's tenant-filtered searches on a local Qdrant server:
+`--points` random 384-d vectors (the size of all-MiniLM-L6-v2) spread over
+`--tenants` tenants, with the keyword payload indexes created by
+qdrant_push_data_script.py. Compares an unfiltered search (what qdrant_find
+did before: every tenant's notes) with the filter qdrant_find now sends
+(own notes or the public corpus), and checks that no filtered hit belongs to
+another tenant. Needs qdrant-client and a Qdrant server, e.g.
+
+    docker run -p 6333:6333 qdrant/qdrant
+    PYTHONPATH=. uv run benchmarks/bench_tenant_filter.py --points 1000000 --tenants 1000
+
+`--per-tenant-hnsw` builds the graph per tenant instead of globally
+(payload_m=16, m=0), Qdrant's layout for collections where every search is
+restricted to one tenant.
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance, FieldCondition, Filter, HnswConfigDiff, IsEmptyCondition, KeywordIndexParams, KeywordIndexType,
+    MatchValue, PayloadField, PointStruct, VectorParams,
+)
+
+VECTOR_NAME = "text"
+PUBLIC_TENANT = "public"
+
+
+def tenant_of(point_id: int, tenants: int, public_share: float) -> str:
+    """Deterministic tenant of a point; `public_share` of them are the shared corpus."""
+    rng = random.Random(point_id)
+    return PUBLIC_TENANT if rng.random() < public_share else f"user-{rng.randrange(tenants)}"
+
+
+def create_collection(client: QdrantClient, name: str, dim: int, per_tenant_hnsw: bool):
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config={VECTOR_NAME: VectorParams(size=dim, distance=Distance.COSINE)},
+        hnsw_config=HnswConfigDiff(payload_m=16, m=0) if per_tenant_hnsw else None,
+    )
+    client.create_payload_index(
+        collection_name=name, field_name="tenant_id",
+        field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+    )
+    for field_name in ("session_id", "doc_id"):
+        client.create_payload_index(
+            collection_name=name, field_name=field_name, field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+        )
+
+
+def upload(client: QdrantClient, name: str, args) -> float:
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for first in range(0, args.points, args.batch_size):
+        ids = range(first, min(first + args.batch_size, args.points))
+        vectors = rng.standard_normal((len(ids), args.dim), dtype=np.float32)
+        client.upload_points(
+            collection_name=name,
+            points=[
+                PointStruct(
+                    id=point_id,
+                    vector={VECTOR_NAME: vector.tolist()},
+                    payload={"tenant_id": tenant_of(point_id, args.tenants, args.public_share),
+                             "session_id": f"s-{point_id % 7}", "doc_id": str(point_id)},
+                )
+                for point_id, vector in zip(ids, vectors)
+            ],
+            batch_size=args.batch_size,
+            wait=False,
+        )
+        print(f"\ruploaded {ids[-1] + 1}/{args.points}", end="", flush=True)
+    print()
+    return time.perf_counter() - start
+
+
+def wait_until_indexed(client: QdrantClient, name: str, timeout: float = 3600.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = client.get_collection(name)
+        if info.status.value == "green" and (info.points_count or 0) > 0:
+            return info
+        time.sleep(2)
+    raise RuntimeError(f"Collection {name} is still indexing after {timeout:.0f} s")
+
+
+def tenant_filter(tenant: str) -> Filter:
+    """The filter qdrant_find sends for a user (tenant scope)."""
+    return Filter(should=[
+        Filter(must=[FieldCondition(key="tenant_id", match=MatchValue(value=tenant))]),
+        FieldCondition(key="tenant_id", match=MatchValue(value=PUBLIC_TENANT)),
+        IsEmptyCondition(is_empty=PayloadField(key="tenant_id")),
+    ])
+
+
+def measure(client: QdrantClient, name: str, args, filtered: bool) -> tuple[list[float], int]:
+    """Search latencies and the number of hits that belong to another tenant."""
+    rng = np.random.default_rng(1)
+    tenants = random.Random(2)
+    latencies, leaked = [], 0
+    for _ in range(args.queries):
+        tenant = f"user-{tenants.randrange(args.tenants)}"
+        query = rng.standard_normal(args.dim, dtype=np.float32).tolist()
+        start = time.perf_counter()
+        hits = client.query_points(
+            name, query=query, using=VECTOR_NAME, limit=args.limit, with_payload=["tenant_id"],
+            query_filter=tenant_filter(tenant) if filtered else None,
+        )
+        latencies.append(time.perf_counter() - start)
+        if filtered:
+            leaked += sum(point.payload["tenant_id"] not in (tenant, PUBLIC_TENANT) for point in hits.points)
+    return latencies, leaked
+
+
+def report(label: str, latencies: list[float], leaked=None):
+    ordered = sorted(seconds * 1000 for seconds in latencies)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    leaks = "" if leaked is None else f"  {leaked} cross-tenant hits"
+    print(f"{label:<12} {statistics.median(ordered):>8.2f} {p95:>8.2f} {len(ordered) / sum(latencies):>8.1f}{leaks}")
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Tenant-filtered vs unfiltered search latency on Qdrant")
+    argparser.add_argument('--url', default="http://localhost:6333")
+    argparser.add_argument('--collection', default="tenant_filter_bench")
+    argparser.add_argument('--points', type=int, default=1_000_000)
+    argparser.add_argument('--tenants', type=int, default=1000)
+    argparser.add_argument('--public-share', type=float, default=0.01, help='Share of points in the public corpus')
+    argparser.add_argument('--dim', type=int, default=384)
+    argparser.add_argument('--batch-size', type=int, default=1000)
+    argparser.add_argument('--queries', type=int, default=500)
+    argparser.add_argument('--limit', type=int, default=20, help='Hits per search (qdrant_find asks for 20)')
+    argparser.add_argument('--per-tenant-hnsw', action='store_true')
+    argparser.add_argument('--reuse', action='store_true', help='Search an already uploaded collection')
+    args = argparser.parse_args()
+
+    client = QdrantClient(url=args.url, timeout=300)
+    if not args.reuse:
+        create_collection(client, args.collection, args.dim, args.per_tenant_hnsw)
+        seconds = upload(client, args.collection, args)
+        print(f"upload: {seconds:.1f} s, {args.points / seconds:.0f} points/s")
+    info = wait_until_indexed(client, args.collection)
+    print(f"{info.points_count} points, {args.tenants} tenants + {args.public_share:.0%} public, "
+          f"{'per-tenant' if args.per_tenant_hnsw else 'global'} HNSW")
+
+    print(f"{'search':<12} {'p50 ms':>8} {'p95 ms':>8} {'q/s':>8}")
+    report("unfiltered", measure(client, args.collection, args, filtered=False)[0])
+    report("tenant", *measure(client, args.collection, args, filtered=True))
@@ -0,0 +1,103 @@
+"""
+Wall-clock of greeting turns answered by a single large model versus an
+adk_common.tiering.TieredLlm that tries a small model first and escalates to
+the large one when the small model's tool call does not validate. Both
+models are scripted stand-ins: the small one is fast but gets the call wrong
+`--failure-rate` of the time (JSON in the text, a misspelled argument, or
+nothing at all), so no Ollama is needed.
+
+    PYTHONPATH=. uv run benchmarks/bench_tiering.py --turns 50 --failure-rate 0.2
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import warnings
+from typing import AsyncGenerator, Optional
+
+warnings.filterwarnings("ignore")
+
+
+def say_hello(name: Optional[str] = None) -> str:
+    """Provides a simple greeting. If a name is provided, it will be used."""
+    return f"Hello, {name}!" if name else "Hello there!"
+
+
+def flaky_llm_class():
+    from google.adk.models.llm_request import LlmRequest
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+    from fake_llm import ToolCallingLlm
+
+    class FlakyToolCallingLlm(ToolCallingLlm):
+        """`ToolCallingLlm` that answers a user turn wrongly `failure_rate` of the time."""
+
+        failure_rate: float = 0.0
+        rng: random.Random
+
+        async def generate_content_async(
+            self, llm_request: LlmRequest, stream: bool = False
+        ) -> AsyncGenerator[LlmResponse, None]:
+            last = llm_request.contents[-1] if llm_request.contents else None
+            fresh_turn = last and not any(part.function_response for part in last.parts or [])
+            if fresh_turn and self.rng.random() < self.failure_rate:
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                parts = self.rng.choice([
+                    [types.Part(text='{"name": "say_hello", "arguments": {"name": "Ada"}}')],
+                    [types.Part(function_call=types.FunctionCall(name="say_hello", args={"nmae": "Ada"}))],
+                    [],
+                ])
+                yield LlmResponse(content=types.Content(role="model", parts=parts))
+                return
+            async for response in super().generate_content_async(llm_request, stream=stream):
+                yield response
+
+    return FlakyToolCallingLlm
+
+
+async def run_turns(model, turns: int) -> list[float]:
+    from google.adk.agents import Agent
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    agent = Agent(name="greeting_agent", model=model, tools=[say_hello],
+                  instruction="Use the 'say_hello' tool to greet the user.")
+    runner = InMemoryRunner(agent=agent, app_name="tiering_bench")
+    times = []
+    for turn in range(turns):
+        session = await runner.session_service.create_session(app_name="tiering_bench", user_id="bench")
+        message = types.Content(role="user", parts=[types.Part(text=f"Hi, I'm Ada ({turn})")])
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        times.append(time.perf_counter() - start)
+    return times
+
+
+async def main(args):
+    from fake_llm import ToolCallingLlm
+    from adk_common.tiering import TieredLlm
+
+    calls = [("say_hello", {"name": "Ada"})]
+    large = ToolCallingLlm(model="large", calls=calls, text="Hello, Ada!", latency=args.large_latency)
+    small = flaky_llm_class()(model="small", calls=calls, text="Hello, Ada!", latency=args.small_latency,
+                              failure_rate=args.failure_rate, rng=random.Random(args.seed))
+    tiered = TieredLlm(model="tiered", small=small, large=large)
+
+    for label, model in (("large only", large), ("tiered", tiered)):
+        times = await run_turns(model, args.turns)
+        print(f"{label:<10} mean {statistics.mean(times) * 1000:7.0f} ms  "
+              f"p95 {sorted(times)[int(0.95 * (len(times) - 1))] * 1000:7.0f} ms  total {sum(times):6.2f}s")
+    print(tiered.stats.summary())
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Large model vs small-first tiering")
+    argparser.add_argument('--turns', type=int, default=50)
+    argparser.add_argument('--failure-rate', type=float, default=0.2, help='Share of bad small-model tool calls')
+    argparser.add_argument('--small-latency', type=float, default=0.05, help='Seconds per small-model call')
+    argparser.add_argument('--large-latency', type=float, default=0.4, help='Seconds per large-model call')
+    argparser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(argparser.parse_args()))
@@ -0,0 +1,94 @@
+"""
+Import-time budget for the agent modules. Each module is imported in a fresh
+interpreter with `python -X importtime`; the check fails when importing it
+
+- prints anything (agents, sessions and runners are built by factories, and
+  the demos run under `if __name__ == "__main__"`),
+- spends more than `--budget-ms` in the bodies of this repository's own
+  modules (constructing agents or running an event loop at import shows up
+  here; the ADK/LiteLLM imports themselves are reported but not budgeted), or
+- pulls in one of the heavy optional libraries that are only needed once a
+  request arrives.
+
+    PYTHONPATH=. uv run benchmarks/check_import_time.py
+    PYTHONPATH=. uv run benchmarks/check_import_time.py agent_team.agent --budget-ms 20
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "agent_team",
+    "agent_team.weather_agent",
+    "agent_team.reception_agents",
+    "agent_team.guardrail_callback",
+    "agent_team.weather_agent_team",
+    "agent_team.weather_agent_team_context",
+    "agent_ollama",
+    "qdrant_rag",
+]
+FIRST_PARTY = ("agent_team", "adk_common", "agent_ollama", "qdrant_rag", "a2a_root", "a2a_basic")
+HEAVY_MODULES = ("sentence_transformers", "torch", "qdrant_client", "yfinance")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module: str) -> dict:
+    path = [ROOT, os.path.join(ROOT, "a2a_tutorial"), os.environ.get("PYTHONPATH", "")]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, path)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=ROOT,
+    )
+    own_us, total_us, heavy = 0, 0, set()
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        if name.split(".")[0] in FIRST_PARTY:
+            own_us += self_us
+        if name.split(".")[0] in HEAVY_MODULES:
+            heavy.add(name.split(".")[0])
+        if name == module and len(indent) == 1:
+            total_us = cumulative_us
+    errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+    return {
+        "ok": result.returncode == 0,
+        "stdout": result.stdout,
+        "errors": errors,
+        "own_ms": own_us / 1000,
+        "total_ms": total_us / 1000,
+        "heavy": sorted(heavy),
+    }
+
+
+def main(args) -> int:
+    failures = 0
+    print(f"{'module':<42} {'own ms':>8} {'total ms':>9}  result")
+    for module in args.modules:
+        m = measure(module)
+        problems = []
+        if not m["ok"]:
+            problems.append("import failed: " + (m["errors"][-1] if m["errors"] else "?"))
+        if m["stdout"]:
+            problems.append(f"printed {len(m['stdout'].splitlines())} line(s) at import")
+        if m["own_ms"] > args.budget_ms:
+            problems.append(f"own modules took {m['own_ms']:.0f} ms > {args.budget_ms:.0f} ms")
+        if m["heavy"]:
+            problems.append(f"imports {', '.join(m['heavy'])}")
+        failures += bool(problems)
+        print(f"{module:<42} {m['own_ms']:>8.1f} {m['total_ms']:>9.0f}  {'; '.join(problems) or 'ok'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description="Import-time budget for the agent modules")
+    argparser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='Modules to import')
+    argparser.add_argument('--budget-ms', type=float, default=50.0,
+                           help="Budget for the bodies of this repository's modules, per import")
+    sys.exit(main(argparser.parse_args()))
@@ -0,0 +1,52 @@
+"""A stand-in model for benchmarks that must not depend on Ollama."""
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+class FakeLlm(BaseLlm):
+    """Answers every request with a fixed text after `latency` seconds."""
+
+    model: str = "fake"
+    text: str = "I rolled a 4 for you."
+    latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.text)])
+        )
+
+
+class ToolCallingLlm(BaseLlm):
+    """
+    Answers a user turn with one response holding all of `calls` (as
+    `(tool_name, args)` pairs), then answers the tool results with `text`.
+    """
+
+    model: str = "fake-tool-caller"
+    calls: list[tuple[str, dict]] = []
+    text: str = "Done."
+    latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        last = llm_request.contents[-1] if llm_request.contents else None
+        if last and any(part.function_response for part in last.parts or []):
+            parts = [types.Part(text=self.text)]
+        else:
+            parts = [
+                types.Part(function_call=types.FunctionCall(name=name, args=args))
+                for name, args in self.calls
+            ]
+        yield LlmResponse(content=types.Content(role="model", parts=parts))
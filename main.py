@@ -1,5 +1,223 @@
+"""
+Batch runner: plays scripted sessions against the agents of this repository
+and reports throughput and latency percentiles.
+
+Each input line is one session:
+
+    {"id": "stock-1", "agent": "agent_ollama", "queries": ["Price of GOOG?", "And MSFT?"]}
+    {"id": "team-1", "agent": "agent_team", "state": {"user_preference_temperature_unit": "Fahrenheit"},
+     "queries": ["Hi!", "Weather in London?"]}
+
+`agent` is an app name with an `agent_manifest.json` (repository root or
+a2a_tutorial) or a `module:attribute`; `state` is the initial session state.
+Sessions are spread over `--workers` processes, each running up to
+`--concurrency` sessions at once on its own event loop, and every finished
+session is written to the output JSONL as soon as it completes. Model call
+limits (`OLLAMA_MAX_CONCURRENCY`, ...) apply per worker process.
+
+    PYTHONPATH=. uv run main.py sessions.jsonl -o results.jsonl --workers 4 --concurrency 8
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+AGENT_DIRS = [ROOT, os.path.join(ROOT, "a2a_tutorial")]
+
+_DONE = None  # end-of-work marker on the queues
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, `q` in [0, 100]."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def load_agent(spec: str):
+    """Root agent for an app name with a manifest, or for `module:attr`."""
+    from adk_common.agent_registry import discover_manifests
+
+    for agents_dir in AGENT_DIRS:
+        if agents_dir not in sys.path:
+            sys.path.append(agents_dir)
+    for agents_dir in AGENT_DIRS:
+        manifest = discover_manifests(agents_dir).get(spec)
+        if manifest is not None:
+            return manifest.load()
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr or "root_agent")
+
+
+class SessionPlayer:
+    """One `InMemoryRunner` per agent in this process, loaded on first use."""
+
+    def __init__(self):
+        self._runners = {}
+
+    def runner(self, spec: str):
+        from google.adk.runners import InMemoryRunner
+
+        if spec not in self._runners:
+            self._runners[spec] = InMemoryRunner(agent=load_agent(spec), app_name=spec.replace(":", "."))
+        return self._runners[spec]
+
+    async def play(self, job: dict) -> dict:
+        from google.genai import types
+        from adk_common.llm_registry import llm_fairness_key
+
+        result = {"id": job.get("id"), "agent": job["agent"], "worker": os.getpid(), "turns": [], "error": None}
+        start = time.perf_counter()
+        try:
+            runner = self.runner(job["agent"])
+            session = await runner.session_service.create_session(
+                app_name=runner.app_name, user_id="batch", state=job.get("state"),
+            )
+            # This session's model calls take turns with the other sessions'.
+            llm_fairness_key.set(session.id)
+            for query in job.get("queries", []):
+                turn_start = time.perf_counter()
+                message = types.Content(role="user", parts=[types.Part(text=query)])
+                response, events = "", 0
+                async for event in runner.run_async(user_id="batch", session_id=session.id, new_message=message):
+                    events += 1
+                    if event.is_final_response() and event.content and event.content.parts:
+                        response = "".join(part.text or "" for part in event.content.parts)
+                result["turns"].append({
+                    "query": query,
+                    "response": response,
+                    "events": events,
+                    "latency_s": round(time.perf_counter() - turn_start, 4),
+                })
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["latency_s"] = round(time.perf_counter() - start, 4)
+        return result
+
+
+def worker(jobs: multiprocessing.Queue, results: multiprocessing.Queue, concurrency: int):
+    import logging
+    import warnings
+    from dotenv import load_dotenv
+
+    warnings.filterwarnings("ignore")
+    logging.basicConfig(level=logging.ERROR)
+    load_dotenv()
+    # Agent and tool banners must not end up in a JSONL written to stdout.
+    sys.stdout = sys.stderr
+    sys.path[:0] = [path for path in AGENT_DIRS if path not in sys.path]
+    player = SessionPlayer()
+
+    async def consume():
+        loop = asyncio.get_running_loop()
+        while (job := await loop.run_in_executor(None, jobs.get)) is not _DONE:
+            results.put(await player.play(job))
+
+    async def main():
+        await asyncio.gather(*(consume() for _ in range(concurrency)))
+
+    asyncio.run(main())
+    results.put((_DONE, os.getpid()))
+
+
+def run_batch(sessions: list[dict], output, workers: int, concurrency: int) -> list[dict]:
+    """
+    Plays `sessions` and writes each result to `output` as it finishes. The
+    sessions of a worker process that dies are reported as errors.
+    """
+    jobs, results = multiprocessing.Queue(), multiprocessing.Queue()
+    for job in sessions:
+        jobs.put(job)
+    for _ in range(workers * concurrency):
+        jobs.put(_DONE)
+    processes = [
+        multiprocessing.Process(target=worker, args=(jobs, results, concurrency), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    finished = []
+
+    def record(result: dict):
+        finished.append(result)
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        print(f"[{len(finished)}/{len(sessions)}] {result['id']} ({result['agent']}): "
+              f"{result['latency_s']:.2f}s{' ERROR ' + result['error'] if result['error'] else ''}", file=sys.stderr)
+
+    running = {process.pid: process for process in processes}
+    while running:
+        try:
+            result = results.get(timeout=1.0)
+        except queue.Empty:
+            # A worker that dies (killed, out of memory) never reports done: check on them while waiting.
+            for pid, process in list(running.items()):
+                if not process.is_alive():
+                    del running[pid]
+                    print(f"Worker {pid} exited with code {process.exitcode}", file=sys.stderr)
+            continue
+        if isinstance(result, tuple) and result[0] is _DONE:
+            running.pop(result[1], None)
+            continue
+        record(result)
+    for process in processes:
+        process.join()
+
+    # Sessions a dead worker had taken never finished, and if every worker
+    # died some were never started.
+    played = {result["id"] for result in finished}
+    for job in sessions:
+        if job.get("id") not in played:
+            record({"id": job.get("id"), "agent": job["agent"], "worker": None, "turns": [],
+                    "error": "Worker exited before finishing the session", "latency_s": 0.0})
+    return finished
+
+
+def summarize(results: list[dict], wall_seconds: float) -> str:
+    turns = [turn["latency_s"] for result in results for turn in result["turns"]]
+    sessions = [result["latency_s"] for result in results if not result["error"]]
+    errors = sum(bool(result["error"]) for result in results)
+    lines = [
+        f"{len(results)} sessions ({errors} failed), {len(turns)} turns in {wall_seconds:.2f}s: "
+        f"{len(results) / wall_seconds:.2f} sessions/s, {len(turns) / wall_seconds:.2f} turns/s",
+        "turn latency    " + "  ".join(f"p{q} {percentile(turns, q):.3f}s" for q in (50, 90, 95, 99)),
+        "session latency " + "  ".join(f"p{q} {percentile(sessions, q):.3f}s" for q in (50, 90, 95, 99)),
+    ]
+    return "\n".join(lines)
+
+
 def main():
-    print("Hello from adk-tutorials!")
+    argparser = argparse.ArgumentParser(description="Play scripted sessions against the agents in parallel")
+    argparser.add_argument('input', help='JSONL of sessions: {"id", "agent", "queries", "state"}')
+    argparser.add_argument('-o', '--output', default='-', help='JSONL of results (default: stdout)')
+    argparser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    argparser.add_argument('--concurrency', type=int, default=4, help='Concurrent sessions per worker')
+    args = argparser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        sessions = [json.loads(line) for line in f if line.strip()]
+    for index, session in enumerate(sessions):
+        session.setdefault("id", str(index))
+    workers = max(1, min(args.workers, len(sessions)))
+
+    output = sys.stdout if args.output == '-' else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        results = run_batch(sessions, output, workers, args.concurrency)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(summarize(results, time.perf_counter() - start), file=sys.stderr)
 
 
 if __name__ == "__main__":
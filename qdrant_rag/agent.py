@@ -1,44 +1,105 @@
 import os
 import uuid
+from functools import lru_cache
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
+from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.mcp_tool import McpToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
 from mcp import StdioServerParameters
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
-from sentence_transformers import SentenceTransformer
-
 from dotenv import load_dotenv
 
+from adk_common.llm_registry import get_llm
+from adk_common.single_flight import cached_tool
+from qdrant_rag.chunking import chunk_payload, chunk_text, chunk_window, collapse_hits, embed_chunks
+
 
 load_dotenv()
 
 required_vars = ["QDRANT_URL", "QDRANT_COLLECTION_NAME", "QDRANT_VECTOR_NAME"]
 
-if all(var in os.environ for var in required_vars):
-    print("All required environment variables are set")
-else:
-    missing = [var for var in required_vars if var not in os.environ]
-    print("Missing env vars:", missing)
+@lru_cache(maxsize=None)
+def get_embedding_model():
+    """
+    The process-wide embedding model, loaded on first use.
+
+    `python -m adk_common.prefork` calls it before forking its workers so they
+    all share one copy of the weights; it only loads the model (no inference),
+    which keeps the forked workers' torch thread pools usable.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
 
 def qdrant_setup():
     """Setup Qdrant client and model for embeddings."""
+    # qdrant-client and sentence-transformers (torch) take seconds to import and
+    # the model is loaded from disk, so both wait for the first tool call.
+    from qdrant_client import QdrantClient
 
+    if all(var in os.environ for var in required_vars):
+        print("All required environment variables are set")
+    else:
+        missing = [var for var in required_vars if var not in os.environ]
+        print("Missing env vars:", missing)
 
     qdrant_url = os.getenv("QDRANT_URL")
     collection_name = os.getenv("QDRANT_COLLECTION_NAME")
     vector_name = os.getenv("QDRANT_VECTOR_NAME")
 
     client = QdrantClient(url=qdrant_url)
-    model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    model = get_embedding_model()
 
     return client, model, collection_name, vector_name
 
-client, model, collection_name, vector_name = qdrant_setup()
+@lru_cache(maxsize=None)
+def get_qdrant():
+    """
+    The process-wide result of `qdrant_setup()`, created on first use. The
+    client (and its connections) is per process, never shared across a fork.
+    """
+    return qdrant_setup()
+
+# Chunk hits fetched per document returned, so that several chunks of one
+# document do not crowd out the other documents.
+CHUNK_OVERFETCH = int(os.getenv("QDRANT_CHUNK_OVERFETCH", "4"))
 
-def qdrant_find(query: str) -> dict:
+# Every user (tenant) sees their own notes plus the shared corpus loaded by
+# qdrant_push_data_script.py; with QDRANT_SCOPE=session only the notes added
+# in the current session.
+PUBLIC_TENANT = os.getenv("QDRANT_PUBLIC_TENANT", "public")
+SCOPE = os.getenv("QDRANT_SCOPE", "tenant")
+
+def search_scope(tool_context: ToolContext) -> str:
+    """The notes a call may read: the user's, or the user's in this session."""
+    if SCOPE == "session":
+        return f"{tool_context.user_id}/{tool_context.session.id}"
+    return tool_context.user_id
+
+def scope_payload(tool_context: ToolContext) -> dict:
+    """Payload fields stamped on every point written from this context."""
+    return {"tenant_id": tool_context.user_id, "session_id": tool_context.session.id}
+
+def scope_filter(tool_context: ToolContext):
+    """
+    Qdrant filter for `search_scope`, served by the keyword payload indexes.
+
+    Points without a `tenant_id` (a corpus pushed or notes added before
+    scoping existed) are read as public, as they were before; stamp them with
+    `qdrant_push_data_script.py --backfill` to give them a tenant.
+    """
+    from qdrant_client.models import FieldCondition, Filter, IsEmptyCondition, MatchValue, PayloadField
+
+    own = [FieldCondition(key="tenant_id", match=MatchValue(value=tool_context.user_id))]
+    if SCOPE == "session":
+        own.append(FieldCondition(key="session_id", match=MatchValue(value=tool_context.session.id)))
+    return Filter(should=[
+        Filter(must=own),
+        FieldCondition(key="tenant_id", match=MatchValue(value=PUBLIC_TENANT)),
+        IsEmptyCondition(is_empty=PayloadField(key="tenant_id")),
+    ])
+
+def qdrant_find(query: str, tool_context: ToolContext) -> dict:
     """
     Perform a vector search over the Qdrant collection.
 
@@ -49,20 +110,26 @@ def qdrant_find(query: str) -> dict:
         dict: The search results from the Qdrant collection.
     """
 
+    client, model, collection_name, vector_name = get_qdrant()
     test_embedding = model.encode([query])[0]
     hits = client.query_points(
         collection_name=collection_name,
         query=test_embedding,
         using=vector_name,
-        limit=5,
+        query_filter=scope_filter(tool_context),
+        limit=5 * CHUNK_OVERFETCH,
     )
     query_results = ""
-    for result in hits.points:
-        query_results += result.payload['origin_text'] + "\n" + ("-"*20) + "\n"
+    # Chunks of the same document come back as one result.
+    for document in collapse_hits(hits.points, limit=5):
+        query_results += document["text"] + "\n" + ("-"*20) + "\n"
 
     return {"results": query_results.strip()}
 
-def qdrant_add(query: str) -> str:
+# Repeated searches of a user within the TTL are served from memory; qdrant_add invalidates.
+qdrant_find_tool = cached_tool(qdrant_find, ttl=60, scope=search_scope)
+
+def qdrant_add(query: str, tool_context: ToolContext) -> str:
     """
     Add new document to the Qdrant collection.
 
@@ -73,27 +140,37 @@ def qdrant_add(query: str) -> str:
         str: Confirmation message.
     """
 
+    from qdrant_client.models import PointStruct
+
     try:
-        embeddings = model.encode(query)
+        client, model, collection_name, vector_name = get_qdrant()
+        # Longer documents than the model's window are indexed as overlapping chunks.
+        doc_id = str(uuid.uuid4())
+        chunks = chunk_text(query, model.tokenizer, max_tokens=chunk_window(model))
+        embeddings = embed_chunks(model, chunks)
 
-        client.upsert(
+        client.upload_points(
             collection_name=collection_name,
             points=[
                 PointStruct(
                     id=str(uuid.uuid4()),
                     vector={
-                        vector_name: embeddings
+                        vector_name: embedding.tolist()
                     },
-                    payload={"origin_text": query}
+                    payload=chunk_payload(chunk, doc_id, len(chunks), extra=scope_payload(tool_context))
                 )
-            ]
+                for chunk, embedding in zip(chunks, embeddings)
+            ],
+            batch_size=256,
+            wait=True,
         )
-        return "Document added successfully."
+        qdrant_find_tool.invalidate(search_scope(tool_context))
+        return "Document added successfully." if len(chunks) == 1 else f"Document added successfully ({len(chunks)} chunks)."
     except Exception as e:
         return f"Error adding document: {str(e)}"
 
 root_agent = Agent(
-    model=LiteLlm(model='ollama_chat/qwen2.5:7b'),
+    model=get_llm('ollama_chat/qwen2.5:7b'),
     name="qdrant_agent",
     instruction=(
         "Help users store and retrieve information using semantic search. "
@@ -102,6 +179,6 @@ root_agent = Agent(
         "and a tool to add new documents to the collection named qdrant_add. "
     ),
     tools=[
-       qdrant_find, qdrant_add
+       qdrant_find_tool, qdrant_add
     ],
 )
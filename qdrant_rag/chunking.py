@@ -0,0 +1,114 @@
+"""
+Token-aware chunking for documents longer than the embedding model's window.
+
+all-MiniLM-L6-v2 reads at most 256 tokens and silently drops the rest, so a
+long document embedded as one vector is only indexed by its beginning. Here
+a document is cut into overlapping windows of the model's own tokens; each
+window keeps its character span so its text is an exact slice of the
+document, and all windows are encoded in one batched call.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+CHUNK_OVERLAP = int(os.getenv("QDRANT_CHUNK_OVERLAP", "32"))
+EMBED_BATCH_SIZE = int(os.getenv("QDRANT_EMBED_BATCH_SIZE", "64"))
+
+
+@dataclass
+class Chunk:
+    index: int
+    text: str
+    start: int  # character offsets in the document
+    end: int
+
+
+def chunk_window(model) -> int:
+    """Tokens of text per chunk: the model's sequence length minus [CLS] and [SEP]."""
+    return max((model.max_seq_length or 256) - 2, 1)
+
+
+def chunk_text(text: str, tokenizer, max_tokens: int, overlap: int = CHUNK_OVERLAP) -> list[Chunk]:
+    """
+    Splits `text` into windows of at most `max_tokens` tokens, each starting
+    `max_tokens - overlap` tokens after the previous one.
+
+    Args:
+        text (str): The document.
+        tokenizer: The embedding model's (fast) Hugging Face tokenizer.
+        max_tokens (int): Tokens per window, see `chunk_window`.
+        overlap (int): Tokens shared by consecutive windows.
+
+    Returns:
+        list[Chunk]: One chunk for a document that fits in a window, several otherwise.
+    """
+    offsets = tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True, verbose=False,
+    )["offset_mapping"]
+    if len(offsets) <= max_tokens:
+        return [Chunk(index=0, text=text, start=0, end=len(text))]
+
+    stride = max(max_tokens - min(overlap, max_tokens - 1), 1)
+    chunks = []
+    for first in range(0, len(offsets), stride):
+        window = offsets[first:first + max_tokens]
+        start, end = window[0][0], window[-1][1]
+        chunks.append(Chunk(index=len(chunks), text=text[start:end], start=start, end=end))
+        if first + max_tokens >= len(offsets):
+            break
+    return chunks
+
+
+def embed_chunks(model, chunks: list[Chunk], batch_size: int = EMBED_BATCH_SIZE):
+    """Embeddings of all `chunks`, encoded in one call (one row per chunk)."""
+    return model.encode([chunk.text for chunk in chunks], batch_size=batch_size)
+
+
+def chunk_payload(chunk: Chunk, doc_id: str, chunk_count: int, extra: Optional[dict] = None) -> dict:
+    """Qdrant payload of a chunk: its text and where it sits in its parent document."""
+    return {
+        "origin_text": chunk.text,
+        "doc_id": doc_id,
+        "chunk_index": chunk.index,
+        "chunk_count": chunk_count,
+        "char_start": chunk.start,
+        "char_end": chunk.end,
+        **(extra or {}),
+    }
+
+
+def collapse_hits(points, limit: int) -> list[dict]:
+    """
+    Groups chunk hits by parent document, best document first.
+
+    Points without a `doc_id` (indexed before chunking) are documents on
+    their own. The matched chunks of a document are joined in document
+    order: overlapping ones are stitched together, with "..." where text in
+    between did not match.
+
+    Returns:
+        list[dict]: At most `limit` of {"doc_id", "score", "text"}.
+    """
+    documents: dict[str, dict] = {}
+    for point in points:  # ordered by score
+        payload = point.payload
+        doc_id = str(payload.get("doc_id", point.id))
+        document = documents.setdefault(doc_id, {"doc_id": doc_id, "score": point.score, "chunks": {}})
+        text = payload["origin_text"]
+        start = payload.get("char_start", 0)
+        document["chunks"][payload.get("chunk_index", 0)] = (start, payload.get("char_end", start + len(text)), text)
+
+    results = []
+    for document in list(documents.values())[:limit]:
+        text, end, previous = "", None, None
+        for index in sorted(document["chunks"]):
+            chunk_start, chunk_end, chunk = document["chunks"][index]
+            if end is None:
+                text = chunk
+            elif chunk_start < end:
+                text += chunk[end - chunk_start:]  # the overlap is already in
+            else:
+                text += (" " if index == previous + 1 else " ... ") + chunk
+            end, previous = chunk_end, index
+        results.append({"doc_id": document["doc_id"], "score": document["score"], "text": text})
+    return results
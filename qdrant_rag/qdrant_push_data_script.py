@@ -2,10 +2,15 @@ import os
 import argparse
 import pandas as pd
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, KeywordIndexParams, KeywordIndexType,
+    Filter, IsEmptyCondition, PayloadField,
+)
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
+from chunking import chunk_payload, chunk_text, chunk_window, embed_chunks
+
 
 load_dotenv()
 
@@ -19,39 +24,87 @@ else:
 
 argparser = argparse.ArgumentParser(description="Push data to Qdrant collection")
 argparser.add_argument('--data-path', type=str, required=False, help='Path to the data file')
+argparser.add_argument('--tenant', type=str, default=os.getenv("QDRANT_PUBLIC_TENANT", "public"),
+                       help='tenant_id of the passages (default: the corpus every user can read)')
+argparser.add_argument('--backfill', action='store_true',
+                       help='Push nothing: stamp --tenant on the existing points without a tenant_id '
+                            'and create the payload indexes')
 args = argparser.parse_args()
 
-df = pd.read_parquet("hf://datasets/rag-datasets/rag-mini-wikipedia/data/passages.parquet/part.0.parquet")
-passage_list = df.iloc[:500]['passage'].to_list()
-
 if args.data_path:
     client = QdrantClient(path=args.data_path)
 else:
     client = QdrantClient(url="http://localhost:6333")
 
+
+def create_scope_indexes():
+    # qdrant_find filters every search on tenant_id (and session_id with
+    # QDRANT_SCOPE=session); keyword indexes let Qdrant plan those filters instead
+    # of scanning payloads, and is_tenant co-locates each tenant's points on disk.
+    client.create_payload_index(
+        collection_name=os.getenv("QDRANT_COLLECTION_NAME"),
+        field_name="tenant_id",
+        field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+    )
+    for field_name in ("session_id", "doc_id"):
+        client.create_payload_index(
+            collection_name=os.getenv("QDRANT_COLLECTION_NAME"),
+            field_name=field_name,
+            field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+        )
+
+
+if args.backfill:
+    # Collections filled before tenant scoping: give their points a tenant.
+    unscoped = Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="tenant_id"))])
+    count = client.count(collection_name=os.getenv("QDRANT_COLLECTION_NAME"), count_filter=unscoped).count
+    client.set_payload(
+        collection_name=os.getenv("QDRANT_COLLECTION_NAME"),
+        payload={"tenant_id": args.tenant},
+        points=unscoped,
+        wait=True,
+    )
+    create_scope_indexes()
+    print(f"Set tenant_id={args.tenant!r} on {count} points of '{os.getenv('QDRANT_COLLECTION_NAME')}'")
+    raise SystemExit(0)
+
+df = pd.read_parquet("hf://datasets/rag-datasets/rag-mini-wikipedia/data/passages.parquet/part.0.parquet")
+passage_list = df.iloc[:500]['passage'].to_list()
+
 client.create_collection(
     collection_name=os.getenv("QDRANT_COLLECTION_NAME"),
     vectors_config={
         os.getenv("QDRANT_VECTOR_NAME"): VectorParams(size=384, distance=Distance.COSINE),
     }
 )
+create_scope_indexes()
 
 model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-embeddings = model.encode(passage_list)
+# Passages longer than the model's window are indexed as overlapping chunks,
+# all of them encoded in one batched call.
+chunks = [
+    (idx, chunk, len(passage_chunks))
+    for idx, passage in enumerate(passage_list)
+    for passage_chunks in [chunk_text(passage, model.tokenizer, max_tokens=chunk_window(model))]
+    for chunk in passage_chunks
+]
+embeddings = embed_chunks(model, [chunk for _, chunk, _ in chunks])
 
-print(f"Pushing {len(embeddings)} vectors to Qdrant collection '{os.getenv("QDRANT_COLLECTION_NAME")}'...")
-client.upsert(
+print(f"Pushing {len(embeddings)} vectors ({len(passage_list)} passages) to Qdrant collection '{os.getenv("QDRANT_COLLECTION_NAME")}'...")
+client.upload_points(
     collection_name=os.getenv("QDRANT_COLLECTION_NAME"),
     points=[
         PointStruct(
-            id=idx,
+            id=point_id,
             vector={
                 os.getenv("QDRANT_VECTOR_NAME"): vector.tolist()
             },
-            payload={"origin_text": passage_list[idx]}
+            payload=chunk_payload(chunk, str(idx), chunk_count, extra={"tenant_id": args.tenant})
         )
-        for idx, vector in enumerate(embeddings)
-    ]
+        for point_id, ((idx, chunk, chunk_count), vector) in enumerate(zip(chunks, embeddings))
+    ],
+    batch_size=256,
+    wait=True,
 )
 
 
@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+from a2a.client.client import ClientConfig
+from a2a.client.client_factory import ClientFactory
+
+from adk_common.a2a_client import PooledRemoteA2aAgent, get_shared_httpx_client
+
+CARD = "http://localhost:1/.well-known/agent-card.json"
+
+
+def test_default_factory_uses_the_pool():
+    async def scenario():
+        agent = PooledRemoteA2aAgent(name="remote", agent_card=CARD, streaming=False)
+        client = await agent._ensure_httpx_client()
+        assert client is get_shared_httpx_client()
+        assert agent._a2a_client_factory._config.httpx_client is client
+        assert agent._a2a_client_factory._config.streaming is False
+        assert agent._httpx_client_needs_cleanup is False
+
+    asyncio.run(scenario())
+
+
+def test_caller_factory_keeps_its_config_on_the_pooled_client():
+    factory = ClientFactory(config=ClientConfig(streaming=True, polling=True, accepted_output_modes=["text/plain"]))
+
+    async def scenario():
+        agent = PooledRemoteA2aAgent(name="remote", agent_card=CARD, streaming=False, a2a_client_factory=factory)
+        client = await agent._ensure_httpx_client()
+        config = agent._a2a_client_factory._config
+        assert client is get_shared_httpx_client()
+        assert config.httpx_client is client
+        assert (config.streaming, config.polling, config.accepted_output_modes) == (True, True, ["text/plain"])
+
+    asyncio.run(scenario())
+
+
+def test_caller_factory_with_its_own_client_is_left_alone():
+    async def scenario():
+        own = httpx.AsyncClient()
+        factory = ClientFactory(config=ClientConfig(httpx_client=own))
+        agent = PooledRemoteA2aAgent(name="remote", agent_card=CARD, a2a_client_factory=factory)
+        assert await agent._ensure_httpx_client() is own
+        assert agent._a2a_client_factory is factory
+        await own.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,112 @@
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.events.event import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_common.a2a_resilience import CircuitBreaker, EndpointLatency, ResilientRemoteA2aAgent
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial call at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.release()  # the trial was cancelled: another one may go
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_latency_percentiles_over_a_window():
+    latency = EndpointLatency(window=4)
+    assert latency.percentile(50) is None
+    for seconds in (5.0, 1.0, 2.0, 3.0, 4.0):
+        latency.observe(seconds)
+    assert len(latency) == 4
+    assert latency.percentile(50) == 2.0
+    assert latency.percentile(95) == 4.0
+
+
+class Replica(BaseAgent):
+    """Acknowledges at once with a partial event, answers after `delay`, or fails."""
+
+    delay: float = 0.0
+    fail: bool = False
+    calls: int = 0
+
+    async def _run_async_impl(self, ctx) -> AsyncGenerator[Event, None]:
+        self.calls += 1
+        yield Event(author=self.name, invocation_id=ctx.invocation_id, partial=True,
+                    content=types.Content(role="model", parts=[types.Part(text="submitted")]))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            yield Event(author=self.name, invocation_id=ctx.invocation_id, error_message="replica down")
+            return
+        yield Event(author=self.name, invocation_id=ctx.invocation_id,
+                    content=types.Content(role="model", parts=[types.Part(text=f"answer after {self.delay}")]))
+
+
+async def delegate(agent, turns: int = 1) -> list[list[Event]]:
+    runner = InMemoryRunner(agent=agent, app_name="resilience_test")
+    runs = []
+    for _ in range(turns):
+        session = await runner.session_service.create_session(app_name="resilience_test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text="Is 7 prime?")])
+        runs.append([event async for event in runner.run_async(user_id="u", session_id=session.id,
+                                                               new_message=message)])
+    return runs
+
+
+def test_an_acknowledgement_does_not_win_and_the_hedge_fires():
+    slow, fast = Replica(name="prime", delay=1.0), Replica(name="prime", delay=0.05)
+    agent = ResilientRemoteA2aAgent(name="prime", replicas=[slow, fast], hedge_after=0.1)
+
+    [events] = asyncio.run(delegate(agent))
+    assert [event.content.parts[0].text for event in events] == ["submitted", "answer after 0.05"]
+    assert events[0].partial
+    assert (agent.stats.hedges, agent.stats.hedge_wins) == (1, 1)
+    assert len(agent.endpoint_latency(1)) == 1 and len(agent.endpoint_latency(0)) == 0
+
+
+def test_unmeasured_endpoints_keep_their_order_and_failing_ones_go_last():
+    down, up, spare = Replica(name="prime", fail=True), Replica(name="prime"), Replica(name="prime")
+    agent = ResilientRemoteA2aAgent(name="prime", replicas=[down, up, spare], failure_threshold=5)
+    assert agent._candidates() == [0, 1, 2]
+
+    runs = asyncio.run(delegate(agent, turns=3))
+    assert all(run[-1].content.parts[0].text == "answer after 0.0" for run in runs)
+    # One failover, then the failing endpoint is no longer tried first.
+    assert (down.calls, up.calls, spare.calls) == (1, 3, 0)
+    assert agent.stats.failovers == 1
+    assert agent._candidates() == [1, 2, 0]
+
+
+def test_fallback_answers_when_every_endpoint_fails():
+    fallback = Replica(name="prime", delay=0.0)
+    agent = ResilientRemoteA2aAgent(name="prime", replicas=[Replica(name="prime", fail=True)], fallback=fallback)
+    [events] = asyncio.run(delegate(agent))
+    assert events[-1].content.parts[0].text == "answer after 0.0"
+    assert agent.stats.fallbacks == 1 and fallback.calls == 1
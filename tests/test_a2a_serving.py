@@ -0,0 +1,157 @@
+"""build_a2a_app backpressure and drain, against a real uvicorn process."""
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+import uuid
+
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER = textwrap.dedent("""
+    import sys
+    import uvicorn
+    from google.adk.agents.llm_agent import LlmAgent
+    from fake_llm import FakeLlm
+    from adk_common.a2a_serving import build_a2a_app
+
+    port = int(sys.argv[1])
+    agent = LlmAgent(name="slow_agent", model=FakeLlm(text="done", latency=1.0))
+    app = build_a2a_app(agent, port=port, streaming=False, max_in_flight=2, drain_timeout=10, metrics=False)
+    uvicorn.run(app, host="localhost", port=port, log_level="warning")
+""")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def send(blocking: bool = True) -> dict:
+    return {
+        "jsonrpc": "2.0", "id": uuid.uuid4().hex, "method": "message/send",
+        "params": {
+            "message": {"kind": "message", "role": "user", "messageId": uuid.uuid4().hex,
+                        "parts": [{"kind": "text", "text": "hi"}]},
+            "configuration": {"blocking": blocking},
+        },
+    }
+
+
+@pytest.fixture
+def server():
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "benchmarks")]))
+    process = subprocess.Popen([sys.executable, "-W", "ignore", "-c", SERVER, str(port)], env=env)
+    url = f"http://localhost:{port}/"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{url}.well-known/agent-card.json").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("server did not start")
+            time.sleep(0.1)
+        yield process, url
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_background_tasks_count_towards_the_limit(server):
+    _, url = server
+
+    async def scenario():
+        async with httpx.AsyncClient(timeout=30) as client:
+            for _ in range(2):
+                response = await client.post(url, json=send(blocking=False))
+                assert response.status_code == 200
+            # Both non-blocking calls returned, but their tasks are still running.
+            assert (await client.post(url, json=send())).status_code == 429
+            await asyncio.sleep(1.5)
+            assert (await client.post(url, json=send())).status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_a_burst_is_admitted_up_to_the_limit(server):
+    _, url = server
+
+    async def scenario():
+        async with httpx.AsyncClient(timeout=30) as client:
+            responses = await asyncio.gather(*(client.post(url, json=send()) for _ in range(10)))
+            return sorted(response.status_code for response in responses)
+
+    assert asyncio.run(scenario()) == [200] * 2 + [429] * 8
+
+
+def test_tasks_can_be_polled_and_cancelled_at_capacity(server):
+    _, url = server
+
+    async def scenario():
+        async with httpx.AsyncClient(timeout=30) as client:
+            tasks = []
+            for _ in range(2):
+                response = await client.post(url, json=send(blocking=False))
+                tasks.append(response.json()["result"]["id"])
+            assert (await client.post(url, json=send())).status_code == 429
+
+            poll = {"jsonrpc": "2.0", "id": "1", "method": "tasks/get", "params": {"id": tasks[0]}}
+            polled = await client.post(url, json=poll)
+            assert polled.status_code == 200
+            assert polled.json()["result"]["id"] == tasks[0]
+
+            cancel = {"jsonrpc": "2.0", "id": "2", "method": "tasks/cancel", "params": {"id": tasks[1]}}
+            assert (await client.post(url, json=cancel)).status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_sigterm_drains_before_closing_the_listener(server):
+    process, url = server
+
+    async def scenario():
+        async with httpx.AsyncClient(timeout=30) as client:
+            running = asyncio.ensure_future(client.post(url, json=send()))
+            await asyncio.sleep(0.3)
+            process.send_signal(signal.SIGTERM)
+            await asyncio.sleep(0.2)
+            refused = await client.post(url, json=send())
+            assert refused.status_code == 503
+            assert refused.headers["Retry-After"] == "1"
+            finished = await running
+            assert finished.status_code == 200
+            assert finished.json()["result"]["status"]["state"] == "completed"
+
+    asyncio.run(scenario())
+    # uvicorn re-raises the signal once it has shut down.
+    assert process.wait(timeout=10) == -signal.SIGTERM
+
+
+@pytest.mark.parametrize("method, mode", [("message/stream", "SSE"), ("message/send", "NONE")])
+def test_only_message_stream_runs_with_sse(method, mode):
+    from a2a.server.agent_execution import RequestContext
+    from a2a.server.context import ServerCallContext
+    from a2a.types import Message, MessageSendParams, Part, Role, TextPart
+    from google.adk.a2a.converters.part_converter import convert_a2a_part_to_genai_part
+
+    from adk_common.a2a_serving import streaming_request_converter
+
+    message = Message(message_id="m1", role=Role.user, parts=[Part(root=TextPart(text="hi"))])
+    context = RequestContext(
+        request=MessageSendParams(message=message),
+        task_id="t1", context_id="c1",
+        call_context=ServerCallContext(state={"method": method}),
+    )
+    run_request = streaming_request_converter(context, convert_a2a_part_to_genai_part)
+    assert run_request.run_config.streaming_mode.name == mode
+    assert run_request.new_message.parts[0].text == "hi"
@@ -0,0 +1,43 @@
+import io
+import json
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def agent_modules(tmp_path, monkeypatch):
+    (tmp_path / "batch_echo_agent.py").write_text(
+        "from google.adk.agents.llm_agent import LlmAgent\n"
+        "from fake_llm import FakeLlm\n"
+        "root_agent = LlmAgent(name='echo', model=FakeLlm(text='pong'))\n"
+    )
+    (tmp_path / "batch_crashing_agent.py").write_text("import os\nos._exit(3)\n")
+    # The workers are forked and inherit the path.
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+def test_percentile_is_nearest_rank():
+    values = [0.4, 0.1, 0.3, 0.2]
+    assert main.percentile(values, 50) == 0.2
+    assert main.percentile(values, 99) == 0.4
+    assert main.percentile(values, 0) == 0.1
+    assert main.percentile([], 50) != main.percentile([], 50)  # nan
+
+
+def test_a_dead_worker_does_not_hang_the_batch(agent_modules):
+    sessions = [
+        {"id": "crash", "agent": "batch_crashing_agent:root_agent", "queries": ["ping"]},
+        {"id": "ok-1", "agent": "batch_echo_agent:root_agent", "queries": ["ping", "ping"]},
+        {"id": "ok-2", "agent": "batch_echo_agent:root_agent", "queries": ["ping"]},
+    ]
+    output = io.StringIO()
+    results = main.run_batch(sessions, output, workers=2, concurrency=1)
+
+    by_id = {result["id"]: result for result in results}
+    assert sorted(by_id) == ["crash", "ok-1", "ok-2"]
+    assert by_id["crash"]["error"] == "Worker exited before finishing the session"
+    assert [turn["response"] for turn in by_id["ok-1"]["turns"]] == ["pong", "pong"]
+    assert by_id["ok-2"]["error"] is None
+    assert [json.loads(line)["id"] for line in output.getvalue().splitlines()] == [result["id"] for result in results]
@@ -0,0 +1,74 @@
+import re
+from types import SimpleNamespace
+
+from qdrant_rag.chunking import Chunk, chunk_payload, chunk_text, chunk_window, collapse_hits
+
+TEXT = " ".join(f"w{n}" for n in range(20))  # "w0 w1 ... w19"
+
+
+def word_tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False):
+    """Stands in for a fast tokenizer: one token per word."""
+    return {"offset_mapping": [match.span() for match in re.finditer(r"\S+", text)]}
+
+
+def point(id, score, doc_id=None, text="", chunk=None):
+    payload = {"origin_text": text}
+    if doc_id is not None:
+        payload.update(doc_id=doc_id, chunk_index=chunk.index, char_start=chunk.start, char_end=chunk.end)
+    return SimpleNamespace(id=id, score=score, payload=payload)
+
+
+def test_short_documents_are_one_chunk():
+    assert chunk_text("a b c", word_tokenizer, max_tokens=3) == [Chunk(index=0, text="a b c", start=0, end=5)]
+
+
+def test_windows_overlap_and_slice_the_document():
+    chunks = chunk_text(TEXT, word_tokenizer, max_tokens=8, overlap=2)
+    assert [chunk.text.split() for chunk in chunks] == [
+        [f"w{n}" for n in range(0, 8)],
+        [f"w{n}" for n in range(6, 14)],
+        [f"w{n}" for n in range(12, 20)],
+    ]
+    assert [chunk.index for chunk in chunks] == [0, 1, 2]
+    assert all(TEXT[chunk.start:chunk.end] == chunk.text for chunk in chunks)
+    assert chunks[-1].end == len(TEXT)
+
+
+def test_overlap_is_capped_below_the_window():
+    chunks = chunk_text(TEXT, word_tokenizer, max_tokens=5, overlap=10)
+    assert [chunk.text.split()[0] for chunk in chunks][:3] == ["w0", "w1", "w2"]
+    assert chunks[-1].text.split()[-1] == "w19"
+
+
+def test_chunk_window_and_payload():
+    assert chunk_window(SimpleNamespace(max_seq_length=256)) == 254
+    assert chunk_window(SimpleNamespace(max_seq_length=None)) == 254
+    chunk = Chunk(index=1, text="w6 w7", start=18, end=23)
+    assert chunk_payload(chunk, "doc", 3, {"source": "faq"}) == {
+        "origin_text": "w6 w7", "doc_id": "doc", "chunk_index": 1, "chunk_count": 3,
+        "char_start": 18, "char_end": 23, "source": "faq",
+    }
+
+
+def test_collapse_hits_stitches_chunks_per_document():
+    chunks = chunk_text(TEXT, word_tokenizer, max_tokens=4, overlap=1)  # w0-3, w3-6, w6-9, ...
+    points = [
+        point(1, 0.9, "doc-a", chunks[1].text, chunks[1]),
+        point(2, 0.8, text="an unchunked document"),
+        point(3, 0.7, "doc-a", chunks[0].text, chunks[0]),
+        point(4, 0.6, "doc-a", chunks[3].text, chunks[3]),
+        point(5, 0.5, "doc-b", "other", Chunk(index=0, text="other", start=0, end=5)),
+    ]
+
+    results = collapse_hits(points, limit=2)
+    assert results == [
+        {"doc_id": "doc-a", "score": 0.9, "text": "w0 w1 w2 w3 w4 w5 w6 ... w9 w10 w11 w12"},
+        {"doc_id": "2", "score": 0.8, "text": "an unchunked document"},
+    ]
+    assert [result["doc_id"] for result in collapse_hits(points, limit=5)] == ["doc-a", "2", "doc-b"]
+
+
+def test_collapse_hits_joins_adjacent_chunks_without_overlap():
+    chunks = chunk_text(TEXT, word_tokenizer, max_tokens=4, overlap=0)  # w0-3, w4-7, w8-11, ...
+    points = [point(n, 1.0 - n / 10, "doc", chunks[n].text, chunks[n]) for n in (1, 0, 2)]
+    assert collapse_hits(points, limit=1)[0]["text"] == " ".join(f"w{n}" for n in range(12))
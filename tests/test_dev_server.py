@@ -0,0 +1,29 @@
+import json
+import sys
+
+from fastapi.testclient import TestClient
+from google.adk.cli import fast_api
+from google.adk.cli.utils.agent_loader import AgentLoader
+
+from adk_common.dev_server import create_dev_app
+
+
+def test_lists_manifest_agents_without_patching_adk(tmp_path):
+    package = tmp_path / "lazy_agent"
+    package.mkdir()
+    (package / "__init__.py").write_text("raise RuntimeError('imported')\n")
+    (package / "agent_manifest.json").write_text(json.dumps({
+        "root_agent_name": "lazy_agent", "description": "Never imported", "entry_point": "lazy_agent.agent:root_agent",
+    }))
+    # ADK's own loader would list this directory too.
+    (tmp_path / "helpers").mkdir()
+    (tmp_path / "helpers" / "agent.py").write_text("")
+
+    app = create_dev_app(str(tmp_path), web=False, metrics=False)
+    assert fast_api.AgentLoader is AgentLoader
+
+    with TestClient(app) as client:
+        assert client.get("/list-apps").json() == ["lazy_agent"]
+        detailed = client.get("/list-apps", params={"detailed": "true"}).json()
+        assert detailed["apps"][0]["description"] == "Never imported"
+    assert "lazy_agent" not in sys.modules
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_common.guardrails import SpeculativeGuardrail
+from fake_llm import FakeLlm
+
+
+def run_turn(guard: SpeculativeGuardrail, text: str):
+    agent = LlmAgent(
+        name="guarded",
+        model=guard.wrap(FakeLlm(text="The answer.", latency=0.05)),
+        before_model_callback=guard.before_model_callback,
+    )
+    runner = InMemoryRunner(agent=agent, app_name="guardrail_test")
+
+    async def scenario():
+        session = await runner.session_service.create_session(app_name="guardrail_test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text=text)])
+        events = [event async for event in runner.run_async(user_id="u", session_id=session.id,
+                                                            new_message=message)]
+        session = await runner.session_service.get_session(app_name="guardrail_test", user_id="u",
+                                                           session_id=session.id)
+        return events[-1].content.parts[0].text, session.state
+
+    return asyncio.run(scenario())
+
+
+def test_sync_checks_run_on_the_loop_and_can_write_state():
+    threads = {}
+
+    def keyword_check(callback_context, llm_request):
+        threads["keyword"] = threading.current_thread()
+        if "forbidden" in llm_request.contents[-1].parts[0].text:
+            callback_context.state["guardrail_triggered"] = True
+            return LlmResponse(content=types.Content(role="model", parts=[types.Part(text="Blocked.")]))
+        return None
+
+    def length_check(callback_context, llm_request):
+        threads["length"] = threading.current_thread()
+        return None
+
+    guard = SpeculativeGuardrail([keyword_check, length_check], threaded=[length_check])
+    assert run_turn(guard, "hello") == ("The answer.", {})
+    assert threads["keyword"] is threading.main_thread()
+    assert threads["length"] is not threading.main_thread()
+
+    answer, state = run_turn(guard, "something forbidden")
+    assert answer == "Blocked."
+    assert state["guardrail_triggered"] is True
+    assert (guard.stats.calls, guard.stats.blocked, guard.stats.cancelled_model_calls) == (2, 1, 1)
+
+
+def test_async_checks_run_concurrently_with_the_model():
+    async def slow_check(callback_context, llm_request):
+        await asyncio.sleep(0.02)
+        return None
+
+    guard = SpeculativeGuardrail([slow_check])
+    assert run_turn(guard, "hello")[0] == "The answer."
+    assert guard.stats.blocked == 0
+    # The check finished before the 50 ms model call, so the output was never held back.
+    assert guard.stats.check_seconds >= 0.02
+    assert guard.stats.waited_seconds == 0
@@ -0,0 +1,72 @@
+import asyncio
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_common import llm_registry
+from adk_common.llm_registry import DEFAULT_MAX_CONCURRENCY, FairLimiter, _LimitedMixin
+from fake_llm import FakeLlm, ToolCallingLlm
+
+
+class LimitedToolCallingLlm(_LimitedMixin, ToolCallingLlm):
+    _additional_args: dict = None
+
+
+class LimitedFakeLlm(_LimitedMixin, FakeLlm):
+    _additional_args: dict = None
+
+
+def test_limiter_serves_keys_round_robin():
+    async def scenario():
+        limiter = FairLimiter(1)
+        order = []
+        await limiter.acquire("holder")
+
+        async def call(key, n):
+            await limiter.acquire(key)
+            order.append(f"{key}{n}")
+            limiter.release()
+
+        waiters = [asyncio.ensure_future(call("a", n)) for n in range(3)]
+        waiters.append(asyncio.ensure_future(call("b", 0)))
+        await asyncio.sleep(0)
+        assert limiter.stats.waiting == 4
+        limiter.release()
+        await asyncio.gather(*waiters)
+        return order, limiter.stats
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["a0", "b0", "a1", "a2"]
+    assert (stats.calls, stats.queued, stats.in_flight, stats.waiting) == (5, 4, 0, 0)
+
+
+def test_delegations_do_not_deadlock_at_the_default_limit(monkeypatch):
+    monkeypatch.delenv("OLLAMA_MAX_CONCURRENCY", raising=False)
+    monkeypatch.delenv("LLM_MAX_CONCURRENCY", raising=False)
+    monkeypatch.setattr(llm_registry, "_limiters", {})
+    sessions = DEFAULT_MAX_CONCURRENCY["ollama"] * 3
+
+    parent = LlmAgent(
+        name="parent",
+        model=LimitedToolCallingLlm(model="ollama_chat/fake", latency=0.01,
+                                    calls=[("transfer_to_agent", {"agent_name": "child"})]),
+        sub_agents=[LlmAgent(name="child", model=LimitedFakeLlm(model="ollama_chat/fake", latency=0.01,
+                                                                text="Hi from the child."))],
+    )
+    runner = InMemoryRunner(agent=parent, app_name="limiter_test")
+
+    async def delegate():
+        session = await runner.session_service.create_session(app_name="limiter_test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text="hello")])
+        events = [event async for event in runner.run_async(user_id="u", session_id=session.id,
+                                                            new_message=message)]
+        return events[-1].author, events[-1].content.parts[0].text
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(*(delegate() for _ in range(sessions))), timeout=10)
+
+    assert asyncio.run(scenario()) == [("child", "Hi from the child.")] * sessions
+    stats = llm_registry.llm_backend_stats()["ollama"]
+    assert stats.calls == 2 * sessions
+    assert stats.in_flight == 0 and stats.waiting == 0
@@ -0,0 +1,129 @@
+import asyncio
+import gc
+import socket
+import urllib.request
+
+import pytest
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_common.metrics import (
+    INVOCATIONS, INVOCATIONS_IN_FLIGHT, MetricsPlugin, MetricsRegistry, REGISTRY, start_metrics_server,
+)
+from adk_common.response_cache import LlmResponseCache, response_cache_stats
+from fake_llm import FakeLlm
+
+
+def test_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("method", "path"))
+    in_flight = registry.gauge("in_flight", "Running.")
+    latency = registry.histogram("latency_seconds", "Latency.", ("method",), buckets=(0.1, 1.0))
+    requests.inc("GET", 'a "quoted"\\path\n', amount=2)
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    for seconds in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(seconds, "GET")
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{method="GET",path="a \\"quoted\\"\\\\path\\n"} 2',
+        "# HELP in_flight Running.",
+        "# TYPE in_flight gauge",
+        "in_flight 1",
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{method="GET",le="0.1"} 1',
+        'latency_seconds_bucket{method="GET",le="1.0"} 3',
+        'latency_seconds_bucket{method="GET",le="+Inf"} 4',
+        'latency_seconds_sum{method="GET"} 4.05',
+        'latency_seconds_count{method="GET"} 4',
+    ]
+
+
+def test_failing_collectors_do_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.counter("up", "Up.").inc()
+    registry.collectors.append(lambda: 1 / 0)
+    assert registry.render().endswith("up 1\n")
+
+
+class BrokenLlm(BaseLlm):
+    model: str = "broken"
+
+    async def generate_content_async(self, llm_request, stream: bool = False):
+        raise RuntimeError("model server down")
+        yield
+
+
+async def run(app_name: str, model, stop_early: bool = False):
+    runner = InMemoryRunner(agent=LlmAgent(name="agent", model=model), app_name=app_name, plugins=[MetricsPlugin()])
+    session = await runner.session_service.create_session(app_name=app_name, user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="hi")])
+    events = runner.run_async(user_id="u", session_id=session.id, new_message=message)
+    async for _ in events:
+        if stop_early:
+            break
+    await events.aclose()
+
+
+@pytest.mark.parametrize("case", ["completes", "raises", "consumer stops early"])
+def test_invocations_leave_the_in_flight_gauge(case):
+    app_name = f"metrics_test_{case.replace(' ', '_')}"
+    model = BrokenLlm() if case == "raises" else FakeLlm(text="hello")
+    try:
+        asyncio.run(run(app_name, model, stop_early=case == "consumer stops early"))
+    except RuntimeError as e:
+        assert case == "raises" and "model server down" in str(e)
+    gc.collect()
+    assert INVOCATIONS.values[(app_name,)] == 1
+    assert INVOCATIONS_IN_FLIGHT.values[(app_name,)] == 0
+
+
+def test_forgets_the_oldest_invocations_beyond_the_limit():
+    plugin = MetricsPlugin()
+    plugin.max_pending_invocations = 2
+    contexts = [type("Context", (), {"invocation_id": f"inv-{i}", "app_name": "metrics_test_limit"})()
+                for i in range(3)]
+
+    async def scenario():
+        for context in contexts:
+            await plugin.before_run_callback(invocation_context=context)
+
+    asyncio.run(scenario())
+    assert list(plugin._running) == ["inv-1", "inv-2"]
+    assert INVOCATIONS_IN_FLIGHT.values[("metrics_test_limit",)] == 2
+
+
+def test_response_cache_totals_never_go_down():
+    cache = LlmResponseCache()
+    cache.stats.lookups += 5
+    cache.stats.hits += 2
+    before = response_cache_stats()
+    del cache
+    gc.collect()
+    after = response_cache_stats()
+    assert (after.lookups, after.hits) == (before.lookups, before.hits)
+
+
+def test_metrics_port_serves_and_a_busy_port_is_skipped():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = start_metrics_server(port, host="127.0.0.1")
+    assert server is not None
+    assert start_metrics_server(port, host="127.0.0.1") is server
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE adk_invocations_total counter" in response.read().decode()
+
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        assert start_metrics_server(busy.getsockname()[1], host="127.0.0.1", registry=REGISTRY) is None
+    server.shutdown()
+    server.server_close()
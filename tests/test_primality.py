@@ -0,0 +1,80 @@
+import random
+
+from adk_common import primality
+from adk_common.primality import find_primes, is_prime, small_primes
+
+
+def trial_division(n: int) -> bool:
+    if n < 2:
+        return False
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            return False
+        d += 1
+    return True
+
+
+def test_small_numbers_match_trial_division():
+    assert [n for n in range(-5, 2000) if is_prime(n)] == [n for n in range(-5, 2000) if trial_division(n)]
+    assert small_primes(30).tolist() == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert small_primes(2).tolist() == []
+
+
+def test_large_primes_and_composites():
+    assert is_prime(2**61 - 1)  # Mersenne prime
+    assert is_prime(18446744073709551557)  # largest prime below 2**64
+    assert not is_prime(2**61 + 1)
+    # Strong pseudoprimes to several of the first prime bases.
+    assert not is_prime(3215031751)
+    assert not is_prime(3825123056546413051)
+    # The smallest strong pseudoprimes to the first twelve and thirteen prime bases.
+    assert 399165290221 * 798330580441 == 318665857834031151167461
+    assert not is_prime(318665857834031151167461)
+    assert not is_prime(3317044064679887385961981)
+    assert not is_prime(65537 * 65539)  # product of two primes above the table
+
+
+def test_baillie_psw_above_the_deterministic_range():
+    for exponent in (89, 107, 127, 521):  # Mersenne primes
+        assert is_prime(2**exponent - 1)
+    assert not is_prime(2**101 - 1)  # 7432339208719 * 341117531003194129
+    assert not is_prime((2**61 - 1) * (2**89 - 1))
+    assert not is_prime((2**89 - 1) ** 2)
+    # The strong Lucas half alone lets these composites through; base 2 catches them.
+    lucas_pseudoprimes = [5459, 5777, 10877, 16109, 18971]
+    assert [n for n in range(3, 20000, 2) if primality._strong_lucas(n) != trial_division(n)] == lucas_pseudoprimes
+
+
+def test_random_values_around_the_table_limit():
+    rng = random.Random(0)
+    limit = primality.SMALL_PRIME_LIMIT
+    values = [rng.randrange(limit - 5000, limit + 50000) for _ in range(2000)]
+    assert [n for n in values if is_prime(n)] == [n for n in values if trial_division(n)]
+
+
+def test_find_primes_keeps_first_appearance_order_and_drops_duplicates():
+    assert find_primes([10, 7, 2, 7, -3, 0, 1, 13, 2]) == [7, 2, 13]
+    assert find_primes([]) == []
+    assert find_primes([0, 1, -7]) == []
+
+
+def test_sieved_and_miller_rabin_batches_agree():
+    rng = random.Random(1)
+    dense = [rng.randrange(10**9, 10**9 + 100_000) for _ in range(5000)]
+    sparse = [rng.randrange(2, 10**15) for _ in range(500)]
+    assert primality._sieve_is_cheaper(min(dense), max(dense), len(set(dense)))
+    assert not primality._sieve_is_cheaper(2, max(sparse), len(sparse))
+    for batch in (dense, sparse, dense + sparse):
+        assert find_primes(batch) == [n for n in dict.fromkeys(batch) if is_prime(n)]
+
+
+def test_sieve_is_only_chosen_when_cheaper():
+    # A dense batch of small numbers is sieved...
+    assert primality._sieve_is_cheaper(primality.SMALL_PRIME_LIMIT, 10**6, 100_000)
+    # ...but not a few numbers whose window needs a long list of base primes.
+    assert not primality._sieve_is_cheaper(10**12 + 39, 10**12 + 39, 1)
+    assert not primality._sieve_is_cheaper(10**12, 10**12 + (1 << 18), 100)
+    assert not primality._sieve_is_cheaper(10**12, 10**12 + (1 << 26), 100_000)
+    # Below the table limit every check is a lookup.
+    assert not primality._sieve_is_cheaper(2, 1000, 1000)
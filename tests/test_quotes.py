@@ -0,0 +1,131 @@
+"""QuoteProvider and the stock tools against agent_ollama/quote_fixture_server.py."""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from agent_ollama.quote_fixture_server import DEFAULT_PRICES
+from agent_ollama.quotes import HttpQuoteSource, QuoteProvider, set_provider
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def fixture_url():
+    port = free_port()
+    server = subprocess.Popen([
+        sys.executable, os.path.join(ROOT, "agent_ollama", "quote_fixture_server.py"),
+        "--port", str(port), "--delay", "0.05",
+    ])
+    url = f"http://localhost:{port}"
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                httpx.get(f"{url}/quote/AAPL")
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        yield url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+class CountingSource(HttpQuoteSource):
+    def __init__(self, base_url: str):
+        super().__init__(base_url)
+        self.calls = 0
+
+    async def fetch(self, ticker):
+        self.calls += 1
+        return await super().fetch(ticker)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_prices_are_cached_until_the_ttl_expires(fixture_url):
+    async def scenario():
+        clock = FakeClock()
+        source = CountingSource(fixture_url)
+        provider = QuoteProvider(source, ttl=30, clock=clock)
+        assert await provider.get_price("aapl") == DEFAULT_PRICES["AAPL"]
+        assert await provider.get_price(" AAPL ") == DEFAULT_PRICES["AAPL"]
+        assert source.calls == 1
+        clock.now = 31
+        assert await provider.get_price("AAPL") == DEFAULT_PRICES["AAPL"]
+        assert source.calls == 2
+        await source.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_lookups_share_one_fetch(fixture_url):
+    async def scenario():
+        source = CountingSource(fixture_url)
+        provider = QuoteProvider(source)
+        prices = await asyncio.gather(*(provider.get_price("MSFT") for _ in range(20)))
+        assert prices == [DEFAULT_PRICES["MSFT"]] * 20
+        assert source.calls == 1
+        await source.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_tickers_are_none_and_not_cached(fixture_url):
+    async def scenario():
+        source = CountingSource(fixture_url)
+        provider = QuoteProvider(source)
+        assert await provider.get_price("NOPE") is None
+        assert await provider.get_price("NOPE") is None
+        assert source.calls == 2
+        await source.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_unreachable_source_returns_none():
+    async def scenario():
+        source = HttpQuoteSource(f"http://localhost:{free_port()}", timeout=1)
+        assert await source.fetch("AAPL") is None
+        await source.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_batch_tool_survives_bad_tickers(fixture_url):
+    from agent_ollama.agent import get_stock_prices
+
+    async def scenario():
+        source = HttpQuoteSource(fixture_url)
+        set_provider(QuoteProvider(source))
+        try:
+            return await get_stock_prices(["aapl", "NOPE", "nvda", "AAPL"])
+        finally:
+            set_provider(None)
+            await source.aclose()
+
+    assert asyncio.run(scenario()) == {"prices": [
+        {"ticker": "AAPL", "price": DEFAULT_PRICES["AAPL"]},
+        {"ticker": "NOPE", "price": "Price not available"},
+        {"ticker": "NVDA", "price": DEFAULT_PRICES["NVDA"]},
+    ]}
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+
+import numpy as np
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from adk_common.response_cache import LlmResponseCache
+
+WEATHER = types.Tool(function_declarations=[types.FunctionDeclaration(name="get_weather", description="Weather")])
+TIME = types.Tool(function_declarations=[types.FunctionDeclaration(name="get_time", description="Time")])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def context(invocation_id: str = "inv-1", **state):
+    return SimpleNamespace(invocation_id=invocation_id, state=state)
+
+
+def user(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def request(*contents, tools=(WEATHER,), instruction="Be brief.") -> LlmRequest:
+    return LlmRequest(
+        model="fake",
+        contents=list(contents),
+        config=types.GenerateContentConfig(system_instruction=instruction, tools=list(tools)),
+    )
+
+
+def text_response(text: str) -> LlmResponse:
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def call_response(city: str, call_id: str = "adk-1") -> LlmResponse:
+    call = types.FunctionCall(id=call_id, name="get_weather", args={"city": city})
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+
+
+def store(cache, llm_request, response, ctx=None):
+    ctx = ctx or context()
+    assert cache.before_model_callback(ctx, llm_request) is None
+    cache.after_model_callback(ctx, response)
+
+
+def test_key_ignores_tool_order_and_call_ids_but_not_instructions_or_state():
+    cache = LlmResponseCache(state_keys=["unit"])
+
+    def call(call_id):
+        return types.Content(role="model", parts=[types.Part(
+            function_call=types.FunctionCall(id=call_id, name="get_weather", args={"city": "Oslo"}))])
+
+    def history(call_id):
+        return request(user("Weather in Oslo?"), call(call_id), user("Thanks"), tools=(WEATHER, TIME))
+
+    key, prefix = cache._keys(context(unit="C"), history("adk-1"))
+    assert cache._keys(context(unit="C"), history("adk-2")) == (key, prefix)
+    reordered = request(user("Weather in Oslo?"), call("adk-1"), user("Thanks"), tools=(TIME, WEATHER))
+    assert cache._keys(context(unit="C"), reordered) == (key, prefix)
+
+    assert cache._keys(context(unit="F"), history("adk-1"))[0] != key
+    other_instruction = request(user("Weather in Oslo?"), call("adk-1"), user("Thanks"),
+                                tools=(WEATHER, TIME), instruction="Be verbose.")
+    assert cache._keys(context(unit="C"), other_instruction)[0] != key
+    # Only the last message differs: same prefix, different key.
+    other_last = request(user("Weather in Oslo?"), call("adk-1"), user("Bye"), tools=(WEATHER, TIME))
+    other_key, other_prefix = cache._keys(context(unit="C"), other_last)
+    assert other_key != key and other_prefix == prefix
+
+
+def test_exact_hits_replay_function_calls_without_ids():
+    cache = LlmResponseCache()
+    store(cache, request(user("Weather in Oslo?")), call_response("Oslo"))
+
+    hit = cache.before_model_callback(context("inv-2"), request(user("Weather in Oslo?")))
+    assert hit.content.parts[0].function_call.args == {"city": "Oslo"}
+    assert hit.content.parts[0].function_call.id is None
+    assert (cache.stats.hits, cache.stats.stores) == (1, 1)
+
+
+def test_entries_expire_and_the_least_recently_used_is_evicted():
+    clock = Clock()
+    cache = LlmResponseCache(ttl=10, max_size=2, clock=clock)
+    for text in ("a", "b"):
+        store(cache, request(user(text)), text_response(text.upper()), context(text))
+    assert cache.before_model_callback(context(), request(user("a"))).content.parts[0].text == "A"
+    store(cache, request(user("c")), text_response("C"), context("c"))
+    assert cache.stats.evictions == 1
+    assert cache.before_model_callback(context(), request(user("b"))) is None
+
+    clock.now = 11
+    assert cache.before_model_callback(context(), request(user("a"))) is None
+
+
+def test_time_sensitive_tool_results_bypass_the_cache():
+    cache = LlmResponseCache(bypass_tools=["get_time"])
+    result = types.Content(role="user", parts=[types.Part(
+        function_response=types.FunctionResponse(name="get_time", response={"time": "12:00"}))])
+    assert cache.before_model_callback(context(), request(user("Time?"), result)) is None
+    cache.after_model_callback(context(), text_response("It is noon."))
+    assert (cache.stats.bypassed, cache.stats.lookups, cache.stats.stores) == (1, 0, 0)
+
+
+def test_partial_and_error_responses_are_not_stored():
+    cache = LlmResponseCache()
+    cache.before_model_callback(context(), request(user("Hi")))
+    cache.after_model_callback(context(), LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text="Hel")]), partial=True))
+    cache.after_model_callback(context(), LlmResponse(error_code="500", error_message="boom"))
+    assert cache.stats.stores == 0
+
+
+def fake_encode(texts):
+    # Questions about the same city land on the same vector.
+    vectors = {"oslo": [1.0, 0.0], "paris": [0.0, 1.0]}
+    return np.array([next(v for city, v in vectors.items() if city in text.lower()) for text in texts])
+
+
+def test_semantic_hits_serve_text_answers_only():
+    cache = LlmResponseCache(encode=fake_encode)
+    store(cache, request(user("What's the weather in Oslo?")), text_response("Cold."), context("a"))
+    store(cache, request(user("Weather in Paris please")), call_response("Paris"), context("b"))
+
+    hit = cache.before_model_callback(context("c"), request(user("How is Oslo's weather today?")))
+    assert hit.content.parts[0].text == "Cold."
+    # A tool-calling answer is not replayed for a differently worded question...
+    assert cache.before_model_callback(context("d"), request(user("Is it raining in Paris?"))) is None
+    # ...only for the exact same request.
+    exact = cache.before_model_callback(context("e"), request(user("Weather in Paris please")))
+    assert exact.content.parts[0].function_call.args == {"city": "Paris"}
+    assert (cache.stats.semantic_hits, cache.stats.hits) == (1, 1)
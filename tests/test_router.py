@@ -0,0 +1,108 @@
+import asyncio
+
+import numpy as np
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_common.router import EmbeddingClassifier, IntentRouter
+from agent_team.reception_agents import RECEPTION_ROUTES
+from fake_llm import FakeLlm
+
+VOCABULARY = ["hello", "hi", "morning", "bye", "later", "goodbye", "weather", "rain"]
+
+
+def bag_of_words(texts):
+    return np.array([[text.split().count(word) + 0.01 for word in VOCABULARY] for text in texts])
+
+
+class CountingLlm(FakeLlm):
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
+
+
+def test_reception_routes():
+    router = IntentRouter(RECEPTION_ROUTES)
+    assert router.route("Hello there!") == "greeting_agent"
+    assert router.route("hi, I'm Sam") == "greeting_agent"
+    assert router.route("Good morning") == "greeting_agent"
+    assert router.route("Thanks, bye now.") == "farewell_agent"
+    assert router.route("See you later") == "farewell_agent"
+    assert router.route("Hello, what's the weather in Paris?") is None
+    assert router.route("bye") == "farewell_agent"
+    assert router.route("") is None
+    assert router.route("?!") is None
+
+
+def test_long_messages_go_to_the_model():
+    router = IntentRouter({"greeting_agent": [r"hello.*"]}, max_words=3)
+    assert router.route("hello you two") == "greeting_agent"
+    assert router.route("hello you two over there") is None
+
+
+def test_classifier_is_used_when_no_pattern_matches():
+    examples = {"greeting_agent": ["hello", "hi", "good morning"], "farewell_agent": ["bye", "goodbye", "see you later"]}
+    classifier = EmbeddingClassifier(examples, bag_of_words, threshold=0.5)
+    assert classifier.classify("hello hello")[0] == "greeting_agent"
+    label, score = classifier.classify("rain weather")
+    assert label is None and score < 0.5
+
+    router = IntentRouter({"farewell_agent": [r"ciao"]}, classifier=classifier)
+    assert router.route("ciao") == "farewell_agent"
+    assert router.route("hi") == "greeting_agent"
+    assert router.route("rain") is None
+
+
+def run_turns(router, messages):
+    coordinator_model = CountingLlm(text="It is sunny.")
+    coordinator = LlmAgent(
+        name="coordinator",
+        model=coordinator_model,
+        sub_agents=[
+            LlmAgent(name="greeting_agent", model=FakeLlm(text="Hi!")),
+            LlmAgent(name="farewell_agent", model=FakeLlm(text="Goodbye!")),
+        ],
+        before_model_callback=router.before_model_callback,
+        after_model_callback=router.after_model_callback,
+    )
+    runner = InMemoryRunner(agent=coordinator, app_name="router_test")
+
+    async def scenario():
+        answers = []
+        for text in messages:
+            session = await runner.session_service.create_session(app_name="router_test", user_id="u")
+            message = types.Content(role="user", parts=[types.Part(text=text)])
+            events = [event async for event in runner.run_async(user_id="u", session_id=session.id,
+                                                                new_message=message)]
+            answers.append((events[-1].author, events[-1].content.parts[0].text))
+        return answers
+
+    return asyncio.run(scenario()), coordinator_model.calls
+
+
+def test_routed_turns_skip_the_coordinator_model():
+    router = IntentRouter(RECEPTION_ROUTES)
+    answers, coordinator_calls = run_turns(router, ["Hello!", "What's the weather?", "bye"])
+
+    assert answers == [
+        ("greeting_agent", "Hi!"),
+        ("coordinator", "It is sunny."),
+        ("farewell_agent", "Goodbye!"),
+    ]
+    assert coordinator_calls == 1
+    assert router.stats.turns == 3
+    assert router.stats.routed == {"greeting_agent": 1, "farewell_agent": 1}
+    assert router.stats.fallback_model_calls == 1
+    assert router.stats.saved_model_seconds >= 0
+
+
+def test_routes_to_unknown_agents_fall_through():
+    router = IntentRouter({"billing_agent": [r"hello"]})
+    answers, coordinator_calls = run_turns(router, ["hello"])
+    assert answers == [("coordinator", "It is sunny.")]
+    assert coordinator_calls == 1
+    assert router.stats.routed == {}
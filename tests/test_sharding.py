@@ -0,0 +1,56 @@
+from collections import Counter
+
+from adk_common.sharding import HashRing, session_key
+
+KEYS = [session_key("app", f"user-{n % 50}", f"session-{n}") for n in range(5000)]
+
+
+def owners(ring: HashRing) -> dict:
+    return {key: ring.node_for(key) for key in KEYS}
+
+
+def test_placement_is_deterministic_and_balanced():
+    ring = HashRing(range(4))
+    placement = owners(ring)
+    assert placement == owners(HashRing([3, 1, 0, 2]))
+    assert ring.nodes == {0, 1, 2, 3}
+
+    load = Counter(placement.values())
+    assert set(load) == {0, 1, 2, 3}
+    assert max(load.values()) < 2 * len(KEYS) / 4
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing(range(4))
+    before = owners(ring)
+    ring.add(4)
+    after = owners(ring)
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+    assert moved and all(after[key] == 4 for key in moved)
+    assert len(moved) < 2 * len(KEYS) / 5
+
+
+def test_removing_a_node_only_moves_its_keys():
+    ring = HashRing(range(4))
+    before = owners(ring)
+    ring.remove(2)
+    after = owners(ring)
+
+    assert ring.nodes == {0, 1, 3}
+    assert all(after[key] != 2 for key in KEYS)
+    assert all(before[key] == after[key] for key in KEYS if before[key] != 2)
+    # Adding it back restores the original placement.
+    ring.add(2)
+    assert owners(ring) == before
+
+
+def test_empty_ring_raises():
+    ring = HashRing([0])
+    ring.remove(0)
+    try:
+        ring.node_for("key")
+    except LookupError:
+        pass
+    else:
+        raise AssertionError("an empty ring returned a node")
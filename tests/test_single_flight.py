@@ -0,0 +1,143 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+from adk_common.single_flight import CachedFunctionTool, cached_tool, single_flight_stats
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def context(user_id: str = "alice"):
+    return SimpleNamespace(user_id=user_id, function_call_id="call-1")
+
+
+def test_identical_calls_run_once_and_results_expire():
+    calls = []
+
+    async def lookup(city: str) -> dict:
+        calls.append(city)
+        await asyncio.sleep(0.01)
+        return {"city": city, "temp": len(calls)}
+
+    clock = Clock()
+    tool = CachedFunctionTool(lookup, ttl=10, clock=clock)
+
+    async def scenario():
+        results = await asyncio.gather(*(tool.run_async(args={"city": "Paris"}, tool_context=context())
+                                         for _ in range(5)))
+        assert results == [{"city": "Paris", "temp": 1}] * 5
+        assert await tool.run_async(args={"city": "Paris"}, tool_context=context()) == {"city": "Paris", "temp": 1}
+        clock.now = 11
+        assert await tool.run_async(args={"city": "Paris"}, tool_context=context()) == {"city": "Paris", "temp": 2}
+
+    asyncio.run(scenario())
+    assert calls == ["Paris", "Paris"]
+    assert (tool.stats.invocations, tool.stats.coalesced, tool.stats.cache_hits) == (2, 4, 1)
+
+
+def test_callers_get_copies_of_cached_results():
+    async def lookup(city: str) -> dict:
+        return {"tags": [city]}
+
+    tool = cached_tool(lookup)
+
+    async def scenario():
+        first = await tool.run_async(args={"city": "Oslo"}, tool_context=context())
+        first["tags"].append("mutated")
+        return await tool.run_async(args={"city": "Oslo"}, tool_context=context())
+
+    assert asyncio.run(scenario()) == {"tags": ["Oslo"]}
+
+
+def test_functions_with_tool_context_need_a_scope():
+    def notes(query: str, tool_context) -> str:
+        return f"{tool_context.user_id}:{query}"
+
+    try:
+        cached_tool(notes)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a tool_context function was cached without a scope")
+
+    tool = cached_tool(notes, scope=lambda ctx: ctx.user_id)
+
+    async def scenario():
+        assert await tool.run_async(args={"query": "q"}, tool_context=context("alice")) == "alice:q"
+        assert await tool.run_async(args={"query": "q"}, tool_context=context("bob")) == "bob:q"
+
+    asyncio.run(scenario())
+    assert tool.stats.invocations == 2
+
+
+def test_invalidate_drops_one_scope():
+    runs = []
+
+    def notes(query: str, tool_context) -> str:
+        runs.append(tool_context.user_id)
+        return query
+
+    tool = cached_tool(notes, scope=lambda ctx: ctx.user_id)
+
+    async def scenario():
+        for user in ("alice", "bob"):
+            await tool.run_async(args={"query": "q"}, tool_context=context(user))
+        tool.invalidate("alice")
+        for user in ("alice", "bob"):
+            await tool.run_async(args={"query": "q"}, tool_context=context(user))
+
+    asyncio.run(scenario())
+    assert runs == ["alice", "bob", "alice"]
+
+
+def test_invalidate_during_a_call_keeps_its_stale_result_out():
+    data = {"value": "old"}
+    started = None
+
+    async def read(key: str) -> str:
+        value = data["value"]
+        started.set()
+        await asyncio.sleep(0.05)
+        return value
+
+    tool = cached_tool(read, ttl=60)
+
+    async def scenario():
+        nonlocal started
+        started = asyncio.Event()
+        running = asyncio.ensure_future(tool.run_async(args={"key": "k"}, tool_context=context()))
+        await started.wait()
+        data["value"] = "new"
+        tool.invalidate()
+        # A call after the invalidation does not join the stale one...
+        started = asyncio.Event()
+        fresh = await tool.run_async(args={"key": "k"}, tool_context=context())
+        assert await running == "old"
+        assert fresh == "new"
+        # ...and the stale result did not replace the fresh one in the cache.
+        assert await tool.run_async(args={"key": "k"}, tool_context=context()) == "new"
+
+    asyncio.run(scenario())
+    assert tool.stats.invocations == 2
+
+
+def test_stats_outlive_collected_tools():
+    async def double(n: int) -> int:
+        return 2 * n
+
+    double.__name__ = "double_for_stats_test"
+    tool = cached_tool(double)
+    asyncio.run(tool.run_async(args={"n": 1}, tool_context=context()))
+    asyncio.run(tool.run_async(args={"n": 1}, tool_context=context()))
+    before = single_flight_stats()["double_for_stats_test"]
+
+    del tool
+    gc.collect()
+    assert single_flight_stats()["double_for_stats_test"] == before
+    assert before["invocations"] == 1 and before["cache_hits"] == 1 and before["saved"] == 1
@@ -0,0 +1,77 @@
+from adk_common.state import AppendOnlyList
+
+
+class DeltaState(dict):
+    """A dict that records which keys were written, like the event's state delta."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.written = []
+
+    def __setitem__(self, key, value):
+        self.written.append(key)
+        super().__setitem__(key, value)
+
+
+def test_appends_round_trip_across_chunks():
+    state = {}
+    rolls = AppendOnlyList(state, "rolls", chunk_size=4)
+    for n in range(10):
+        rolls.append(n * 1000)
+    rolls.extend([-1, 2 ** 40])
+
+    values = [n * 1000 for n in range(10)] + [-1, 2 ** 40]
+    assert len(rolls) == 12
+    assert rolls.to_list() == values
+    assert [rolls[i] for i in range(12)] == values
+    assert rolls[-1] == 2 ** 40
+    assert sorted(state) == ["rolls#0", "rolls#1", "rolls#2", "rolls#len"]
+    # A second view over the same state sees the same values.
+    assert AppendOnlyList(state, "rolls", chunk_size=4).to_list() == values
+
+
+def test_append_only_rewrites_the_last_chunk():
+    state = DeltaState()
+    rolls = AppendOnlyList(state, "rolls", chunk_size=4)
+    rolls.extend(range(6))
+    state.written.clear()
+
+    rolls.append(6)
+    assert state.written == ["rolls#1", "rolls#len"]
+    state.written.clear()
+
+    rolls.extend([7, 8])
+    assert state.written == ["rolls#1", "rolls#2", "rolls#len"]
+
+
+def test_legacy_list_is_read_as_a_prefix():
+    state = {"rolls": [1, 2, 3]}
+    rolls = AppendOnlyList(state, "rolls", chunk_size=2)
+    rolls.extend([4, 5, 6])
+
+    assert rolls.to_list() == [1, 2, 3, 4, 5, 6]
+    assert len(rolls) == 6
+    assert (rolls[2], rolls[3], rolls[-1]) == (3, 4, 6)
+    assert state["rolls"] == [1, 2, 3]
+
+
+def test_empty_list_and_out_of_range():
+    state = {}
+    rolls = AppendOnlyList(state, "rolls")
+    rolls.extend([])
+    assert state == {}
+    assert len(rolls) == 0 and rolls.to_list() == []
+    for index in (0, -1):
+        try:
+            rolls[index]
+        except IndexError:
+            pass
+        else:
+            raise AssertionError(f"rolls[{index}] did not raise IndexError")
+
+
+def test_float_typecode():
+    state = {}
+    scores = AppendOnlyList(state, "scores", typecode="d", chunk_size=3)
+    scores.extend([0.5, 1.25, -3.0, 1e100])
+    assert scores.to_list() == [0.5, 1.25, -3.0, 1e100]
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_common.trace import Trace, TraceRecorder, TraceReplayer, _Tracer
+from fake_llm import ToolCallingLlm
+
+QUERIES = ["Weather in Oslo?", "And in Paris?"]
+
+
+def get_weather(city: str) -> dict:
+    return {"city": city, "report": "sunny"}
+
+
+def build_agent() -> LlmAgent:
+    return LlmAgent(
+        name="weather",
+        model=ToolCallingLlm(calls=[("get_weather", {"city": "Oslo"})], text="Sunny."),
+        tools=[get_weather],
+    )
+
+
+async def converse(tracer, queries=QUERIES) -> list[str]:
+    agent = build_agent()
+    tracer.instrument(agent)
+    runner = tracer.wrap_runner(InMemoryRunner(agent=agent, app_name="trace_test"))
+    session = await runner.session_service.create_session(app_name="trace_test", user_id="u")
+    answers = []
+    for query in queries:
+        message = types.Content(role="user", parts=[types.Part(text=query)])
+        async for event in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            if event.is_final_response():
+                answers.append(event.content.parts[0].text)
+    return answers
+
+
+def test_recorded_trace_replays_identically(tmp_path):
+    recorder = TraceRecorder(scenario="weather")
+    assert asyncio.run(converse(recorder)) == ["Sunny.", "Sunny."]
+    path = str(tmp_path / "weather.trace.gz")
+    recorder.save(path)
+
+    trace = Trace.load(path)
+    assert trace.meta == {"scenario": "weather"}
+    assert len(trace.model_calls) == 4  # a tool call and an answer per turn
+    assert [turn["query"] for turn in trace.turns] == QUERIES
+    assert trace.turns[0]["events"][0]["calls"] == [["get_weather", {"city": "Oslo"}]]
+
+    replayer = TraceReplayer(trace, strict=True)
+    assert asyncio.run(converse(replayer)) == ["Sunny.", "Sunny."]
+    assert replayer.stats.model_calls == 4
+    assert replayer.stats.request_mismatches == 0
+    assert replayer.unused_model_calls == 0
+
+
+def test_replay_reports_a_diverging_conversation(tmp_path):
+    recorder = TraceRecorder()
+    asyncio.run(converse(recorder))
+
+    replayer = TraceReplayer(recorder.trace)
+    asyncio.run(converse(replayer, ["Weather in Oslo?", "And in Rome?"]))
+    assert replayer.stats.event_mismatches == [
+        "turn 2: query 'And in Rome?', trace has 'And in Paris?'"
+    ]
+    assert replayer.stats.request_mismatches == 2
+
+    with pytest.raises(AssertionError):
+        asyncio.run(converse(TraceReplayer(recorder.trace, strict=True), ["Hello?"]))
+
+
+def test_unsupported_trace_versions_are_rejected(tmp_path):
+    import gzip
+
+    path = tmp_path / "old.trace.gz"
+    with gzip.open(path, "wt") as f:
+        f.write('{"type": "meta", "version": 0}\n')
+    with pytest.raises(ValueError):
+        Trace.load(str(path))
+
+
+def test_tracer_is_abstract():
+    with pytest.raises(TypeError):
+        _Tracer()